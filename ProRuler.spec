@@ -7,7 +7,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('Icon.ico', '.'), ('LICENSE', '.')],  # Include Icon.ico and LICENSE in the bundle
-    hiddenimports=['PIL', 'PIL._tkinter_finder', 'pystray', 'pystray._win32'],
+    # PIL, pystray and ttkthemes are imported lazily by module name, so list them here
+    hiddenimports=['PIL', 'PIL.Image', 'PIL.ImageDraw', 'PIL._tkinter_finder', 'numpy', 'pystray', 'pystray._win32', 'ttkthemes'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,19 +1,60 @@
+import time
+_LAUNCHED_AT = time.perf_counter()  # Start of the startup timeline
+
+from screenruler.startup import StartupTimeline, report_requested
+
+# PIL, pystray, ttkthemes, NumPy and the tkinter dialogs are imported on first
+# use so the overlay can appear before they load.
+STARTUP = StartupTimeline(_LAUNCHED_AT)
+# Load the top-level imports below one at a time so the startup report itemises them
+STARTUP.preload((
+    "tkinter", "tkinter.ttk", "ctypes", "json", "datetime", "threading",
+    "screenruler.core", "screenruler.capture", "screenruler.config", "screenruler.export",
+    "screenruler.history", "screenruler.loupe", "screenruler.scene", "screenruler.scheduler",
+    "screenruler.core.edges", "screenruler.core.regions", "screenruler.monitors",
+    "screenruler.overlay", "screenruler.perf", "screenruler.persist",
+))
+
 import tkinter as tk
-from tkinter import ttk, colorchooser, messagebox
+from tkinter import ttk
 import math
 import ctypes
 import json
 import os
 import sys
-from datetime import datetime
-from PIL import Image, ImageDraw
-import pystray
+from datetime import datetime, timedelta
+from itertools import islice
 from threading import Thread
 
-try:
-    from ttkthemes import ThemedStyle
-except Exception:  # pragma: no cover
-    ThemedStyle = None
+from screenruler.capture import CaptureService, ImageSource, ScreenSource, exclude_from_capture
+from screenruler.config import ObservableConfig
+from screenruler.export import HistoryExport
+from screenruler.history import HistoryTable, MeasurementHistory
+from screenruler.loupe import Loupe
+from screenruler.scene import RetainedScene
+from screenruler.scheduler import RedrawScheduler
+from screenruler.core import optional
+from screenruler.core.edges import EdgeMap, scan_edges
+from screenruler.core.geometry import angle_between, bearing, distance, hit_handle, near_segment
+from screenruler.core.metrics import PolygonMetrics
+from screenruler.core.points import PointBuffer
+from screenruler.core.regions import RegionMap
+from screenruler.core.spatial import PolygonIndex
+from screenruler.core.ticks import TickEngine
+from screenruler.core.units import (
+    UNITS,
+    area_formatter,
+    distance_formatter,
+    get_converter,
+    normalize_unit,
+)
+from screenruler.monitors import MonitorTopology
+from screenruler.overlay import OverlayViewport
+from screenruler.perf import PerfRecorder, timed
+from screenruler.persist import WriteBehindWriter
+
+STARTUP.mark("imports")
+optional.set_importer(STARTUP.import_module)  # NumPy: first capture or large polygon
 
 # --- Windows API Calls for Click-Through Support ---
 def set_click_through(hwnd, enable):
@@ -37,13 +78,14 @@ class ProRuler:
     def __init__(self, root):
         self.root = root
         self.root.title("ScreenRuler Pro")
+        self.startup = STARTUP
 
         self.style = None
         self.current_theme = "arc"  # default theme
         self._init_style()
         
-        # Default Configuration
-        self.config = {
+        # Default Configuration (toolbar widgets subscribe to the keys they show)
+        self.config = ObservableConfig({
             "color_active": "#00FFFF",
             "color_pass": "#FF5555",
             "bg_color": "black",
@@ -61,8 +103,22 @@ class ProRuler:
             "show_labels": True,  # Show/hide ruler labels
             "mode": "ruler",  # ruler, fractions, angle, polygon
             "polygon_sides": 4,  # Number of sides for polygon mode
-            "toolbar_visible": True  # Show/hide toolbar
-        }
+            "toolbar_visible": True,  # Show/hide toolbar
+            "target_fps": 60,  # Redraw rate cap (0 = unlimited)
+            "lod_min_tick_px": 6,  # Drop tick levels when ticks get closer than this
+            "max_tick_items": 600,  # Tick + label canvas item budget per frame
+            "startup_budget_ms": 500,  # Warn when the first frame takes longer
+            "config_save_delay_ms": 500,  # Coalesce settings writes within this window
+            "history_capacity": 1000,  # Copied measurements kept in memory (all are logged)
+            "compact_overlay": False,  # Size the overlay to the tool instead of the desktop
+            "capture_image": "",  # Read pixels from this image instead of the screen (headless runs)
+            "snap_to_edges": False,  # Pull dragged handles onto nearby on-screen edges
+            "snap_radius": 8,  # How far (px) to look for an edge when snapping
+            "auto_measure_range": 1500,  # Max scan distance (px) each way for Ctrl+Click auto-measure
+            "inspector_radius": 400,  # Half-size (px) of the region the spacing inspector analyses
+            "show_loupe": False,  # Magnifier next to the handle while dragging
+            "loupe_zoom": 8  # Loupe magnification
+        })
         
         # Themes
         self.themes = {
@@ -74,6 +130,11 @@ class ProRuler:
         
         # Load saved config
         self.load_config()
+        self.startup.budget_ms = self.config["startup_budget_ms"]
+        
+        # Settings are written behind the UI on a background thread
+        self.config_writer = WriteBehindWriter("ruler_config.json",
+                                               delay=self.config["config_save_delay_ms"] / 1000.0)
         
         # Get virtual screen dimensions first (multi-monitor aware)
         self.root.update_idletasks()
@@ -95,6 +156,12 @@ class ProRuler:
             self.virtual_w = int(self.root.winfo_screenwidth())
             self.virtual_h = int(self.root.winfo_screenheight())
 
+        # Monitor layout and DPI, cached and refreshed on display changes
+        self.monitors = MonitorTopology(
+            hwnd=self.root.winfo_id(),
+            fallback_size=lambda: (self.root.winfo_screenwidth(), self.root.winfo_screenheight()),
+        )
+
         # Keep legacy names used across the code
         self.screen_width = self.virtual_w
         self.screen_height = self.virtual_h
@@ -109,15 +176,32 @@ class ProRuler:
         self.is_passthrough = False  # Start in Edit mode by default
         self.show_help = False
         self.show_settings = False
-        self.measurement_history = []
+        # Newest copies in memory, every copy appended to measurement_history.jsonl
+        self.measurement_history = MeasurementHistory("measurement_history.jsonl",
+                                                      capacity=self.config["history_capacity"])
+        self._history_flush_id = None
+        self._history_listener = None  # History tab refresh, once that tab is built
+        self.history_export = None  # Running HistoryExport, polled from the Tk loop
+        self._export_dialog = None  # Unit picker shown before the file dialog
+        self.capture = None  # CaptureService, started by the first content-aware feature
+        self.inspector_on = False
+        self.inspector_hit = None  # (dx, dy, box, gaps) under the pointer, in frame coordinates
+        self._inspector_key = None
+        self._inspector_frame = None  # frame whose region map is in use
+        self._inspector_poll_id = None
+        self.loupe = None  # Loupe window, created on the first drag with the loupe on
         self.tray_icon = None
-        self.control_panel = None  # Unified control panel window
+        self.control_panel = None  # Unified control panel window (hidden, not destroyed, on close)
+        self._lazy_tabs = {}  # tab frame path -> builder, until the tab is first shown
+        self._panel_syncers = []  # re-read self.config into built tabs on reopen
         self.inline_notification = None  # Temporary notification text shown in toolbar
 
         # Polygon mode state
-        self.polygon_points = []  # List of dicts: {"x": float, "y": float}
+        self.polygon_points = PointBuffer()  # Indexes like a list of {"x": float, "y": float}
         self.polygon_dragging_index = None
         self.polygon_move_origin = None
+        self.polygon_index = PolygonIndex()  # Grid for vertex/edge hit-testing
+        self.polygon_metrics = PolygonMetrics()  # Running perimeter/area
         
         # Angle mode state - Initialize at center
         self.angle_center = {"x": center_x, "y": center_y}
@@ -133,6 +217,8 @@ class ProRuler:
         self.polygon_input = None
         self.mode_buttons = {}
         self.menu_buttons = {}
+        self._toolbar_state = {}  # widget -> state last shown (diffed before updating)
+        self._toolbar_subscriptions = []
         self.lock_status_var = tk.StringVar(value="None")
         
         # Setup Window geometry (cover the whole virtual desktop)
@@ -141,24 +227,34 @@ class ProRuler:
         self.root.overrideredirect(True)
         self.root.attributes('-topmost', True)
         
-        # Create toolbar frame first
-        self.create_toolbar()
+        # Per-phase timings for the F2 performance HUD (off until toggled)
+        self.perf = PerfRecorder()
         
         # Canvas
         self.canvas = tk.Canvas(root, width=self.screen_width, height=self.screen_height,
                                 bg=self.config["bg_color"], highlightthickness=0)
         self.canvas.pack()
+        self.scene = RetainedScene(self.canvas)
+        # Window geometry; in compact mode it follows the tool (see _update_viewport)
+        self.viewport = OverlayViewport(self.root, self.canvas,
+                                        (self.virtual_x, self.virtual_y, self.virtual_w, self.virtual_h))
+        self.viewport.show_full()
+        self.tick_engine = TickEngine()
+        
+        # Redraws are coalesced and rendered at most once per frame
+        self.scheduler = RedrawScheduler(self.root, self.draw, fps=self.config["target_fps"])
         
         # Transparency
         self.root.wm_attributes('-transparentcolor', self.config["bg_color"])
         self.root.attributes('-alpha', self.config["opacity_edit"])  # Start with Edit mode opacity
         
         # Bind Events
-        self.canvas.bind("<Button-1>", self.on_click)
-        self.canvas.bind("<B1-Motion>", self.on_drag)
-        self.canvas.bind("<ButtonRelease-1>", self.on_release)
-        self.canvas.bind("<Button-3>", self.on_right_click)
-        self.canvas.bind("<Motion>", self.on_mouse_move)
+        self.canvas.bind("<Button-1>", self._canvas_event(self.on_click))
+        self.canvas.bind("<Control-Button-1>", self._canvas_event(self.auto_measure))
+        self.canvas.bind("<B1-Motion>", self._canvas_event(self.on_drag))
+        self.canvas.bind("<ButtonRelease-1>", self._canvas_event(self.on_release))
+        self.canvas.bind("<Button-3>", self._canvas_event(self.on_right_click))
+        self.canvas.bind("<Motion>", self._canvas_event(self.on_mouse_move))
         
         # Keyboard Shortcuts
         self.root.bind("<space>", self.toggle_minimize)
@@ -193,20 +289,55 @@ class ProRuler:
         self.root.bind("<comma>", self.decrease_thickness)
         self.root.bind("<v>", self.toggle_labels)
         self.root.bind("<V>", self.toggle_labels)
+        self.root.bind("<e>", self.export_history)
+        self.root.bind("<E>", self.export_history)
+        self.root.bind("<n>", self.toggle_snap)
+        self.root.bind("<N>", self.toggle_snap)
+        self.root.bind("<i>", self.toggle_inspector)
+        self.root.bind("<I>", self.toggle_inspector)
+        self.root.bind("<z>", self.toggle_loupe)
+        self.root.bind("<Z>", self.toggle_loupe)
         self.root.bind("<m>", self.cycle_mode)
         self.root.bind("<M>", self.cycle_mode)
+        self.root.bind("<F2>", self.toggle_perf_hud)
+        self.root.bind("<Shift-F2>", self.dump_perf_stats)
         
         # Start in Edit mode by default (click-through disabled)
         hwnd = self.root.winfo_id()
         set_click_through(hwnd, False)
         
-        # Setup tray icon
-        self.setup_tray_icon()
-        
-        # Initial Draw
+        # Initial Draw: overlay and ruler first; the toolbar, themes and tray
+        # icon are built on idle once the first frame is on screen
         self.draw()
+        self.root.update_idletasks()
+        self.startup.mark("first frame")
+        self.root.after_idle(self._startup_toolbar)
+        self.root.after(2000, self.poll_monitors)
         self.show_welcome()
     
+    def _startup_toolbar(self):
+        """Startup stage 2: build the toolbar, then queue themes and tray."""
+        try:
+            self.create_toolbar()
+            self.update_measurement_display()
+        except Exception as e:
+            print(f"Warning: Could not create toolbar: {e}")
+        self.startup.mark("interactive")
+        self.root.after_idle(self._startup_extras)
+    
+    def _startup_extras(self):
+        """Startup stage 3: ttkthemes and the tray icon, the slowest imports."""
+        self._load_themes()
+        self.startup.mark("themes")
+        self.setup_tray_icon()
+        self.startup.mark("tray")
+        
+        if report_requested():
+            print("\n".join(self.startup.report_lines()))
+        elif self.startup.over_budget():
+            print(f"Warning: First frame took {self.startup.milestone('first frame'):.0f} ms "
+                  f"(budget {self.startup.budget_ms} ms); run with --startup-report for details")
+    
     def create_tooltip(self, widget, text):
         """Create a tooltip for a widget"""
         def on_enter(event):
@@ -461,22 +592,26 @@ class ProRuler:
         grip.bind('<Button-1>', self.start_resize_toolbar)
         grip.bind('<B1-Motion>', self.do_resize_toolbar)
 
+        # Stateful widgets update themselves when the config keys they show change
+        for unsubscribe in self._toolbar_subscriptions:
+            unsubscribe()
+        self._toolbar_state = {}
+        self._toolbar_subscriptions = [
+            self.config.subscribe("mode", lambda key, value: self._update_mode_button_highlights()),
+            self.config.subscribe(("mode", "fraction_count", "polygon_sides"),
+                                  lambda key, value: self._sync_number_tile_for_mode()),
+            self.config.subscribe("unit", lambda key, value: self._sync_unit_dropdown()),
+            self.config.subscribe("lock_angle", lambda key, value: self.update_lock_button()),
+            self.config.subscribe("toolbar_visible", lambda key, value: self._sync_toolbar_visibility()),
+        ]
+        
         # Initialize stateful widgets
         self.update_lock_button()
         self._sync_number_tile_for_mode()
         self._update_mode_button_highlights()
+        self._sync_unit_dropdown()
+        self._sync_toolbar_visibility()
         self.update_mode_display()
-        
-        # Sync unit dropdown with config
-        if hasattr(self, 'unit_dropdown'):
-            self.unit_dropdown.set(self.config.get('unit', 'px'))
-        
-        # Set initial mode toggle button colors
-        if hasattr(self, 'mode_toggle_button'):
-            if self.is_passthrough:
-                self.mode_toggle_button.config(bg='#f8d0d0', fg='#c0392b', text='W')
-            else:
-                self.mode_toggle_button.config(bg='#d4edda', fg='#155724', text='E')
     
     def start_move_toolbar(self, event):
         """Start moving the toolbar window"""
@@ -544,13 +679,26 @@ class ProRuler:
         btn.pack(side='left', padx=2)
         return btn
     
+    def _toolbar_changed(self, widget, state):
+        """Remember ``state`` for a toolbar widget; False if it is already shown."""
+        if widget in self._toolbar_state and self._toolbar_state[widget] == state:
+            return False
+        self._toolbar_state[widget] = state
+        return True
+
     def _update_mode_button_highlights(self):
         """Highlight the active mode button in the toolbar."""
         if not getattr(self, 'mode_buttons', None):
             return
 
         active = self.config.get("mode", "ruler")
-        for mode, btn in self.mode_buttons.items():
+        previous = self._toolbar_state.get("mode_buttons")
+        if not self._toolbar_changed("mode_buttons", active):
+            return
+        # Only the previously and newly active buttons change colour
+        modes = self.mode_buttons if previous is None else (previous, active)
+        for mode in modes:
+            btn = self.mode_buttons.get(mode)
             try:
                 if not btn or not btn.winfo_exists():
                     continue
@@ -567,6 +715,9 @@ class ProRuler:
                 print(f"Warning: Could not update mode button {mode}: {e}")
                 continue
 
+    # Polygons may trace outlines with thousands of vertices (see PolygonIndex)
+    MAX_POLYGON_SIDES = 10000
+
     def _sync_number_tile_for_mode(self):
         """Update the number tile label/range/value for fractions/polygon."""
         try:
@@ -578,26 +729,50 @@ class ProRuler:
 
             mode = self.config.get("mode", "ruler")
             if mode == "fractions":
-                self.number_label.config(text="Fractions")
-                self.number_input.config(from_=2, to=50)
-                self.number_input.delete(0, 'end')
-                self.number_input.insert(0, str(self.config.get("fraction_count", 4)))
+                state = ("Fractions", 2, 50, str(self.config.get("fraction_count", 4)))
             elif mode == "polygon":
-                self.number_label.config(text="Sides")
-                self.number_input.config(from_=3, to=20)
-                self.number_input.delete(0, 'end')
-                self.number_input.insert(0, str(self.config.get("polygon_sides", 4)))
+                state = ("Sides", 3, self.MAX_POLYGON_SIDES, str(self.config.get("polygon_sides", 4)))
             else:
-                self.number_label.config(text="")
                 # Keep the control available but neutral
-                self.number_input.config(from_=2, to=50)
-                self.number_input.delete(0, 'end')
-                self.number_input.insert(0, "")
+                state = ("", 2, 50, "")
+            if not self._toolbar_changed("number_tile", state):
+                return
+
+            label, low, high, value = state
+            self.number_label.config(text=label)
+            self.number_input.config(from_=low, to=high)
+            self.number_input.delete(0, 'end')
+            self.number_input.insert(0, value)
         except tk.TclError:
             # Widget no longer exists
             pass
         except Exception as e:
             print(f"Warning: Could not sync number tile: {e}")
+
+    def _sync_unit_dropdown(self):
+        """Show the configured unit in the toolbar dropdown."""
+        unit = self.config.get("unit", "px")
+        if not hasattr(self, 'unit_dropdown') or not self._toolbar_changed("unit_dropdown", unit):
+            return
+        try:
+            if self.unit_dropdown.winfo_exists():
+                self.unit_dropdown.set(unit)
+        except tk.TclError:
+            pass
+
+    def _sync_toolbar_visibility(self):
+        """Show or hide the toolbar window to match ``toolbar_visible``."""
+        visible = bool(self.config.get("toolbar_visible", True))
+        if not self._toolbar_changed("toolbar_visible", visible):
+            return
+        try:
+            if self.toolbar and self.toolbar.winfo_exists():
+                if not visible:
+                    self.toolbar.withdraw()
+                elif not self.minimized:
+                    self.toolbar.deiconify()
+        except tk.TclError:
+            pass
     
     def _popup_menu(self, menu: tk.Menu, anchor_widget: tk.Widget | None):
         """Popup menu at the bottom-left of the anchor widget."""
@@ -616,13 +791,21 @@ class ProRuler:
                 pass
 
     def _init_style(self):
-        """Initialize ttk/ttkthemes style and apply default theme with toolbar tweaks."""
+        """Initialize the built-in ttk style with toolbar tweaks (themes load later)."""
+        self.style = ttk.Style(self.root)
+        self._configure_toolbar_styles()
+
+    def _load_themes(self):
+        """Import ttkthemes and apply the default theme (deferred startup stage)."""
+        try:
+            ThemedStyle = self.startup.import_module("ttkthemes").ThemedStyle
+        except Exception:  # ttkthemes is optional
+            ThemedStyle = None
         try:
             if ThemedStyle:
                 self.style = ThemedStyle(self.root)
                 self.style.set_theme(self.current_theme)
             else:
-                self.style = ttk.Style(self.root)
                 try:
                     self.style.theme_use(self.current_theme)
                 except Exception:
@@ -702,6 +885,7 @@ class ProRuler:
         """Show File menu"""
         menu = self._make_menu(self.toolbar_frame)
         menu.add_command(label="Copy Measurements (C)", command=self.copy_measurement)
+        menu.add_command(label="Export History... (E)", command=self.export_history)
         menu.add_separator()
         menu.add_command(label="Exit (Esc)", command=self.close_app)
 
@@ -769,6 +953,20 @@ class ProRuler:
         labels_status = "✓" if self.config["show_labels"] else " "
         menu.add_command(label=f"{labels_status} Ruler Labels (V)", command=self.toggle_labels)
         
+        snap_status = "✓" if self.config["snap_to_edges"] else " "
+        menu.add_command(label=f"{snap_status} Snap to Edges (N)", command=self.toggle_snap)
+        
+        inspector_status = "✓" if self.inspector_on else " "
+        menu.add_command(label=f"{inspector_status} Spacing Inspector (I)", command=self.toggle_inspector)
+        
+        loupe_status = "✓" if self.config["show_loupe"] else " "
+        menu.add_command(label=f"{loupe_status} Magnifier Loupe (Z)", command=self.toggle_loupe)
+        
+        compact_status = "✓" if self.config["compact_overlay"] else " "
+        menu.add_command(label=f"{compact_status} Compact Overlay", command=self.toggle_compact_overlay)
+        menu.add_separator()
+        menu.add_command(label="Measurement History", command=self.show_history)
+        
         anchor = self.menu_buttons.get("View") if getattr(self, 'menu_buttons', None) else None
         self._popup_menu(menu, anchor)
     
@@ -816,34 +1014,25 @@ class ProRuler:
         self.ensure_windows_visible()
         
         self.update_mode_display()
-        self.draw()
+        self.request_redraw()
     
     def set_unit(self, unit):
         """Set measurement unit"""
         normalized = self.normalize_unit(unit)
-        self.config["unit"] = normalized
-        
-        # Update dropdown to match
-        if hasattr(self, 'unit_dropdown'):
-            try:
-                if self.unit_dropdown.winfo_exists():
-                    self.unit_dropdown.set(normalized)
-            except tk.TclError:
-                pass
+        self.config["unit"] = normalized  # the toolbar dropdown follows the config
         
         # Update legacy unit_var if it exists
         if hasattr(self, 'unit_var'):
             self.unit_var.set(normalized)
         
         self.save_config()
-        self.draw()
+        self.request_redraw()
     
     def set_lock(self, angle):
         """Set lock angle (None, 0=horizontal, 90=vertical)"""
         self.config["lock_angle"] = angle
         self.save_config()
-        self.update_lock_button()
-        self.draw()
+        self.request_redraw()
     
     def set_theme(self, theme):
         """Set color theme"""
@@ -852,14 +1041,14 @@ class ProRuler:
             self.config["color_active"] = self.themes[theme]["active"]
             self.config["color_pass"] = self.themes[theme]["pass"]
         self.save_config()
-        self.draw()
+        self.request_redraw()
     
     def on_unit_selected(self, event=None):
         """Handle unit selection from dropdown"""
         self.config["unit"] = self.normalize_unit(self.unit_var.get())
         self.unit_var.set(self.config["unit"])
         self.save_config()
-        self.draw()
+        self.request_redraw()
     
     def on_unit_dropdown_changed(self, event=None):
         """Handle unit dropdown selection change"""
@@ -868,7 +1057,7 @@ class ProRuler:
                 selected = self.unit_dropdown.get().lower()
                 self.config["unit"] = self.normalize_unit(selected)
                 self.save_config()
-                self.draw()
+                self.request_redraw()
         except Exception as e:
             print(f"Warning: Could not change unit: {e}")
     
@@ -883,13 +1072,13 @@ class ProRuler:
                 if 2 <= value <= 50:
                     self.config["fraction_count"] = value
                     self.save_config()
-                    self.draw()
+                    self.request_redraw()
             elif self.config["mode"] == "polygon":
-                if 3 <= value <= 20:
+                if 3 <= value <= self.MAX_POLYGON_SIDES:
                     self.config["polygon_sides"] = value
                     self.init_polygon_with_sides(value)
                     self.save_config()
-                    self.draw()
+                    self.request_redraw()
         except ValueError:
             # Invalid number input
             pass
@@ -954,44 +1143,26 @@ class ProRuler:
         self.config["mode"] = mode
         
         # When switching to fractions mode, enable fractions
+        # (mode buttons and the number tile follow the config)
         if mode == "fractions":
             self.config["show_fractions"] = True
-            # Update input label and configuration
-            if hasattr(self, 'number_label'):
-                self.number_label.config(text="Fractions:")
-                self.number_input.config(from_=2, to=50)
-                self.number_input.delete(0, 'end')
-                self.number_input.insert(0, str(self.config["fraction_count"]))
         elif mode == "polygon":
             self.config["show_fractions"] = False
-            # Update input label for polygon sides
-            if hasattr(self, 'number_label'):
-                self.number_label.config(text="Sides:")
-                self.number_input.config(from_=3, to=20)
-                self.number_input.delete(0, 'end')
-                self.number_input.insert(0, str(self.config["polygon_sides"]))
             if not self.polygon_points:
                 self.init_polygon_default()
         else:
             self.config["show_fractions"] = False
-            # Hide or show number input as needed
-            if hasattr(self, 'number_label'):
-                if mode == "ruler" or mode == "angle":
-                    # Keep the input visible but label it appropriately
-                    self.number_label.config(text="Number:")
         
         # Don't reinitialize angle mode position - keep existing position
         # Angle position is already set at initialization
         
         self.save_config()
-        self._sync_number_tile_for_mode()
-        self._update_mode_button_highlights()
         
         # Ensure windows are visible and not minimized
         if not self.minimized:
             self.ensure_windows_visible()
         
-        self.draw()
+        self.request_redraw()
     
     def init_polygon_with_sides(self, sides):
         """Initialize polygon with specified number of sides"""
@@ -1000,40 +1171,24 @@ class ProRuler:
             cx = self.virtual_x + (self.virtual_w / 2)
             cy = self.virtual_y + (self.virtual_h / 2)
             radius = 150
-            self.polygon_points = []
+            points = PointBuffer()
             
             for i in range(sides):
                 angle = 2 * math.pi * i / sides - math.pi / 2  # Start from top
                 x = cx + radius * math.cos(angle)
                 y = cy + radius * math.sin(angle)
-                self.polygon_points.append({"x": x, "y": y})
+                points.append({"x": x, "y": y})
+            self.polygon_points = points
         except Exception as e:
             print(f"Warning: Could not initialize polygon: {e}")
             # Fallback to default 4-sided polygon
             self.init_polygon_default()
     
-    def refresh_toolbar(self):
-        """Refresh toolbar button states"""
-        if self.toolbar and self.toolbar.winfo_exists():
-            # Preserve position before recreate
-            try:
-                geom = self.toolbar.geometry()
-            except Exception:
-                geom = None
-            self.toolbar.destroy()
-            self.create_toolbar()
-            if geom:
-                try:
-                    # Keep same x/y; size is managed by create_toolbar
-                    if '+' in geom:
-                        xy = '+' + '+'.join(geom.split('+')[1:])
-                        self.toolbar.geometry(xy)
-                except Exception:
-                    pass
-    
     def update_lock_button(self):
         """Update lock button icon and label based on lock state"""
         try:
+            if not self._toolbar_changed("lock_button", self.config["lock_angle"]):
+                return
             if hasattr(self, 'lock_button') and self.lock_button.winfo_exists():
                 if self.config["lock_angle"] == 0:
                     self.lock_button.config(text="🔒H", font=('Segoe UI', 9, 'bold'))
@@ -1108,10 +1263,72 @@ class ProRuler:
         # Validate polygon_sides
         try:
             polygon_sides = int(self.config.get("polygon_sides", 4))
-            self.config["polygon_sides"] = max(3, min(20, polygon_sides))
+            self.config["polygon_sides"] = max(3, min(self.MAX_POLYGON_SIDES, polygon_sides))
         except (ValueError, TypeError):
             self.config["polygon_sides"] = 4
         
+        # Validate target_fps (0 = unlimited)
+        try:
+            target_fps = int(self.config.get("target_fps", 60))
+            self.config["target_fps"] = max(0, min(240, target_fps))
+        except (ValueError, TypeError):
+            self.config["target_fps"] = 60
+        
+        # Validate level-of-detail settings
+        try:
+            lod_min_tick_px = float(self.config.get("lod_min_tick_px", 6))
+            self.config["lod_min_tick_px"] = max(1.0, min(100.0, lod_min_tick_px))
+        except (ValueError, TypeError):
+            self.config["lod_min_tick_px"] = 6
+        
+        try:
+            max_tick_items = int(self.config.get("max_tick_items", 600))
+            self.config["max_tick_items"] = max(20, min(20000, max_tick_items))
+        except (ValueError, TypeError):
+            self.config["max_tick_items"] = 600
+        
+        try:
+            startup_budget_ms = int(self.config.get("startup_budget_ms", 500))
+            self.config["startup_budget_ms"] = max(50, min(10000, startup_budget_ms))
+        except (ValueError, TypeError):
+            self.config["startup_budget_ms"] = 500
+        
+        try:
+            config_save_delay_ms = int(self.config.get("config_save_delay_ms", 500))
+            self.config["config_save_delay_ms"] = max(0, min(10000, config_save_delay_ms))
+        except (ValueError, TypeError):
+            self.config["config_save_delay_ms"] = 500
+        
+        try:
+            history_capacity = int(self.config.get("history_capacity", 1000))
+            self.config["history_capacity"] = max(10, min(100000, history_capacity))
+        except (ValueError, TypeError):
+            self.config["history_capacity"] = 1000
+        
+        try:
+            snap_radius = int(self.config.get("snap_radius", 8))
+            self.config["snap_radius"] = max(2, min(40, snap_radius))
+        except (ValueError, TypeError):
+            self.config["snap_radius"] = 8
+        
+        try:
+            auto_measure_range = int(self.config.get("auto_measure_range", 1500))
+            self.config["auto_measure_range"] = max(50, min(10000, auto_measure_range))
+        except (ValueError, TypeError):
+            self.config["auto_measure_range"] = 1500
+        
+        try:
+            inspector_radius = int(self.config.get("inspector_radius", 400))
+            self.config["inspector_radius"] = max(100, min(2000, inspector_radius))
+        except (ValueError, TypeError):
+            self.config["inspector_radius"] = 400
+        
+        try:
+            loupe_zoom = int(self.config.get("loupe_zoom", 8))
+            self.config["loupe_zoom"] = max(2, min(16, loupe_zoom))
+        except (ValueError, TypeError):
+            self.config["loupe_zoom"] = 8
+        
         # Validate ruler_thickness
         try:
             ruler_thickness = int(self.config.get("ruler_thickness", 4))
@@ -1120,60 +1337,278 @@ class ProRuler:
             self.config["ruler_thickness"] = 4
 
     def save_config(self):
-        """Save configuration to file"""
-        try:
-            tmp_path = "ruler_config.json.tmp"
-            with open(tmp_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-            os.replace(tmp_path, "ruler_config.json")
-        except Exception:
-            # Avoid crashing on transient I/O issues.
-            pass
+        """Queue the configuration for saving (written behind the UI, see WriteBehindWriter)"""
+        self.config_writer.schedule(self.config)
 
     def normalize_unit(self, unit: str) -> str:
         """Normalize unit strings and keep backwards compatibility."""
-        if not unit:
-            return "px"
-        u = str(unit).strip().lower()
-        # Legacy values
-        if u in ("inch", "inches"):
-            return "in"
-        if u in ("µm", "μm"):
-            return "um"
-        if u == "meter":
-            return "m"
-        # Canonical supported set
-        if u in {"px", "um", "mm", "cm", "m", "in"}:
-            return u
-        return "px"
-
-    def get_screen_dpi(self) -> float:
-        """Best-effort DPI for correct unit conversions and tick spacing."""
-        # Windows 10+: per-monitor DPI
+        return normalize_unit(unit)
+
+    def unit_converter(self):
+        """Shared px -> unit converter for the current DPI and calibration."""
+        return get_converter(self.get_screen_dpi(), float(self.config.get("calibration_factor", 1.0)))
+
+    def get_screen_dpi(self, x=None, y=None) -> float:
+        """Cached DPI for unit conversions and tick spacing.
+
+        Without a point this is the overlay window's DPI; with canvas
+        coordinates it is the DPI of the monitor under that point.
+        """
+        if x is None or y is None:
+            return self.monitors.window_dpi
+        return self.monitors.dpi_at(x + self.virtual_x, y + self.virtual_y)
+
+    def poll_monitors(self):
+        """Low-frequency probe for display/DPI changes."""
         try:
-            hwnd = self.root.winfo_id()
-            dpi = ctypes.windll.user32.GetDpiForWindow(hwnd)
-            if dpi:
-                return float(dpi)
-        except Exception:
-            pass
+            if self.monitors.poll():
+                self.polygon_metrics.invalidate_lengths()  # measured with the old DPIs
+                self.request_redraw()
+        except Exception as e:
+            print(f"Warning: Could not refresh monitor layout: {e}")
+        self.root.after(2000, self.poll_monitors)
 
-        # Fallback: system DPI
+    def get_capture_service(self):
+        """Shared screen-capture service, created on first use (None if unavailable)."""
+        if self.capture is None:
+            try:
+                path = self.config.get("capture_image")
+                if path:
+                    source = ImageSource(path, origin=(self.virtual_x, self.virtual_y))
+                else:
+                    source = ScreenSource()
+                    # Measure what is under the overlay, not the overlay itself
+                    exclude_from_capture(self.root.winfo_id())
+                    if self.toolbar:
+                        exclude_from_capture(self.toolbar.winfo_id())
+            except Exception as e:
+                print(f"Warning: Screen capture is not available: {e}")
+                return None
+            self.capture = CaptureService(source)
+        return self.capture
+
+    def capture_around(self, x, y, radius, timeout=0.0, max_age=None):
+        """Captured frame covering ``radius`` px around canvas (x, y), or None if not ready.
+
+        Frames are in virtual-screen coordinates: add virtual_x/virtual_y to
+        canvas coordinates before indexing them.
+        """
+        capture = self.get_capture_service()
+        if capture is None:
+            return None
+        vx, vy = x + self.virtual_x, y + self.virtual_y
+        return capture.get((int(vx - radius), int(vy - radius), int(vx + radius) + 1, int(vy + radius) + 1),
+                           timeout=timeout, max_age=max_age)
+
+    def snap_point(self, x, y):
+        """Move canvas (x, y) onto the strongest edge within snap_radius, if any.
+
+        The edge map is built once per captured frame and cached on it, so
+        while the frame is fresh each call is a small window lookup. Until
+        the first capture around the pointer is ready the point is returned
+        unchanged.
+        """
+        radius = self.config["snap_radius"]
+        frame = self.capture_around(x, y, radius + 2, max_age=1.0)
+        if frame is None:
+            return x, y
+        ox, oy = frame.left - self.virtual_x, frame.top - self.virtual_y
+        hit = frame.derived("edges", EdgeMap.from_frame).snap(x - ox, y - oy, radius)
+        if hit is None:
+            return x, y
+        return hit[0] + ox, hit[1] + oy
+
+    def auto_measure(self, event, attempt=0):
+        """Stretch the ruler from the clicked point to the nearest edge on each side (Ctrl+Click).
+
+        The scan follows the ruler's direction, or the locked axis. Only a
+        thin strip along that line is captured; if it is not ready yet the
+        call is retried from the Tk loop instead of waiting for it.
+        """
+        if self.is_passthrough:
+            return
+        if self.config["mode"] not in ("ruler", "fractions"):
+            self.show_notification("Auto-measure works in Ruler mode")
+            return
+        lock = self.config["lock_angle"]
+        if lock == 0:
+            dx, dy = 1.0, 0.0
+        elif lock == 90:
+            dx, dy = 0.0, 1.0
+        else:
+            length = distance(self.p1["x"], self.p1["y"], self.p2["x"], self.p2["y"])
+            if length < 1:
+                dx, dy = 1.0, 0.0
+            else:
+                dx = (self.p2["x"] - self.p1["x"]) / length
+                dy = (self.p2["y"] - self.p1["y"]) / length
+
+        capture = self.get_capture_service()
+        if capture is None:
+            self.show_notification("Screen capture is not available")
+            return
+        x, y = event.x, event.y
+        reach = self.config["auto_measure_range"]
+        vx, vy = x + self.virtual_x, y + self.virtual_y
+        strip = (int(min(vx - dx * reach, vx + dx * reach)) - 1, int(min(vy - dy * reach, vy + dy * reach)) - 1,
+                 int(max(vx - dx * reach, vx + dx * reach)) + 2, int(max(vy - dy * reach, vy + dy * reach)) + 2)
+        frame = capture.get(strip, max_age=0.5)
+        if frame is None:
+            if attempt < 20:
+                self.root.after(15, lambda: self.auto_measure(event, attempt + 1))
+            else:
+                self.show_notification("Screen capture timed out")
+            return
+
+        back, forward = scan_edges(frame.data, frame.width, frame.height,
+                                   vx - frame.left, vy - frame.top, dx, dy, reach)
+        if back is None or forward is None:
+            self.show_notification("No edge found on both sides")
+            return
+        # Distances are from the centre of the clicked pixel
+        cx, cy = int(x) + 0.5, int(y) + 0.5
+        self.p1 = {"x": cx - dx * back, "y": cy - dy * back}
+        self.p2 = {"x": cx + dx * forward, "y": cy + dy * forward}
+        self.request_redraw()
+        self.show_notification(f"Auto-measured {self.format_distance(self.get_distance())}")
+
+    def toggle_snap(self, event=None):
+        """Toggle snapping dragged handles to on-screen edges"""
+        self.config["snap_to_edges"] = not self.config["snap_to_edges"]
+        self.save_config()
+        status = "ON" if self.config["snap_to_edges"] else "OFF"
+        self.show_notification(f"Snap to Edges: {status}")
+
+    # Poll interval (ms) for the spacing inspector, independent of mouse events
+    INSPECTOR_POLL_MS = 40
+    INSPECTOR_COLOR = "#FF2D55"
+
+    def toggle_inspector(self, event=None):
+        """Toggle the spacing inspector: redlines from the element under the pointer (I)"""
+        self.inspector_on = not self.inspector_on
+        if self.inspector_on:
+            if self.get_capture_service() is None:
+                self.inspector_on = False
+                self.show_notification("Screen capture is not available")
+                return
+            self._poll_inspector()
+        else:
+            if self._inspector_poll_id is not None:
+                self.root.after_cancel(self._inspector_poll_id)
+                self._inspector_poll_id = None
+            self.inspector_hit = None
+            self._inspector_key = None
+            self._inspector_frame = None
+        self.request_redraw()
+        status = "ON" if self.inspector_on else "OFF"
+        self.show_notification(f"Spacing Inspector: {status}")
+
+    def _poll_inspector(self):
+        """Look up the element under the pointer in the current region map.
+
+        The pointer is polled rather than tracked through <Motion>, which
+        the transparent overlay does not receive. Region maps are built on
+        the capture service's analysis thread; a poll only picks up a
+        finished one. The map in use is kept until the pointer gets within
+        half the inspector radius of its frame's edge, so hovering inside it
+        is an owner-map lookup plus cached gaps, and the overlay is only
+        redrawn when the hit changes.
+        """
+        self._inspector_poll_id = None
+        if not self.inspector_on:
+            return
         try:
-            LOGPIXELSX = 88
-            hdc = ctypes.windll.user32.GetDC(0)
-            dpi = ctypes.windll.gdi32.GetDeviceCaps(hdc, LOGPIXELSX)
-            ctypes.windll.user32.ReleaseDC(0, hdc)
-            if dpi:
-                return float(dpi)
-        except Exception:
-            pass
+            px, py = self.root.winfo_pointerxy()
+            radius = self.config["inspector_radius"]
+            margin = radius // 2
+            frame = self._inspector_frame
+            if frame is None or not frame.contains((px - margin, py - margin, px + margin + 1, py + margin + 1)):
+                fresh = self.capture_around(px - self.virtual_x, py - self.virtual_y, radius, max_age=1.0)
+                if fresh is not None and self.capture.derive(fresh, "regions", RegionMap.from_frame) is not None:
+                    frame = self._inspector_frame = fresh
+            if frame is not None and frame.contains((px, py, px + 1, py + 1)):
+                regions = frame.derived("regions", RegionMap.from_frame)
+                index = regions.at(px - frame.left, py - frame.top)
+                key = None if index is None else (id(regions), index)
+                if key != self._inspector_key:
+                    self._inspector_key = key
+                    if index is None:
+                        self.inspector_hit = None
+                    else:
+                        self.inspector_hit = (frame.left - self.virtual_x, frame.top - self.virtual_y,
+                                              regions.boxes[index], regions.gaps(index))
+                    self.request_redraw()
+            elif self.inspector_hit is not None:
+                # Pointer is outside every analysed frame until the next map is ready
+                self.inspector_hit = self._inspector_key = None
+                self.request_redraw()
+        except tk.TclError:
+            return  # window is gone
+        self._inspector_poll_id = self.root.after(self.INSPECTOR_POLL_MS, self._poll_inspector)
+
+    def draw_inspector(self):
+        """Outline the hovered element and label the gaps to its neighbours."""
+        dx, dy, box, gaps = self.inspector_hit
+        color = self.INSPECTOR_COLOR
+        left, top, right, bottom = box
+        self.scene.rectangle("inspector", left + dx, top + dy, right + dx, bottom + dy,
+                             outline=color, dash=(3, 2))
+        for direction, (x1, y1, x2, y2) in gaps.items():
+            x1, y1, x2, y2 = x1 + dx, y1 + dy, x2 + dx, y2 + dy
+            self.scene.line("inspector", x1, y1, x2, y2, fill=color, arrow=tk.BOTH, arrowshape=(5, 6, 2))
+            label = self.format_distance(self.measured_length(x1, y1, x2, y2))
+            if direction in ("left", "right"):
+                self.scene.text("inspector", (x1 + x2) / 2, y1 - 4, text=label, anchor="s",
+                                fill=color, font=("Segoe UI", 8, "bold"))
+            else:
+                self.scene.text("inspector", x1 + 4, (y1 + y2) / 2, text=label, anchor="w",
+                                fill=color, font=("Segoe UI", 8, "bold"))
 
-        return 96.0
+    def toggle_loupe(self, event=None):
+        """Toggle the magnifier loupe shown while dragging a handle (Z)"""
+        self.config["show_loupe"] = not self.config["show_loupe"]
+        self.save_config()
+        if not self.config["show_loupe"] and self.loupe is not None:
+            self.loupe.hide()
+        status = "ON" if self.config["show_loupe"] else "OFF"
+        self.show_notification(f"Magnifier Loupe: {status}")
+
+    def get_loupe(self):
+        """Loupe window, created on first use (None if screen capture is unavailable)."""
+        if self.loupe is None:
+            if self.get_capture_service() is None:
+                return None
+            self.loupe = Loupe(self.root, self._loupe_target, self._loupe_grab, self.measurement_text,
+                               (self.virtual_x, self.virtual_y, self.virtual_w, self.virtual_h),
+                               zoom=self.config["loupe_zoom"])
+            exclude_from_capture(self.loupe.window.winfo_id())
+        elif self.loupe.zoom != self.config["loupe_zoom"]:
+            self.loupe.configure(self.loupe.size, self.config["loupe_zoom"])
+        return self.loupe
+
+    def _loupe_target(self):
+        """Virtual-screen position of the dragged handle, or None when no handle is dragged."""
+        if self.polygon_dragging_index is not None:
+            x, y = self.polygon_points.get(self.polygon_dragging_index)
+        elif self.dragging in ("p1", "p2", "angle_center", "angle_arm1", "angle_arm2"):
+            point = getattr(self, self.dragging)
+            x, y = point["x"], point["y"]
+        else:
+            return None
+        return x + self.virtual_x, y + self.virtual_y
+
+    def _loupe_grab(self, x, y, radius):
+        """Frame around virtual-screen (x, y) for the loupe; an older one while a capture is pending."""
+        rect = (x - radius, y - radius, x + radius + 1, y + radius + 1)
+        return self.capture.get(rect) or self.capture.latest(rect)
 
     def setup_tray_icon(self):
         """Setup system tray icon using Icon.ico file."""
         try:
+            Image = self.startup.import_module("PIL.Image")
+            ImageDraw = self.startup.import_module("PIL.ImageDraw")
+            pystray = self.startup.import_module("pystray")
+            
             # Try to load the Icon.ico file
             icon_path = os.path.join(os.path.dirname(__file__), 'Icon.ico')
             
@@ -1221,9 +1656,8 @@ class ProRuler:
 
     def exit_from_tray(self, icon=None, item=None):
         """Exit application from tray"""
-        if self.tray_icon:
-            self.tray_icon.stop()
-        self.root.after(0, self.root.destroy)
+        # Called on the pystray thread: shut down (and flush) from the Tk thread
+        self.root.after(0, self.close_app)
 
     def show_welcome(self):
         """Show welcome message"""
@@ -1232,11 +1666,15 @@ class ProRuler:
 
     def show_about(self, event=None):
         """Show control panel with About tab"""
-        self.open_control_panel(tab_index=2)
+        self.open_control_panel(tab_index=3)
+
+    def show_history(self, event=None):
+        """Show control panel with History tab"""
+        self.open_control_panel(tab_index=1)
 
     def toggle_help(self, event=None):
         """Show control panel with Help tab"""
-        self.open_control_panel(tab_index=1)
+        self.open_control_panel(tab_index=2)
 
     def toggle_settings(self, event=None):
         """Open control panel with Settings tab"""
@@ -1244,18 +1682,18 @@ class ProRuler:
 
     def open_control_panel(self, tab_index=0, sub_tab_index=0):
         """Create unified control panel with Settings, Help, and About tabs"""
-        # Close existing panel if open
+        # Reuse the panel if it was built before (it is only hidden on close)
         if self.control_panel and self.control_panel.winfo_exists():
+            if self.control_panel.state() == "withdrawn":
+                self.control_panel.deiconify()
+                self._sync_control_panel()
             self.control_panel.lift()
             self.control_panel.focus_force()
-            # Switch to requested tab
-            if hasattr(self, 'control_notebook'):
-                self.control_notebook.select(tab_index)
-                # If settings tab and sub_tab_index specified, switch to that sub-tab
-                if tab_index == 0 and hasattr(self, 'settings_notebook'):
-                    self.settings_notebook.select(sub_tab_index)
+            self._select_control_tab(tab_index, sub_tab_index)
             return
         
+        self._lazy_tabs = {}
+        self._panel_syncers = []
         self.control_panel = tk.Toplevel(self.root)
         self.control_panel.title("ScreenRuler Pro - Control Panel")
         self.control_panel.geometry("580x600")
@@ -1265,7 +1703,7 @@ class ProRuler:
         self.control_panel.overrideredirect(True)
         
         # Prevent minimize
-        self.control_panel.protocol("WM_DELETE_WINDOW", self.control_panel.destroy)
+        self.control_panel.protocol("WM_DELETE_WINDOW", self.close_control_panel)
         
         # Custom title bar with close and minimize buttons
         titlebar = tk.Frame(self.control_panel, bg='#5294e2', height=35)
@@ -1278,7 +1716,7 @@ class ProRuler:
         
         # Close button
         close_btn = tk.Button(titlebar, text="✕", font=('Arial', 11, 'bold'), bg='#f46067', fg='white',
-                      command=self.control_panel.destroy, width=3, relief=tk.FLAT, cursor='hand2',
+                      command=self.close_control_panel, width=3, relief=tk.FLAT, cursor='hand2',
                       bd=0, activebackground='#f13039')
         close_btn.pack(side='right', padx=2)
         close_btn.bind("<Enter>", lambda e: e.widget.config(bg='#f13039'))
@@ -1321,13 +1759,15 @@ class ProRuler:
         self.control_notebook = ttk.Notebook(self.control_panel)
         self.control_notebook.pack(fill='both', expand=True, padx=8, pady=8)
         
-        # Create all tabs in new order: Settings > Help > About
-        self.create_settings_tab(self.control_notebook)
-        self.create_help_tab(self.control_notebook)
-        self.create_about_tab(self.control_notebook)
+        # Tabs in order Settings > History > Help > About; each is built when first shown
+        self._add_lazy_tab(self.control_notebook, "  ⚙️ Settings  ", self.create_settings_tab)
+        self._add_lazy_tab(self.control_notebook, "  🕘 History  ", self.create_history_tab)
+        self._add_lazy_tab(self.control_notebook, "  ❓ Help  ", self.create_help_tab)
+        self._add_lazy_tab(self.control_notebook, "  ℹ️ About  ", self.create_about_tab)
+        self.control_notebook.bind("<<NotebookTabChanged>>", self._on_lazy_tab_changed)
         
         # Select requested tab
-        self.control_notebook.select(tab_index)
+        self._select_control_tab(tab_index, sub_tab_index)
         
         # Footer with close button
         footer_frame = tk.Frame(self.control_panel, bg='#f5f6f7', height=60)
@@ -1338,7 +1778,7 @@ class ProRuler:
         button_container.pack(expand=True)
         
         close_btn = tk.Button(button_container, text="✖  Close Panel", 
-                             command=self.control_panel.destroy,
+                             command=self.close_control_panel,
                              bg="#f46067", fg="white", 
                              font=("Segoe UI", 12, "bold"),
                              padx=50, pady=12,
@@ -1349,6 +1789,45 @@ class ProRuler:
                              borderwidth=0)
         close_btn.pack()
 
+    def close_control_panel(self):
+        """Hide the control panel; its widgets are kept for the next open."""
+        if self.control_panel and self.control_panel.winfo_exists():
+            self.control_panel.withdraw()
+
+    def _sync_control_panel(self):
+        """Refresh built tabs from self.config (values may have changed while hidden)."""
+        for sync in self._panel_syncers:
+            try:
+                sync()
+            except tk.TclError as e:
+                print(f"Warning: Could not refresh control panel: {e}")
+
+    def _add_lazy_tab(self, notebook, text, build):
+        """Add an empty tab whose contents ``build(frame)`` creates on first selection."""
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=text)
+        self._lazy_tabs[str(frame)] = build
+        return frame
+
+    def _build_lazy_tab(self, notebook):
+        """Build the selected tab of ``notebook`` if it has not been built yet."""
+        selected = notebook.select()
+        build = self._lazy_tabs.pop(selected, None)
+        if build is not None:
+            build(notebook.nametowidget(selected))
+
+    def _on_lazy_tab_changed(self, event):
+        self._build_lazy_tab(event.widget)
+
+    def _select_control_tab(self, tab_index, sub_tab_index=0):
+        """Show a control panel tab (and Settings sub-tab), building it if needed."""
+        self.control_notebook.select(tab_index)
+        self._build_lazy_tab(self.control_notebook)
+        # If settings tab and sub_tab_index specified, switch to that sub-tab
+        if tab_index == 0 and hasattr(self, 'settings_notebook'):
+            self.settings_notebook.select(sub_tab_index)
+            self._build_lazy_tab(self.settings_notebook)
+
     def start_move_control_panel(self, event):
         """Start moving the control panel window"""
         self.control_panel_x = event.x
@@ -1362,10 +1841,188 @@ class ProRuler:
         y = self.control_panel.winfo_y() + deltay
         self.control_panel.geometry(f"+{x}+{y}")
     
-    def create_help_tab(self, notebook):
+    HISTORY_ROWS = 20  # rows materialized in the History list, whatever its length
+    HISTORY_LOAD_CHUNK = 1000  # log records parsed per Tk loop turn when the tab opens
+    HISTORY_RANGES = (("All time", None), ("Last hour", 3600), ("Last 24 hours", 86400),
+                      ("Last 7 days", 7 * 86400))
+
+    def create_history_tab(self, history_frame):
+        """Create History tab: a virtual list over the whole measurement log"""
+        # Every logged record is indexed once, HISTORY_LOAD_CHUNK at a time from
+        # the Tk loop so a long log never blocks it; only HISTORY_ROWS tree items exist
+        self.measurement_history.flush()
+        table = HistoryTable()
+        loading = [self.measurement_history.iter_log()]  # None once the log is in
+        live = []  # records copied while the log is loading or the panel is hidden
+        rows = self.HISTORY_ROWS
+        first = [0]  # index of the top visible row
+        
+        # Filters
+        filter_frame = tk.Frame(history_frame, bg='#f5f6f7')
+        filter_frame.pack(fill='x', padx=10, pady=(10, 5))
+        
+        ttk.Label(filter_frame, text="Mode:", font=("Arial", 9)).pack(side='left')
+        mode_var = tk.StringVar(value="All")
+        mode_box = ttk.Combobox(filter_frame, textvariable=mode_var, state="readonly", width=9,
+                                values=["All", "ruler", "polygon", "angle"])
+        mode_box.pack(side='left', padx=(3, 10))
+        
+        ttk.Label(filter_frame, text="Unit:", font=("Arial", 9)).pack(side='left')
+        unit_var = tk.StringVar(value="All")
+        unit_box = ttk.Combobox(filter_frame, textvariable=unit_var, state="readonly", width=6)
+        unit_box.pack(side='left', padx=(3, 10))
+        
+        ttk.Label(filter_frame, text="Time:", font=("Arial", 9)).pack(side='left')
+        range_var = tk.StringVar(value=self.HISTORY_RANGES[0][0])
+        range_box = ttk.Combobox(filter_frame, textvariable=range_var, state="readonly", width=13,
+                                 values=[name for name, _ in self.HISTORY_RANGES])
+        range_box.pack(side='left', padx=3)
+        
+        count_label = ttk.Label(history_frame, font=("Arial", 9), foreground="#5c616c")
+        count_label.pack(anchor='w', padx=10)
+        
+        # Virtual list: a fixed set of tree items re-filled from the table on scroll
+        list_frame = tk.Frame(history_frame, bg='#f5f6f7')
+        list_frame.pack(fill='both', expand=True, padx=10, pady=(5, 10))
+        
+        tree = ttk.Treeview(list_frame, columns=HistoryTable.COLUMNS, show="headings",
+                            height=rows, selectmode="browse")
+        headings = {"mode": "Mode", "value": "Value (current unit)", "unit": "Copied in", "time": "Time"}
+        widths = {"mode": 70, "value": 230, "unit": 70, "time": 140}
+        for column in HistoryTable.COLUMNS:
+            tree.column(column, width=widths[column], anchor='w', stretch=column == "value")
+            tree.heading(column, command=lambda c=column: sort_by(c))
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        iids = [tree.insert("", "end", values=()) for _ in range(rows)]
+        attached = [rows]
+        
+        def render():
+            total = len(table)
+            first[0] = max(0, min(first[0], total - rows))
+            shown = min(rows, total - first[0])
+            for k in range(shown):
+                tree.item(iids[k], values=self._history_row(table.row(first[0] + k)))
+            if shown < attached[0]:
+                tree.detach(*iids[shown:attached[0]])
+            for k in range(attached[0], shown):
+                tree.move(iids[k], "", k)
+            attached[0] = shown
+            if total > rows:
+                scrollbar.set(first[0] / total, (first[0] + rows) / total)
+            else:
+                scrollbar.set(0.0, 1.0)
+            suffix = " (loading...)" if loading[0] is not None else ""
+            count_label.config(text=f"{total} of {len(table.records)} measurements{suffix}")
+        
+        def scroll_to(index):
+            if index != first[0]:
+                first[0] = index
+                render()
+        
+        def on_scrollbar(action, amount, what=None):
+            if action == "moveto":
+                scroll_to(int(float(amount) * len(table)))
+            elif action == "scroll":
+                step = int(amount) * (1 if what == "units" else rows)
+                scroll_to(first[0] + step)
+        
+        def on_mousewheel(event):
+            if getattr(event, "num", None) in (4, 5):
+                scroll_to(first[0] + (-3 if event.num == 4 else 3))
+            else:
+                scroll_to(first[0] - 3 * int(event.delta / 120))
+            return "break"
+        
+        scrollbar.config(command=on_scrollbar)
+        tree.bind("<MouseWheel>", on_mousewheel)
+        tree.bind("<Button-4>", on_mousewheel)
+        tree.bind("<Button-5>", on_mousewheel)
+        
+        def update_headings():
+            for column in HistoryTable.COLUMNS:
+                arrow = ""
+                if column == table.sort_column:
+                    arrow = " ▼" if table.descending else " ▲"
+                tree.heading(column, text=headings[column] + arrow)
+        
+        def sort_by(column):
+            table.sort_by(column)
+            update_headings()
+            first[0] = 0
+            render()
+        
+        def apply_filters(event=None):
+            seconds = dict(self.HISTORY_RANGES).get(range_var.get())
+            since = datetime.now() - timedelta(seconds=seconds) if seconds else None
+            mode = mode_var.get()
+            unit = unit_var.get()
+            table.set_filter(mode=None if mode == "All" else mode,
+                             unit=None if unit == "All" else unit,
+                             since=since)
+            first[0] = 0
+            render()
+        
+        for box in (mode_box, unit_box, range_box):
+            box.bind("<<ComboboxSelected>>", apply_filters)
+        
+        def load_chunk():
+            if loading[0] is None or not tree.winfo_exists():
+                return
+            chunk = list(islice(loading[0], self.HISTORY_LOAD_CHUNK))
+            if len(chunk) < self.HISTORY_LOAD_CHUNK:
+                # Log read up to its size at open time; newer copies follow it
+                chunk.extend(live)
+                live.clear()
+                loading[0] = None
+            table.extend(chunk)
+            unit_box.config(values=["All"] + table.units())
+            render()
+            if loading[0] is not None:
+                self.root.after(1, load_chunk)
+        
+        def sync():
+            if live and loading[0] is None:
+                table.extend(live)
+                live.clear()
+                unit_box.config(values=["All"] + table.units())
+            render()
+        
+        def on_record(record):
+            live.append(record)
+            # Otherwise picked up by load_chunk, or by sync when the panel is shown again
+            if (loading[0] is None and tree.winfo_exists()
+                    and self.control_panel.state() != "withdrawn"):
+                sync()
+        
+        def on_unit_change(key, value):
+            if tree.winfo_exists():
+                render()
+        
+        # Values are shown in the current unit, so re-render when it changes
+        self.config.subscribe(("unit", "calibration_factor"), on_unit_change)
+        self._history_listener = on_record
+        self._panel_syncers.append(sync)
+        update_headings()
+        load_chunk()
+
+    def _history_row(self, record):
+        """Tree values for one history record, in the current unit"""
+        if record.mode == "polygon":
+            perimeter, area = record.values[:2]
+            value = f"{self.format_distance(perimeter)}  /  {self.format_area(area)}"
+        elif record.mode == "angle":
+            angle, arm1, arm2 = record.values[:3]
+            value = f"{angle:.1f}°  ({self.format_distance(arm1)}, {self.format_distance(arm2)})"
+        else:
+            dist, angle = record.values[:2]
+            value = f"{self.format_distance(dist)}  @ {angle:.1f}°"
+        return (record.mode.capitalize(), value, record.unit,
+                record.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def create_help_tab(self, help_frame):
         """Create Help tab"""
-        help_frame = ttk.Frame(notebook)
-        notebook.add(help_frame, text="  ❓ Help  ")
         
         # Create scrollable text widget with better styling
         scrollbar = tk.Scrollbar(help_frame)
@@ -1390,9 +2047,14 @@ H  - Show Help (this window)
 S  - Open Settings Tab  
 A  - Open About Tab
 C  - Copy Measurement to Clipboard
+E  - Export Measurement History (CSV/JSON/NDJSON)
 R  - Reset Ruler Position
 M  - Cycle Mode (Ruler/Fractions/Angle)
 G  - Toggle Guide Lines
+N  - Toggle Snap to Edges (handles jump to nearby edges)
+Ctrl+Click - Auto-measure: stretch the ruler to the edges around the click
+I  - Toggle Spacing Inspector (gaps around the element under the pointer)
+Z  - Toggle Magnifier Loupe (zoomed view while dragging a handle)
 V  - Toggle Ruler Labels
 L  - Cycle Lock (None/Horizontal/Vertical)
 T  - Cycle Theme
@@ -1404,6 +2066,8 @@ F  - Toggle Fraction Mode
 .  - Increase Thickness
 +  - Increase Opacity
 -  - Decrease Opacity
+F2    - Toggle Performance HUD
+Shift+F2 - Save Performance Stats (JSON)
 Space - Minimize to Tray
 Esc   - Exit Application
 
@@ -1489,23 +2153,18 @@ TIPS
 
         help_text_widget.config(state='disabled')  # Make read-only
 
-    def create_settings_tab(self, notebook):
+    def create_settings_tab(self, settings_frame):
         """Create Settings tab with sub-tabs"""
-        settings_frame = ttk.Frame(notebook)
-        notebook.add(settings_frame, text="  ⚙️ Settings  ")
-        
         # Create sub-notebook for settings categories with better styling
         self.settings_notebook = ttk.Notebook(settings_frame)
         self.settings_notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Appearance sub-tab
-        self.create_appearance_settings(self.settings_notebook)
-        
-        # Measurement sub-tab
-        self.create_measurement_settings(self.settings_notebook)
-        
-        # Calibration sub-tab
-        self.create_calibration_settings(self.settings_notebook)
+        # Appearance, Measurement and Calibration sub-tabs, built when first shown
+        self._add_lazy_tab(self.settings_notebook, "Appearance", self.create_appearance_settings)
+        self._add_lazy_tab(self.settings_notebook, "Measurement", self.create_measurement_settings)
+        self._add_lazy_tab(self.settings_notebook, "Calibration", self.create_calibration_settings)
+        self.settings_notebook.bind("<<NotebookTabChanged>>", self._on_lazy_tab_changed)
+        self._build_lazy_tab(self.settings_notebook)
         
         # Apply button with better styling
         button_frame = tk.Frame(settings_frame, bg='white')
@@ -1513,9 +2172,7 @@ TIPS
         
         def apply_and_save():
             self.save_config()
-            messagebox.showinfo("Settings Saved", 
-                              "✅ All settings have been saved successfully!", 
-                              parent=self.control_panel)
+            self.show_info("Settings Saved", "✅ All settings have been saved successfully!")
         
         tk.Button(button_frame, text="💾  Save All Settings", 
                  command=apply_and_save,
@@ -1527,10 +2184,8 @@ TIPS
                  activebackground="#4a85d4",
                  activeforeground="white").pack()
 
-    def create_appearance_settings(self, notebook):
+    def create_appearance_settings(self, appearance_frame):
         """Create appearance settings sub-tab"""
-        appearance_frame = ttk.Frame(notebook)
-        notebook.add(appearance_frame, text="Appearance")
         
         # Create scrollable frame
         canvas = tk.Canvas(appearance_frame, bg='white')
@@ -1552,7 +2207,7 @@ TIPS
         def update_theme(t):
             theme_var.set(t)
             self.set_theme(t)
-            self.draw()
+            self.request_redraw()
             
         for theme_name in self.themes.keys():
             tk.Radiobutton(scrollable_frame, text=theme_name.capitalize(), 
@@ -1584,7 +2239,7 @@ TIPS
                 self.init_polygon_default()
             self.set_mode_from_toolbar(new_mode)
             
-            self.draw()
+            self.request_redraw()
         
         for text, value in modes:
             tk.Radiobutton(scrollable_frame, text=text, 
@@ -1610,7 +2265,7 @@ TIPS
         
         def update_guides():
             self.config["show_guides"] = guides_var.get()
-            self.draw()
+            self.request_redraw()
         
         ttk.Checkbutton(scrollable_frame, text="Show Guide Lines",
                        variable=guides_var,
@@ -1621,19 +2276,37 @@ TIPS
         
         def update_labels():
             self.config["show_labels"] = labels_var.get()
-            self.draw()
+            self.request_redraw()
         
         ttk.Checkbutton(scrollable_frame, text="Show Ruler Labels",
                        variable=labels_var,
                        command=update_labels).pack(anchor='w', padx=30, pady=5)
         
+        # Redraw rate
+        tk.Label(scrollable_frame, text="Redraw Rate:", font=("Arial", 10, "bold")).pack(anchor='w', padx=10, pady=(15,5))
+        fps_var = tk.IntVar(value=self.config["target_fps"])
+        fps_options = [("60 FPS", 60), ("120 FPS", 120), ("Unlimited", 0)]
+        
+        for text, value in fps_options:
+            tk.Radiobutton(scrollable_frame, text=text,
+                          variable=fps_var, value=value,
+                          command=lambda: self.set_target_fps(fps_var.get())).pack(anchor='w', padx=30)
+        
+        def sync():
+            theme_var.set(self.config["theme"])
+            mode_var.set(self.config["mode"])
+            opacity_var.set(self.config["opacity_work"])
+            guides_var.set(self.config["show_guides"])
+            labels_var.set(self.config["show_labels"])
+            fps_var.set(self.config["target_fps"])
+        
+        self._panel_syncers.append(sync)
+        
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-    def create_measurement_settings(self, notebook):
+    def create_measurement_settings(self, measurement_frame):
         """Create measurement settings sub-tab"""
-        measurement_frame = ttk.Frame(notebook)
-        notebook.add(measurement_frame, text="Measurement")
         
         # Create scrollable frame
         canvas = tk.Canvas(measurement_frame, bg='white')
@@ -1663,7 +2336,7 @@ TIPS
         def update_unit():
             self.set_unit(unit_var.get())
             self.save_config()
-            self.draw()
+            self.request_redraw()
         
         for text, value in units:
             ttk.Radiobutton(scrollable_frame, text=text,
@@ -1678,7 +2351,7 @@ TIPS
         
         def update_tick(val):
             self.config["tick_spacing"] = int(float(val))
-            self.draw()
+            self.request_redraw()
         
         tick_slider = ttk.Scale(scrollable_frame, from_=10, to=50,
                                orient='horizontal', variable=tick_var, length=450,
@@ -1691,7 +2364,7 @@ TIPS
         
         def update_thickness(val):
             self.config["ruler_thickness"] = int(float(val))
-            self.draw()
+            self.request_redraw()
         
         thickness_slider = ttk.Scale(scrollable_frame, from_=1, to=20,
                                     orient='horizontal', variable=thickness_var, length=450,
@@ -1708,8 +2381,7 @@ TIPS
             v = lock_var.get()
             self.config["lock_angle"] = None if v == "None" else int(v)
             self.save_config()
-            self.update_lock_button()
-            self.draw()
+            self.request_redraw()
 
         for text, value in locks:
             ttk.Radiobutton(
@@ -1720,13 +2392,20 @@ TIPS
                 command=update_lock,
             ).pack(anchor='w', padx=30)
         
+        def sync():
+            unit_var.set(self.config["unit"])
+            tick_var.set(self.config["tick_spacing"])
+            thickness_var.set(self.config["ruler_thickness"])
+            lock = self.config.get("lock_angle")
+            lock_var.set("None" if lock is None else str(lock))
+        
+        self._panel_syncers.append(sync)
+        
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-    def create_calibration_settings(self, notebook):
+    def create_calibration_settings(self, calibration_frame):
         """Create calibration settings sub-tab"""
-        calibration_frame = ttk.Frame(notebook)
-        notebook.add(calibration_frame, text="Calibration")
         
         # Create scrollable frame
         canvas = tk.Canvas(calibration_frame, bg='white')
@@ -1749,9 +2428,8 @@ TIPS
         title_label.pack(anchor='w', padx=10, pady=(15,10))
         
         # Current measurement display
-        dist = self.get_distance()
         current_display = ttk.Label(scrollable_frame,
-                                   text=f"Current ruler length: {self.format_distance(dist)}",
+                                   text=f"Current ruler length: {self.format_distance(self.get_distance())}",
                                    font=("Arial", 10, "bold"),
                                    foreground="#5294e2")
         current_display.pack(anchor='w', padx=10, pady=10)
@@ -1775,37 +2453,22 @@ TIPS
         known_entry = ttk.Entry(known_frame, textvariable=known_var, width=10, font=("Arial", 10))
         known_entry.pack(side='left', padx=5)
         
-        ttk.Label(known_frame, text=self.config["unit"], font=("Arial", 9)).pack(side='left', padx=5)
+        unit_label = ttk.Label(known_frame, text=self.config["unit"], font=("Arial", 9))
+        unit_label.pack(side='left', padx=5)
         
         def calibrate_simple():
             known_value = known_var.get()
+            dist = self.get_distance()
             # Convert current pixel distance to currently selected unit (without calibration)
-            unit = self.normalize_unit(self.config.get("unit", "px"))
-            dpi = self.get_screen_dpi()
-            if unit == "px":
-                current_value = dist
-            elif unit == "mm":
-                current_value = dist / dpi * 25.4
-            elif unit == "cm":
-                current_value = dist / dpi * 2.54
-            elif unit == "m":
-                current_value = dist / dpi * 0.0254
-            elif unit == "in":
-                current_value = dist / dpi
-            elif unit == "um":
-                current_value = dist / dpi * 25400
-            else:
-                current_value = dist
+            current_value = self.unit_converter().to_unit(dist, self.config["unit"], calibrated=False)
 
             if current_value > 0:
                 # Factor such that formatted value equals known_value in selected unit
                 self.config["calibration_factor"] = known_value / current_value
                 self.save_config()
-                self.draw()
+                self.request_redraw()
                 current_display.config(text=f"Current ruler length: {self.format_distance(dist)}")
-                messagebox.showinfo("Calibration", 
-                                   f"Calibrated!\nFactor: {self.config['calibration_factor']:.4f}", 
-                                   parent=self.control_panel)
+                self.show_info("Calibration", f"Calibrated!\nFactor: {self.config['calibration_factor']:.4f}")
         
         tk.Button(known_frame, text="Calibrate",
                  command=calibrate_simple,
@@ -1834,9 +2497,9 @@ TIPS
         
         def apply_manual_calibration():
             self.config["calibration_factor"] = cal_var.get()
-            self.draw()
-            current_display.config(text=f"Current ruler length: {self.format_distance(dist)}")
-            messagebox.showinfo("Calibration", "Manual calibration applied!", parent=self.control_panel)
+            self.request_redraw()
+            current_display.config(text=f"Current ruler length: {self.format_distance(self.get_distance())}")
+            self.show_info("Calibration", "Manual calibration applied!")
         
         tk.Button(factor_frame, text="Apply",
                  command=apply_manual_calibration,
@@ -1851,9 +2514,9 @@ TIPS
         def reset_calibration():
             cal_var.set(1.0)
             self.config["calibration_factor"] = 1.0
-            self.draw()
-            current_display.config(text=f"Current ruler length: {self.format_distance(dist)}")
-            messagebox.showinfo("Calibration", "Calibration reset to default (1.0)", parent=self.control_panel)
+            self.request_redraw()
+            current_display.config(text=f"Current ruler length: {self.format_distance(self.get_distance())}")
+            self.show_info("Calibration", "Calibration reset to default (1.0)")
         
         tk.Button(reset_frame, text="🔄 Reset to Default (1.0)",
                  command=reset_calibration,
@@ -1871,13 +2534,18 @@ TIPS
                  font=("Arial", 8), foreground="#555555",
                  justify=tk.LEFT).pack(anchor='w')
         
+        def sync():
+            current_display.config(text=f"Current ruler length: {self.format_distance(self.get_distance())}")
+            unit_label.config(text=self.config["unit"])
+            cal_var.set(self.config["calibration_factor"])
+        
+        self._panel_syncers.append(sync)
+        
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-    def create_about_tab(self, notebook):
+    def create_about_tab(self, about_frame):
         """Create About tab"""
-        about_frame = ttk.Frame(notebook)
-        notebook.add(about_frame, text="  ℹ️ About  ")
         
         # Create canvas with scrollbar for scrollable content
         canvas = tk.Canvas(about_frame, bg='white', highlightthickness=0)
@@ -2067,7 +2735,7 @@ TIPS
             self.config["theme"] = theme_name
             self.config["color_active"] = self.themes[theme_name]["active"]
             self.config["color_pass"] = self.themes[theme_name]["pass"]
-            self.draw()
+            self.request_redraw()
 
     def cycle_theme(self, event=None):
         """Cycle through themes"""
@@ -2088,7 +2756,7 @@ TIPS
         self.save_config()
         if hasattr(self, 'unit_var'):
             self.unit_var.set(self.config["unit"])
-        self.draw()
+        self.request_redraw()
         self.show_notification(f"Unit: {unit_names[next_idx]}")
 
     def cycle_lock(self, event=None):
@@ -2098,7 +2766,6 @@ TIPS
         next_idx = (current_idx + 1) % len(locks)
         self.config["lock_angle"] = locks[next_idx]
         self.save_config()
-        self.update_lock_button()
         lock_text = "None" if locks[next_idx] is None else ("Horizontal" if locks[next_idx] == 0 else "Vertical")
         self.show_notification(f"Lock: {lock_text}")
 
@@ -2106,7 +2773,7 @@ TIPS
         """Toggle guide lines"""
         self.config["show_guides"] = not self.config["show_guides"]
         self.save_config()
-        self.draw()
+        self.request_redraw()
 
     def increase_opacity(self, event=None):
         """Increase opacity"""
@@ -2126,11 +2793,16 @@ TIPS
         self.save_config()
         self.show_notification(f"Opacity: {int(self.config['opacity_work']*100)}%")
 
+    def show_info(self, title, message, parent=None):
+        """Info dialog over ``parent`` (default: the control panel); messagebox loads on first use."""
+        messagebox = self.startup.import_module("tkinter.messagebox")
+        messagebox.showinfo(title, message, parent=parent or self.control_panel)
+
     def show_notification(self, text):
         """Show temporary notification in the toolbar measurement display."""
         # Store inline notification and update display
         self.inline_notification = text
-        self.draw()
+        self.request_redraw()
         # Clear after a short delay
         self.root.after(1800, self.clear_notification)
 
@@ -2138,7 +2810,7 @@ TIPS
         """Clear the inline notification and redraw."""
         if self.inline_notification is not None:
             self.inline_notification = None
-            self.draw()
+            self.request_redraw()
 
     def copy_measurement(self, event=None):
         """Copy current measurement to clipboard"""
@@ -2148,60 +2820,108 @@ TIPS
             ax1, ay1 = self.angle_arm1["x"], self.angle_arm1["y"]
             ax2, ay2 = self.angle_arm2["x"], self.angle_arm2["y"]
             
-            dist1 = math.sqrt((ax1 - cx)**2 + (ay1 - cy)**2)
-            dist2 = math.sqrt((ax2 - cx)**2 + (ay2 - cy)**2)
-            
-            angle1 = math.degrees(math.atan2(ay1 - cy, ax1 - cx))
-            angle2 = math.degrees(math.atan2(ay2 - cy, ax2 - cx))
-            
-            if angle1 < 0: angle1 += 360
-            if angle2 < 0: angle2 += 360
-            
-            angle_diff = abs(angle2 - angle1)
-            if angle_diff > 180:
-                angle_diff = 360 - angle_diff
+            dist1 = self.measured_length(cx, cy, ax1, ay1)
+            dist2 = self.measured_length(cx, cy, ax2, ay2)
+            angle_diff = angle_between(cx, cy, ax1, ay1, ax2, ay2)
             
             text = f"Angle: {angle_diff:.1f}° | Arm1: {self.format_distance(dist1)} | Arm2: {self.format_distance(dist2)}"
-            
-            # Add to history
-            self.measurement_history.append({
-                "angle": angle_diff,
-                "arm1": dist1,
-                "arm2": dist2,
-                "unit": self.config["unit"],
-                "time": datetime.now().strftime("%H:%M:%S"),
-                "mode": "angle"
-            })
+            self.record_measurement("angle", angle_diff, dist1, dist2)
         elif self.config["mode"] == "polygon":
             perimeter_px = self.get_polygon_perimeter_px()
             area_px2 = self.get_polygon_area_px2()
             text = f"Perimeter: {self.format_distance(perimeter_px)} | Area: {self.format_area(area_px2)}"
-
-            self.measurement_history.append({
-                "perimeter": perimeter_px,
-                "area": area_px2,
-                "unit": self.config["unit"],
-                "time": datetime.now().strftime("%H:%M:%S"),
-                "mode": "polygon"
-            })
+            self.record_measurement("polygon", perimeter_px, area_px2)
         else:
             # Normal ruler mode (or fallback)
             dist = self.get_distance()
             angle = self.get_angle()
             text = f"{self.format_distance(dist)} | {angle:.1f}°"
-
-            self.measurement_history.append({
-                "distance": dist,
-                "angle": angle,
-                "unit": self.config["unit"],
-                "time": datetime.now().strftime("%H:%M:%S"),
-                "mode": "ruler"
-            })
+            self.record_measurement("ruler", dist, angle)
         
         self.root.clipboard_clear()
         self.root.clipboard_append(text)
         self.show_notification("📋 Copied to clipboard!")
 
+    def record_measurement(self, mode, *values):
+        """Add a copied measurement to the history; the log is appended in batches."""
+        record = self.measurement_history.add(mode, self.config["unit"], *values)
+        if self._history_listener is not None:
+            self._history_listener(record)
+        if self._history_flush_id is None:
+            self._history_flush_id = self.root.after(2000, self._flush_history)
+
+    def _flush_history(self):
+        self._history_flush_id = None
+        self.measurement_history.flush()
+
+    def export_history(self, event=None):
+        """Export the whole measurement history (CSV, JSON or NDJSON) in a chosen unit"""
+        if self.history_export is not None and not self.history_export.done:
+            self.show_notification("Export already running")
+            return
+        if self._export_dialog is not None and self._export_dialog.winfo_exists():
+            self._export_dialog.lift()
+            return
+        
+        # Small unit picker first (the native save dialog cannot hold extra widgets)
+        dialog = self._export_dialog = tk.Toplevel(self.root)
+        dialog.title("Export Measurement History")
+        dialog.attributes('-topmost', True)
+        dialog.resizable(False, False)
+        dialog.configure(bg='#f5f6f7')
+        
+        body = tk.Frame(dialog, bg='#f5f6f7')
+        body.pack(padx=16, pady=(14, 8))
+        ttk.Label(body, text="Export lengths and areas in:", font=("Arial", 9)).pack(side='left')
+        unit_var = tk.StringVar(value=self.normalize_unit(self.config["unit"]))
+        unit_box = ttk.Combobox(body, textvariable=unit_var, state="readonly", width=5, values=list(UNITS))
+        unit_box.pack(side='left', padx=(6, 0))
+        
+        def choose_file(event=None):
+            unit = self.normalize_unit(unit_var.get())
+            dialog.destroy()
+            self._start_history_export(unit)
+        
+        buttons = tk.Frame(dialog, bg='#f5f6f7')
+        buttons.pack(padx=16, pady=(0, 14), fill='x')
+        ttk.Button(buttons, text="Cancel", command=dialog.destroy).pack(side='right')
+        ttk.Button(buttons, text="Choose File...", command=choose_file).pack(side='right', padx=(0, 6))
+        dialog.bind("<Return>", choose_file)
+        dialog.bind("<Escape>", lambda event: dialog.destroy())
+        unit_box.focus_set()
+    
+    def _start_history_export(self, unit):
+        """Ask for the export file and stream the history into it in ``unit``."""
+        filedialog = self.startup.import_module("tkinter.filedialog")
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export Measurement History",
+            initialfile=f"measurements_{datetime.now().strftime('%Y%m%d-%H%M%S')}_{unit}.csv",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("NDJSON", "*.ndjson")])
+        if not path:
+            return
+        # The worker streams the log file up to its current size (captured here, on the Tk thread)
+        self.measurement_history.flush()
+        self.history_export = HistoryExport(self.measurement_history.iter_log(), path,
+                                            self.unit_converter(), unit).start()
+        self._poll_history_export()
+
+    def _poll_history_export(self):
+        """Show export progress in the toolbar until the worker finishes."""
+        export = self.history_export
+        if export is None or export.cancelled:
+            return
+        if not export.done:
+            self.inline_notification = f"⬇ Exporting... {export.written:,} rows"
+            self.request_redraw()
+            self.root.after(100, self._poll_history_export)
+        elif export.error is not None:
+            print(f"Warning: Could not export measurement history: {export.error}")
+            self.show_notification("Export failed")
+        else:
+            self.show_notification(f"Exported {export.written:,} rows to {os.path.basename(export.path)}")
+
     def ensure_windows_visible(self):
         """Ensure main window and toolbar are visible and on top"""
         try:
@@ -2245,7 +2965,7 @@ TIPS
         self.ensure_windows_visible()
         
         self.update_mode_display()
-        self.draw()
+        self.request_redraw()
 
     def toggle_minimize(self, event=None):
         """Minimize to tray or restore window"""
@@ -2264,140 +2984,145 @@ TIPS
             self.show_notification("Minimized to tray")
 
     def get_distance(self):
-        """Calculate distance in pixels"""
-        return math.sqrt((self.p2["x"] - self.p1["x"])**2 + (self.p2["y"] - self.p1["y"])**2)
+        """Calculate distance in pixels (at the overlay DPI, see measured_length)"""
+        return self.measured_length(self.p1["x"], self.p1["y"], self.p2["x"], self.p2["y"])
 
     def get_polygon_perimeter_px(self):
-        """Return polygon perimeter in raw pixels."""
-        pts = self.polygon_points
-        n = len(pts)
-        if n < 2:
-            return 0.0
-        perim = 0.0
-        for i in range(n):
-            x1, y1 = pts[i]["x"], pts[i]["y"]
-            x2, y2 = pts[(i + 1) % n]["x"], pts[(i + 1) % n]["y"]
-            perim += math.hypot(x2 - x1, y2 - y1)
-        return perim
+        """Return polygon perimeter in pixels (at the overlay DPI)."""
+        if self.monitors.uniform_dpi:
+            return self.polygon_metrics.perimeter(self.polygon_points)
+        # Per-edge piecewise lengths, cached and updated edge by edge on drags
+        return self.polygon_metrics.scaled_perimeter(self.polygon_points, self.measured_length)
 
     def get_polygon_area_px2(self):
-        """Return polygon area in pixel^2 using the shoelace formula."""
-        pts = self.polygon_points
-        n = len(pts)
-        if n < 3:
-            return 0.0
-        area = 0.0
-        for i in range(n):
-            x1, y1 = pts[i]["x"], pts[i]["y"]
-            x2, y2 = pts[(i + 1) % n]["x"], pts[(i + 1) % n]["y"]
-            area += x1 * y2 - x2 * y1
-        return abs(area) / 2.0
+        """Return polygon area in pixel^2 using the shoelace formula.
+
+        With mixed monitor DPIs this is an approximation: the whole area is
+        scaled by the DPI of the monitor under the centre of the polygon's
+        bounding box, so a polygon spanning monitors with different scale
+        factors is measured as if it lay entirely on that monitor. (The
+        perimeter, by contrast, is measured piecewise per monitor.)
+        """
+        area = self.polygon_metrics.area(self.polygon_points)
+        if self.monitors.uniform_dpi or not self.polygon_points:
+            return area
+        # Mixed DPIs: scale by the monitor under the middle of the polygon
+        left, top, right, bottom = self.tool_bounds()
+        scale = self.get_screen_dpi() / self.get_screen_dpi((left + right) / 2, (top + bottom) / 2)
+        return area * scale * scale
+
+    def measured_length(self, x1, y1, x2, y2):
+        """Length of a segment in pixels at the overlay DPI.
+
+        When monitors have different DPIs the segment is measured piecewise,
+        each piece converted from its own monitor's DPI.
+        """
+        if self.monitors.uniform_dpi:
+            return distance(x1, y1, x2, y2)
+        ox, oy = self.virtual_x, self.virtual_y
+        return self.monitors.scaled_length(x1 + ox, y1 + oy, x2 + ox, y2 + oy, self.get_screen_dpi())
 
     def format_distance(self, pixels):
         """Format distance based on selected unit"""
-        # Apply calibration factor
-        calibrated_pixels = pixels * float(self.config.get("calibration_factor", 1.0))
-
-        unit = self.normalize_unit(self.config.get("unit", "px"))
-        dpi = self.get_screen_dpi()
-        if unit == "px":
-            return f"{int(calibrated_pixels)} px"
-        elif unit == "mm":
-            mm = calibrated_pixels / dpi * 25.4
-            return f"{mm:.2f} mm"
-        elif unit == "cm":
-            cm = calibrated_pixels / dpi * 2.54
-            return f"{cm:.2f} cm"
-        elif unit == "m":
-            meters = calibrated_pixels / dpi * 0.0254
-            return f"{meters:.4f} m"
-        elif unit == "in":
-            inches = calibrated_pixels / dpi
-            return f"{inches:.2f} in"
-        elif unit == "um":
-            um = calibrated_pixels / dpi * 25400
-            return f"{um:.1f} µm"
-        return f"{int(calibrated_pixels)} px"
+        unit = self.config["unit"]
+        return distance_formatter(unit)(self.unit_converter().to_unit(pixels, unit))
 
     def format_area(self, pixels_squared):
         """Format area based on selected unit squared."""
         if pixels_squared <= 0:
             return "0"
-
-        unit = self.normalize_unit(self.config.get("unit", "px"))
-        calib = float(self.config.get("calibration_factor", 1.0))
-        dpi = self.get_screen_dpi()
-
-        def px_to_unit_length(px_val: float) -> float:
-            if unit == "px":
-                return px_val * calib
-            if unit == "mm":
-                return (px_val * calib) / dpi * 25.4
-            if unit == "cm":
-                return (px_val * calib) / dpi * 2.54
-            if unit == "m":
-                return (px_val * calib) / dpi * 0.0254
-            if unit == "in":
-                return (px_val * calib) / dpi
-            if unit == "um":
-                return (px_val * calib) / dpi * 25400
-            return px_val * calib
-
-        side = math.sqrt(pixels_squared)
-        unit_side = px_to_unit_length(side)
-        area_unit = unit_side ** 2
-
-        suffix = {
-            "px": "px^2",
-            "mm": "mm^2",
-            "cm": "cm^2",
-            "m": "m^2",
-            "in": "in^2",
-            "um": "µm^2",
-        }.get(unit, "px^2")
-
-        # Choose formatting based on magnitude
-        if area_unit >= 100:
-            return f"{area_unit:,.1f} {suffix}"
-        if area_unit >= 1:
-            return f"{area_unit:.2f} {suffix}"
-        return f"{area_unit:.4f} {suffix}"
+        unit = self.config["unit"]
+        return area_formatter(unit)(self.unit_converter().area_to_unit(pixels_squared, unit))
 
     def get_angle(self):
         """Calculate angle in degrees"""
-        dx = self.p2["x"] - self.p1["x"]
-        dy = self.p2["y"] - self.p1["y"]
-        degrees = math.degrees(math.atan2(dy, dx))
-        return degrees if degrees >= 0 else degrees + 360
+        return bearing(self.p1["x"], self.p1["y"], self.p2["x"], self.p2["y"])
     
     def get_angle_diff(self):
         """Get angle difference in angle mode"""
-        cx, cy = self.angle_center["x"], self.angle_center["y"]
-        ax1, ay1 = self.angle_arm1["x"], self.angle_arm1["y"]
-        ax2, ay2 = self.angle_arm2["x"], self.angle_arm2["y"]
-        
-        angle1 = math.degrees(math.atan2(ay1 - cy, ax1 - cx))
-        angle2 = math.degrees(math.atan2(ay2 - cy, ax2 - cx))
-        
-        # Normalize angles to 0-360
-        if angle1 < 0: angle1 += 360
-        if angle2 < 0: angle2 += 360
-        
-        # Calculate the angle between arms (always positive, acute angle preferred)
-        angle_diff = abs(angle2 - angle1)
-        if angle_diff > 180:
-            angle_diff = 360 - angle_diff
-        
-        return angle_diff
+        return angle_between(self.angle_center["x"], self.angle_center["y"],
+                             self.angle_arm1["x"], self.angle_arm1["y"],
+                             self.angle_arm2["x"], self.angle_arm2["y"])
+
+    def request_redraw(self):
+        """Schedule a redraw on the next frame."""
+        self.scheduler.request()
+
+    def set_target_fps(self, fps):
+        """Change the redraw rate cap (0 = unlimited)."""
+        self.config["target_fps"] = max(0, min(240, int(fps)))
+        self.scheduler.set_fps(self.config["target_fps"])
+        self.save_config()
 
+    # Phases listed first in the HUD, in frame order
+    PERF_PHASES = ("frame", "guides", "body", "ticks", "handles", "clear", "display",
+                   "on_click", "on_drag", "drag_apply", "on_mouse_move")
+
+    def toggle_perf_hud(self, event=None):
+        """Toggle frame-time recording and the on-canvas performance HUD (F2)."""
+        self.perf.enabled = not self.perf.enabled
+        self.perf.reset()
+        self._perf_hud_lines = []
+        self._perf_hud_at = 0.0
+        self.show_notification("Performance HUD: " + ("On" if self.perf.enabled else "Off"))
+
+    def draw_perf_hud(self, color):
+        """Draw the rolling timing summary in the top-left corner of the overlay."""
+        perf = self.perf
+        # Item counts are from the previous frame (this one is still being built)
+        for role in ("guides", "body", "ticks", "labels", "handles"):
+            perf.gauge(role, self.scene.item_count(role))
+        perf.gauge("items", self.scene.item_count())
+        frames = self.scheduler.stats()
+        perf.gauge("coalesced", frames["coalesced"])
+        perf.gauge("dropped", frames["dropped"])
+
+        # Percentiles are re-sorted a few times per second, not every frame
+        now = time.perf_counter()
+        if now - self._perf_hud_at >= 0.25:
+            self._perf_hud_lines = perf.summary_lines(self.PERF_PHASES)
+            self._perf_hud_at = now
+        left, top, _, _ = self.visible_rect()
+        self.scene.text("hud", left + 12, top + 12, text="\n".join(self._perf_hud_lines),
+                        anchor="nw", justify=tk.LEFT, fill=color, font=("Consolas", 9, "normal"))
+
+    def dump_perf_stats(self, event=None):
+        """Save the current timing summary as JSON (Shift+F2)."""
+        if not self.perf.enabled:
+            self.show_notification("Press F2 to start recording first")
+            return
+        path = f"perf_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        try:
+            extra = {
+                "mode": self.config["mode"],
+                "target_fps": self.config["target_fps"],
+                "scheduler": self.scheduler.stats(),
+                "startup": self.startup.to_dict(),
+            }
+            if self.capture is not None:
+                extra["capture"] = self.capture.stats()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.perf.to_json(extra))
+            self.show_notification(f"Saved {path}")
+        except OSError as e:
+            print(f"Warning: Could not save performance stats: {e}")
+            self.show_notification("Could not save stats")
+
+    @timed("frame")
     def draw(self):
         """Main drawing function"""
+        perf = self.perf
         try:
-            self.canvas.delete("all")
+            self.scene.begin_frame()
             
             if self.minimized:
+                # Nothing is used this frame, so end_frame() clears the canvas
+                self.scene.end_frame()
                 return
 
+            # Resize/move the window first: tick clipping uses the visible rect
+            self._update_viewport()
+
             # Choose color based on mode
             current_color = self.config["color_pass"] if self.is_passthrough else self.config["color_active"]
 
@@ -2408,21 +3133,48 @@ TIPS
                 self.draw_polygon_mode(current_color)
             else:
                 self.draw_ruler_mode(current_color)
+            if self.inspector_hit is not None:
+                self.draw_inspector()
+            if perf.enabled:
+                self.draw_perf_hud(current_color)
+            with perf.phase("clear"):
+                self.scene.end_frame()
             
             # Update measurement display in toolbar
-            self.update_measurement_display()
+            with perf.phase("display"):
+                self.update_measurement_display()
         except tk.TclError as e:
             # Canvas or window may have been destroyed
             print(f"Warning: Could not draw ruler: {e}")
         except Exception as e:
             print(f"Error in draw method: {e}")
-            # Try to continue with basic ruler
+            # Try to continue with basic ruler on a clean scene
             try:
+                self.scene.reset()
+                self.scene.begin_frame()
                 current_color = self.config.get("color_active", "#00FFFF")
                 self.draw_ruler_mode(current_color)
+                self.scene.end_frame()
             except Exception:
                 pass
     
+    def measurement_text(self):
+        """Current measurement as shown in the toolbar (and the loupe)"""
+        if self.config["mode"] == "angle":
+            angle_diff = self.get_angle_diff()
+            return f"{angle_diff:.1f}°"
+        elif self.config["mode"] == "polygon":
+            perimeter_px = self.get_polygon_perimeter_px()
+            area_px2 = self.get_polygon_area_px2()
+            perim_text = self.format_distance(perimeter_px)
+            area_text = self.format_area(area_px2)
+            return f"P: {perim_text}, A: {area_text}"
+        else:
+            dist = self.get_distance()
+            angle = self.get_angle()
+            dist_text = self.format_distance(dist)
+            return f"{dist_text}, {angle:.1f}°"
+
     def update_measurement_display(self):
         """Update the measurement display in the toolbar"""
         try:
@@ -2430,20 +3182,7 @@ TIPS
             if self.inline_notification:
                 value_text = self.inline_notification
             else:
-                if self.config["mode"] == "angle":
-                    angle_diff = self.get_angle_diff()
-                    value_text = f"{angle_diff:.1f}°"
-                elif self.config["mode"] == "polygon":
-                    perimeter_px = self.get_polygon_perimeter_px()
-                    area_px2 = self.get_polygon_area_px2()
-                    perim_text = self.format_distance(perimeter_px)
-                    area_text = self.format_area(area_px2)
-                    value_text = f"P: {perim_text}, A: {area_text}"
-                else:
-                    dist = self.get_distance()
-                    angle = self.get_angle()
-                    dist_text = self.format_distance(dist)
-                    value_text = f"{dist_text}, {angle:.1f}°"
+                value_text = self.measurement_text()
 
             # Update measurement value label (no mode tag - it's now in the button)
             if hasattr(self, 'measurement_value_label'):
@@ -2465,23 +3204,28 @@ TIPS
         """Draw ruler in normal or fraction mode"""
         x1, y1 = self.p1["x"], self.p1["y"]
         x2, y2 = self.p2["x"], self.p2["y"]
-        dist = self.get_distance()
+        dist = distance(x1, y1, x2, y2)  # on-screen length for tick geometry
+
+        perf = self.perf
 
         # 1. Draw Guides (optional)
         if self.config["show_guides"]:
-            self.canvas.create_line(x1, 0, x1, self.screen_height, fill="#222", dash=(4, 4))
-            self.canvas.create_line(0, y1, self.screen_width, y1, fill="#222", dash=(4, 4))
+            with perf.phase("guides"):
+                self.scene.line("guides", x1, 0, x1, self.screen_height, fill="#222", dash=(4, 4))
+                self.scene.line("guides", 0, y1, self.screen_width, y1, fill="#222", dash=(4, 4))
 
         # 2. Main Line
-        self.canvas.create_line(x1, y1, x2, y2, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
+        with perf.phase("body"):
+            self.scene.line("body", x1, y1, x2, y2, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
         
         # 3. Ticks
         self.draw_ticks(x1, y1, x2, y2, dist, current_color)
 
         # 4. Endpoints (Handles)
-        r = 10
-        self.canvas.create_oval(x1-r, y1-r, x1+r, y1+r, outline=current_color, width=3, fill=self.config["bg_color"])
-        self.canvas.create_oval(x2-r, y2-r, x2+r, y2+r, outline=current_color, width=3, fill=self.config["bg_color"])
+        with perf.phase("handles"):
+            r = 10
+            self.scene.oval("handles", x1-r, y1-r, x1+r, y1+r, outline=current_color, width=3, fill=self.config["bg_color"])
+            self.scene.oval("handles", x2-r, y2-r, x2+r, y2+r, outline=current_color, width=3, fill=self.config["bg_color"])
 
         # Measurement text is now shown in the toolbar instead of on canvas
 
@@ -2491,22 +3235,26 @@ TIPS
             if not self.polygon_points:
                 self.init_polygon_default()
 
-            pts = self.polygon_points
-            n = len(pts)
+            n = len(self.polygon_points)
             if n < 2:
                 return
+            coords = self.polygon_points.coords()
 
             # Draw edges
-            for i in range(n):
-                x1, y1 = pts[i]["x"], pts[i]["y"]
-                x2, y2 = pts[(i + 1) % n]["x"], pts[(i + 1) % n]["y"]
-                self.canvas.create_line(x1, y1, x2, y2, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
+            with self.perf.phase("body"):
+                for i in range(n):
+                    j = (i + 1) % n
+                    x1, y1 = coords[2 * i], coords[2 * i + 1]
+                    x2, y2 = coords[2 * j], coords[2 * j + 1]
+                    self.scene.line("body", x1, y1, x2, y2, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
 
             # Vertices (handles)
-            r = 8
-            for p in pts:
-                self.canvas.create_oval(p["x"] - r, p["y"] - r, p["x"] + r, p["y"] + r,
-                                       outline=current_color, width=3, fill=self.config["bg_color"])
+            with self.perf.phase("handles"):
+                r = 8
+                for i in range(0, 2 * n, 2):
+                    x, y = coords[i], coords[i + 1]
+                    self.scene.oval("handles", x - r, y - r, x + r, y + r,
+                                    outline=current_color, width=3, fill=self.config["bg_color"])
         except Exception as e:
             print(f"Warning: Error drawing polygon: {e}")
     
@@ -2516,30 +3264,37 @@ TIPS
         ax1, ay1 = self.angle_arm1["x"], self.angle_arm1["y"]
         ax2, ay2 = self.angle_arm2["x"], self.angle_arm2["y"]
         
+        perf = self.perf
+        
         # Draw guide lines if enabled
         if self.config["show_guides"]:
-            self.canvas.create_line(cx, 0, cx, self.screen_height, fill="#222", dash=(4, 4))
-            self.canvas.create_line(0, cy, self.screen_width, cy, fill="#222", dash=(4, 4))
+            with perf.phase("guides"):
+                self.scene.line("guides", cx, 0, cx, self.screen_height, fill="#222", dash=(4, 4))
+                self.scene.line("guides", 0, cy, self.screen_width, cy, fill="#222", dash=(4, 4))
         
         # Draw the two arms
-        self.canvas.create_line(cx, cy, ax1, ay1, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
-        self.canvas.create_line(cx, cy, ax2, ay2, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
+        with perf.phase("body"):
+            self.scene.line("body", cx, cy, ax1, ay1, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
+            self.scene.line("body", cx, cy, ax2, ay2, fill=current_color, width=self.config["ruler_thickness"], capstyle=tk.ROUND)
         
         # Draw ticks on both arms
         dist1 = math.sqrt((ax1 - cx)**2 + (ay1 - cy)**2)
         dist2 = math.sqrt((ax2 - cx)**2 + (ay2 - cy)**2)
-        self.draw_ticks(cx, cy, ax1, ay1, dist1, current_color)
-        self.draw_ticks(cx, cy, ax2, ay2, dist2, current_color)
-        
-        # Draw center point (larger)
-        r_center = 15
-        self.canvas.create_oval(cx-r_center, cy-r_center, cx+r_center, cy+r_center, 
-                               outline=current_color, width=4, fill=self.config["bg_color"])
-        
-        # Draw arm endpoints
-        r = 10
-        self.canvas.create_oval(ax1-r, ay1-r, ax1+r, ay1+r, outline=current_color, width=3, fill=self.config["bg_color"])
-        self.canvas.create_oval(ax2-r, ay2-r, ax2+r, ay2+r, outline=current_color, width=3, fill=self.config["bg_color"])
+        # Both arms share the per-frame tick budget
+        arm_budget = self.config["max_tick_items"] // 2
+        self.draw_ticks(cx, cy, ax1, ay1, dist1, current_color, arm_budget)
+        self.draw_ticks(cx, cy, ax2, ay2, dist2, current_color, arm_budget)
+        
+        with perf.phase("handles"):
+            # Draw center point (larger)
+            r_center = 15
+            self.scene.oval("handles", cx-r_center, cy-r_center, cx+r_center, cy+r_center,
+                            outline=current_color, width=4, fill=self.config["bg_color"])
+            
+            # Draw arm endpoints
+            r = 10
+            self.scene.oval("handles", ax1-r, ay1-r, ax1+r, ay1+r, outline=current_color, width=3, fill=self.config["bg_color"])
+            self.scene.oval("handles", ax2-r, ay2-r, ax2+r, ay2+r, outline=current_color, width=3, fill=self.config["bg_color"])
         
         # Draw arc to visualize angle
         angle1 = math.degrees(math.atan2(ay1 - cy, ax1 - cx))
@@ -2563,8 +3318,8 @@ TIPS
             else:
                 arc_extent = arc_extent + 360
         
-        self.canvas.create_arc(cx-arc_radius, cy-arc_radius, cx+arc_radius, cy+arc_radius,
-                              start=angle1, extent=arc_extent, outline=current_color, width=2, style=tk.ARC)
+        self.scene.arc("body", cx-arc_radius, cy-arc_radius, cx+arc_radius, cy+arc_radius,
+                       start=angle1, extent=arc_extent, outline=current_color, width=2, style=tk.ARC)
         
         # Measurement text is now shown in the toolbar instead of on canvas
 
@@ -2574,21 +3329,21 @@ TIPS
             cx = self.virtual_x + (self.virtual_w / 2)
             cy = self.virtual_y + (self.virtual_h / 2)
             w, h = 320, 200
-            self.polygon_points = [
+            self.polygon_points = PointBuffer([
                 {"x": cx - w / 2, "y": cy - h / 2},
                 {"x": cx + w / 2, "y": cy - h / 2},
                 {"x": cx + w / 2, "y": cy + h / 2},
                 {"x": cx - w / 2, "y": cy + h / 2},
-            ]
+            ])
         except Exception as e:
             print(f"Warning: Could not initialize default polygon: {e}")
             # Absolute fallback with hardcoded values
-            self.polygon_points = [
+            self.polygon_points = PointBuffer([
                 {"x": 400, "y": 300},
                 {"x": 720, "y": 300},
                 {"x": 720, "y": 500},
                 {"x": 400, "y": 500},
-            ]
+            ])
     
     def get_color_with_alpha(self, hex_color):
         """Convert hex color to RGB tuple for PIL"""
@@ -2611,162 +3366,128 @@ TIPS
         
         return f"#{r:02x}{g:02x}{b:02x}"
 
-    def draw_ticks(self, x1, y1, x2, y2, dist, color):
+    def visible_rect(self):
+        """Visible area in canvas coordinates (the whole desktop, or the compact window)."""
+        return self.viewport.rect or self.viewport.full_rect
+
+    def _canvas_event(self, handler):
+        """Wrap an event handler so event.x/y are desktop canvas coordinates."""
+        canvas = self.canvas
+
+        def translate(event):
+            event.x = canvas.canvasx(event.x)
+            event.y = canvas.canvasy(event.y)
+            return handler(event)
+
+        return translate
+
+    def tool_bounds(self):
+        """Bounding box (left, top, right, bottom) of the active tool in canvas coordinates."""
+        mode = self.config["mode"]
+        if mode == "angle":
+            cx, cy = self.angle_center["x"], self.angle_center["y"]
+            arc = 60  # radius of the angle arc
+            xs = (cx - arc, cx + arc, self.angle_arm1["x"], self.angle_arm2["x"])
+            ys = (cy - arc, cy + arc, self.angle_arm1["y"], self.angle_arm2["y"])
+        elif mode == "polygon" and self.polygon_points:
+            coords = self.polygon_points.coords()
+            xs, ys = coords[0::2], coords[1::2]
+        else:
+            xs = (self.p1["x"], self.p2["x"])
+            ys = (self.p1["y"], self.p2["y"])
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def _update_viewport(self):
+        """Fit the overlay window to the tool, or cover the desktop when needed."""
+        # Guides span the whole desktop, the HUD sits in its corner and the inspector follows the pointer
+        if (not self.config["compact_overlay"] or self.config["show_guides"] or self.perf.enabled
+                or self.inspector_on):
+            self.viewport.show_full()
+            return
+        dragging = (self.dragging is not None or self.polygon_dragging_index is not None
+                    or self.polygon_move_origin is not None)
+        self.viewport.fit(self.tool_bounds(), grow_only=dragging)
+
+    def toggle_compact_overlay(self, event=None):
+        """Toggle between a desktop-sized overlay and one that tracks the tool"""
+        self.config["compact_overlay"] = not self.config["compact_overlay"]
+        self.save_config()
+        self.request_redraw()
+        status = "ON" if self.config["compact_overlay"] else "OFF"
+        self.show_notification(f"Compact Overlay: {status}")
+
+    @timed("ticks")
+    def draw_ticks(self, x1, y1, x2, y2, dist, color, max_items=None):
         """Draw measurement ticks with unit-aware major/minor steps"""
         if dist <= 0:
             return
 
-        ux = (x2 - x1) / dist
-        uy = (y2 - y1) / dist
-        nx, ny = -uy, ux
-
-        # Fractions mode keeps equal partitions as before
+        show_labels = self.config.get("show_labels", True)
         if self.config["show_fractions"]:
-            fraction_count = max(2, self.config["fraction_count"])
-            for i in range(fraction_count + 1):
-                t = i / fraction_count
-                px = x1 + (x2 - x1) * t
-                py = y1 + (y2 - y1) * t
-                length = 16 if i in (0, fraction_count) else 12
-                self.canvas.create_line(px + nx*length, py + ny*length,
-                                        px - nx*length, py - ny*length,
-                                        fill=color, width=2)
-                if self.config["show_labels"] and 0 < i < fraction_count:
-                    label = f"{i}/{fraction_count}"
-                    self.canvas.create_text(px + nx*26, py + ny*26, text=label,
-                                            fill=color, font=("Arial", 8, "normal"))
+            # Fractions mode keeps equal partitions as before
+            geometry = self.tick_engine.fractions(x1, y1, x2, y2, dist,
+                                                  self.config["fraction_count"], show_labels)
+        elif not self.monitors.uniform_dpi:
+            # Monitors with different DPIs: each piece gets its own tick spacing
+            for geometry in self._tick_pieces(x1, y1, x2, y2, dist, show_labels, max_items):
+                self._emit_ticks(geometry, color)
             return
-
-        # Unit-aware ticks
-        unit = self.normalize_unit(self.config.get("unit", "px"))
-        calib = max(1e-6, float(self.config.get("calibration_factor", 1.0)))
-        dpi = self.get_screen_dpi()
-
-        def px_per(unit_name: str) -> float:
-            if unit_name == "in":
-                return dpi / calib
-            if unit_name == "cm":
-                return (dpi / 2.54) / calib
-            if unit_name == "mm":
-                return (dpi / 25.4) / calib
-            if unit_name == "um":
-                return (dpi / 25400.0) / calib
-            if unit_name == "m":
-                return (dpi / 0.0254) / calib
-            # px
-            return 1.0  # px not adjusted by calibration for spacing
-
-        # Determine minor step size in pixels and hierarchy
-        if unit == "px":
-            minor_px = max(5, int(self.config.get("tick_spacing", 20)))
-            # Hierarchy: minor, medium every x5, major every x10
-            medium_mult, major_mult = 5, 10
-            label_every = major_mult
-            label_format = lambda i: f"{i*minor_px} px"
-        elif unit == "in":
-            base = px_per("in")
-            minor_px = base / 8.0  # 1/8 inch
-            # Normalize to at least 8px between ticks for readability
-            min_pixels = 8.0
-            if minor_px < min_pixels:
-                scale = math.ceil(min_pixels / minor_px)
-                minor_px *= scale
-            # Mod pattern: 8 -> 1", 4 -> 1/2", 2 -> 1/4"
-            medium2_mult, medium_mult, major_mult = 2, 4, 8
-            label_every = major_mult
-            def label_format(i):
-                inches = (i * minor_px) / (px_per("in"))
-                return f"{int(round(inches))} in"
-        elif unit == "cm":
-            base = px_per("cm")
-            minor_px = base * 0.1  # 1 mm
-            min_pixels = 6.0
-            if minor_px < min_pixels:
-                scale = math.ceil(min_pixels / minor_px)
-                minor_px *= scale
-            medium_mult, major_mult = 5, 10   # 0.5cm, 1cm
-            label_every = major_mult
-            def label_format(i):
-                cm_val = (i * minor_px) / base
-                return f"{int(round(cm_val))} cm"
-        elif unit == "mm":
-            base = px_per("mm")
-            minor_px = base * 1.0  # 1 mm
-            min_pixels = 6.0
-            if minor_px < min_pixels:
-                scale = math.ceil(min_pixels / minor_px)
-                minor_px *= scale
-            medium_mult, major_mult = 5, 10   # 5mm, 10mm
-            label_every = major_mult
-            def label_format(i):
-                mm_val = (i * minor_px) / base
-                return f"{int(round(mm_val))} mm"
-        elif unit == "m":
-            base = px_per("m")
-            minor_px = base * 0.01  # 1 cm (0.01 m)
-            min_pixels = 6.0
-            if minor_px < min_pixels:
-                scale = math.ceil(min_pixels / minor_px)
-                minor_px *= scale
-            medium_mult, major_mult = 5, 10   # 0.05m, 0.1m
-            label_every = major_mult
-            def label_format(i):
-                m_val = (i * minor_px) / base
-                return f"{m_val:.2f} m"
-        else:  # um
-            base = px_per("um")
-            # Start with 100 µm minor
-            minor_px = base * 100.0
-            min_pixels = 6.0
-            if minor_px < min_pixels:
-                scale = math.ceil(min_pixels / minor_px)
-                minor_px *= scale
-            medium_mult, major_mult = 5, 10   # 500µm, 1000µm
-            label_every = major_mult
-            def label_format(i):
-                um_val = (i * minor_px) / base
-                return f"{int(round(um_val))} µm"
-
-        # Draw ticks along the segment
-        steps = int(dist // minor_px) + 1
-        for i in range(steps + 1):
-            px = x1 + ux * (i * minor_px)
-            py = y1 + uy * (i * minor_px)
-
-            # Determine tick length by hierarchy
-            length = 10
-            if unit == "in":
-                if i % major_mult == 0:
-                    length = 18
-                elif i % medium_mult == 0:
-                    length = 14
-                elif i % medium2_mult == 0:
-                    length = 12
-                else:
-                    length = 9
-            else:
-                if i % major_mult == 0:
-                    length = 16
-                elif i % medium_mult == 0:
-                    length = 12
-                else:
-                    length = 8
-
-            self.canvas.create_line(px + nx*length, py + ny*length,
-                                    px - nx*length, py - ny*length,
-                                    fill=color, width=2)
-
-            # Labels at major ticks
-            if self.config.get("show_labels", True):
-                if unit == "in":
-                    if i % label_every == 0:
-                        self.canvas.create_text(px + nx*28, py + ny*28, text=label_format(i),
-                                                fill=color, font=("Arial", 8, "normal"))
-                else:
-                    if i % label_every == 0:
-                        self.canvas.create_text(px + nx*26, py + ny*26, text=label_format(i),
-                                                fill=color, font=("Arial", 8, "normal"))
-
+        else:
+            # Unit-aware ticks from the cached plan for the current settings
+            plan = self.tick_engine.plan(self.config["unit"],
+                                         self.get_screen_dpi(),
+                                         self.config.get("calibration_factor", 1.0),
+                                         self.config.get("tick_spacing", 20))
+            if max_items is None:
+                max_items = self.config["max_tick_items"]
+            geometry = self.tick_engine.segment(plan, x1, y1, x2, y2, dist, show_labels,
+                                                clip=self.visible_rect(),
+                                                max_items=max_items,
+                                                min_tick_px=self.config["lod_min_tick_px"])
+        self._emit_ticks(geometry, color)
+
+    def _tick_pieces(self, x1, y1, x2, y2, dist, show_labels, max_items=None):
+        """Tick geometry for each monitor piece of a segment, at that monitor's DPI.
+
+        Each piece is drawn as part of a ruler starting at an origin placed
+        so that the physical length before the piece (summed at every earlier
+        piece's DPI) maps to this monitor's DPI; tick indices and labels then
+        continue across the monitor boundary.
+        """
+        ox, oy = self.virtual_x, self.virtual_y
+        pieces = self.monitors.split_segment(x1 + ox, y1 + oy, x2 + ox, y2 + oy)
+        ux, uy = (x2 - x1) / dist, (y2 - y1) / dist
+        if max_items is None:
+            max_items = self.config["max_tick_items"]
+        budget = max(20, max_items // len(pieces))
+        clip = self.visible_rect()
+        inches = 0.0  # physical length of the pieces already drawn
+        for dpi, t0, t1 in pieces:
+            plan = self.tick_engine.plan(self.config["unit"], dpi,
+                                         self.config.get("calibration_factor", 1.0),
+                                         self.config.get("tick_spacing", 20))
+            before = inches * dpi  # earlier pieces, in this monitor's pixels
+            length = (t1 - t0) * dist
+            sx, sy = x1 + ux * (t0 * dist - before), y1 + uy * (t0 * dist - before)
+            yield self.tick_engine.segment(plan, sx, sy, x1 + ux * t1 * dist, y1 + uy * t1 * dist,
+                                           before + length, show_labels, clip=clip,
+                                           max_items=budget,
+                                           min_tick_px=self.config["lod_min_tick_px"],
+                                           start=before, end=before + length if t1 < 1.0 else None)
+            inches += length / dpi
+
+    def _emit_ticks(self, geometry, color):
+        ticks = geometry.ticks
+        for k in range(0, len(ticks), 4):
+            self.scene.line("ticks", ticks[k], ticks[k + 1], ticks[k + 2], ticks[k + 3],
+                            fill=color, width=2)
+
+        label_xy = geometry.label_xy
+        for k, text in enumerate(geometry.labels):
+            self.scene.text("labels", label_xy[2 * k], label_xy[2 * k + 1], text=text,
+                            fill=color, font=("Arial", 8, "normal"))
+
+    @timed("on_click")
     def on_click(self, event):
         """Handle mouse click"""
         if self.is_passthrough:
@@ -2778,75 +3499,40 @@ TIPS
             ax1, ay1 = self.angle_arm1["x"], self.angle_arm1["y"]
             ax2, ay2 = self.angle_arm2["x"], self.angle_arm2["y"]
             
-            d_center = math.hypot(event.x - cx, event.y - cy)
-            d_arm1 = math.hypot(event.x - ax1, event.y - ay1)
-            d_arm2 = math.hypot(event.x - ax2, event.y - ay2)
-            
-            if d_center < 25:
-                self.dragging = "angle_center"
-            elif d_arm1 < 25:
+            handle = hit_handle(event.x, event.y, [(cx, cy), (ax1, ay1), (ax2, ay2)], 25)
+            if handle is not None:
+                self.dragging = ("angle_center", "angle_arm1", "angle_arm2")[handle]
+            # Check if clicking near either arm line
+            elif near_segment(event.x, event.y, cx, cy, ax1, ay1, 10):
                 self.dragging = "angle_arm1"
-            elif d_arm2 < 25:
+            elif near_segment(event.x, event.y, cx, cy, ax2, ay2, 10):
                 self.dragging = "angle_arm2"
-            else:
-                # Check if clicking near either arm line
-                # Check arm 1
-                line_len1 = math.hypot(ax1 - cx, ay1 - cy)
-                if line_len1 > 0:
-                    dist_to_line1 = abs((ay1-cy)*event.x - (ax1-cx)*event.y + ax1*cy - ay1*cx) / line_len1
-                    dot1 = ((event.x - cx) * (ax1 - cx) + (event.y - cy) * (ay1 - cy)) / (line_len1 * line_len1)
-                    
-                    if dist_to_line1 < 10 and 0 <= dot1 <= 1:
-                        self.dragging = "angle_arm1"
-                        return
-                
-                # Check arm 2
-                line_len2 = math.hypot(ax2 - cx, ay2 - cy)
-                if line_len2 > 0:
-                    dist_to_line2 = abs((ay2-cy)*event.x - (ax2-cx)*event.y + ax2*cy - ay2*cx) / line_len2
-                    dot2 = ((event.x - cx) * (ax2 - cx) + (event.y - cy) * (ay2 - cy)) / (line_len2 * line_len2)
-                    
-                    if dist_to_line2 < 10 and 0 <= dot2 <= 1:
-                        self.dragging = "angle_arm2"
-                        return
         elif self.config["mode"] == "polygon":
             # Polygon mode interaction
             if not self.polygon_points:
                 self.init_polygon_default()
 
             # Check vertex hit
-            for idx, p in enumerate(self.polygon_points):
-                if math.hypot(event.x - p["x"], event.y - p["y"]) < 18:
-                    self.polygon_dragging_index = idx
-                    return
+            pts = self.polygon_points
+            idx = self.polygon_index.hit_vertex(pts, event.x, event.y, 18)
+            if idx is not None:
+                self.polygon_dragging_index = idx
+                return
 
             # Check near edge to move whole shape
-            pts = self.polygon_points
-            n = len(pts)
-            for i in range(n):
-                x1, y1 = pts[i]["x"], pts[i]["y"]
-                x2, y2 = pts[(i + 1) % n]["x"], pts[(i + 1) % n]["y"]
-                seg_len = math.hypot(x2 - x1, y2 - y1)
-                if seg_len == 0:
-                    continue
-                dist_to_seg = abs((y2 - y1) * event.x - (x2 - x1) * event.y + x2 * y1 - y2 * x1) / seg_len
-                dot = ((event.x - x1) * (x2 - x1) + (event.y - y1) * (y2 - y1)) / (seg_len * seg_len)
-                if dist_to_seg < 12 and 0 <= dot <= 1:
-                    self.polygon_move_origin = {
-                        "start_x": event.x,
-                        "start_y": event.y,
-                        "points": [dict(p) for p in pts],
-                    }
-                    return
+            if self.polygon_index.hit_edge(pts, event.x, event.y, 12) is not None:
+                self.polygon_move_origin = {
+                    "start_x": event.x,
+                    "start_y": event.y,
+                    "applied_x": 0,
+                    "applied_y": 0,
+                }
+                return
         else:
             # Normal ruler mode interaction
-            d1 = math.hypot(event.x - self.p1["x"], event.y - self.p1["y"])
-            d2 = math.hypot(event.x - self.p2["x"], event.y - self.p2["y"])
-            
-            if d1 < 25:
-                self.dragging = "p1"
-            elif d2 < 25:
-                self.dragging = "p2"
+            handle = hit_handle(event.x, event.y, [(self.p1["x"], self.p1["y"]), (self.p2["x"], self.p2["y"])], 25)
+            if handle is not None:
+                self.dragging = ("p1", "p2")[handle]
             else:
                 self.dragging = "line"
                 self.drag_start_x = event.x
@@ -2854,6 +3540,7 @@ TIPS
                 self.orig_p1 = dict(self.p1)
                 self.orig_p2 = dict(self.p2)
 
+    @timed("on_drag")
     def on_drag(self, event):
         """Handle mouse drag"""
         if self.is_passthrough:
@@ -2862,6 +3549,19 @@ TIPS
         if not self.dragging and self.polygon_dragging_index is None and self.polygon_move_origin is None:
             return
         
+        # The loupe polls the handle on its own timer; this only starts it
+        if self.config["show_loupe"] and self.get_loupe() is not None:
+            self.loupe.show()
+
+        # Only the latest motion event per frame is applied
+        self.scheduler.post_motion(self._apply_drag, event)
+
+    @timed("drag_apply")
+    def _apply_drag(self, event):
+        """Move the dragged handle/shape to the event position."""
+        if self.config["snap_to_edges"] and (self.dragging in ("p1", "p2", "angle_arm1", "angle_arm2")
+                                             or self.polygon_dragging_index is not None):
+            event.x, event.y = self.snap_point(event.x, event.y)
         if self.config["mode"] == "angle":
             # Angle mode dragging
             if self.dragging == "angle_center":
@@ -2885,20 +3585,25 @@ TIPS
         elif self.config["mode"] == "polygon":
             # Dragging a single vertex
             if self.polygon_dragging_index is not None:
-                self.polygon_points[self.polygon_dragging_index]["x"] = event.x
-                self.polygon_points[self.polygon_dragging_index]["y"] = event.y
-                self.draw()
+                old_x, old_y = self.polygon_points.get(self.polygon_dragging_index)
+                self.polygon_points.set(self.polygon_dragging_index, event.x, event.y)
+                self.polygon_index.move_vertex(self.polygon_points, self.polygon_dragging_index)
+                self.polygon_metrics.move_vertex(self.polygon_points, self.polygon_dragging_index, old_x, old_y)
                 return
 
             # Moving whole polygon
             if self.polygon_move_origin:
-                dx = event.x - self.polygon_move_origin["start_x"]
-                dy = event.y - self.polygon_move_origin["start_y"]
-                new_points = []
-                for p in self.polygon_move_origin["points"]:
-                    new_points.append({"x": p["x"] + dx, "y": p["y"] + dy})
-                self.polygon_points = new_points
-                self.draw()
+                origin = self.polygon_move_origin
+                dx = event.x - origin["start_x"]
+                dy = event.y - origin["start_y"]
+                # Translate in place by the offset not yet applied
+                step_x, step_y = dx - origin["applied_x"], dy - origin["applied_y"]
+                self.polygon_points.translate(step_x, step_y)
+                origin["applied_x"], origin["applied_y"] = dx, dy
+                # The index only shifts its offset; perimeter/area are unchanged by a translation
+                self.polygon_index.translate(self.polygon_points, step_x, step_y)
+                if not self.monitors.uniform_dpi:
+                    self.polygon_metrics.invalidate_lengths()  # edges may now cross other monitors
                 return
 
         else:
@@ -2921,15 +3626,20 @@ TIPS
                 self.p1["y"] = self.orig_p1["y"] + dy
                 self.p2["x"] = self.orig_p2["x"] + dx
                 self.p2["y"] = self.orig_p2["y"] + dy
-        
-        self.draw()
 
     def on_release(self, event):
         """Handle mouse release"""
+        # Apply the last pending motion before the drag state is cleared
+        self.scheduler.flush()
         self.dragging = None
         self.polygon_dragging_index = None
         self.polygon_move_origin = None
+        if self.loupe is not None:
+            self.loupe.hide()
+        if self.viewport.compact:
+            self.request_redraw()  # shrink the window back to the tool
 
+    @timed("on_mouse_move")
     def on_mouse_move(self, event):
         """Handle mouse movement for cursor changes"""
         if self.is_passthrough:
@@ -2942,13 +3652,11 @@ TIPS
                 ax1, ay1 = self.angle_arm1["x"], self.angle_arm1["y"]
                 ax2, ay2 = self.angle_arm2["x"], self.angle_arm2["y"]
                 
-                d_center = math.hypot(event.x - cx, event.y - cy)
-                d_arm1 = math.hypot(event.x - ax1, event.y - ay1)
-                d_arm2 = math.hypot(event.x - ax2, event.y - ay2)
+                handle = hit_handle(event.x, event.y, [(cx, cy), (ax1, ay1), (ax2, ay2)], 25)
                 
-                if d_center < 25:
+                if handle == 0:
                     self.canvas.config(cursor="fleur")
-                elif d_arm1 < 25 or d_arm2 < 25:
+                elif handle is not None:
                     self.canvas.config(cursor="crosshair")
                 else:
                     self.canvas.config(cursor="")
@@ -2958,55 +3666,31 @@ TIPS
                     self.init_polygon_default()
 
                 # Over vertex
-                for p in self.polygon_points:
-                    if math.hypot(event.x - p["x"], event.y - p["y"]) < 18:
-                        self.canvas.config(cursor="crosshair")
-                        return
+                pts = self.polygon_points
+                if self.polygon_index.hit_vertex(pts, event.x, event.y, 18) is not None:
+                    self.canvas.config(cursor="crosshair")
+                    return
 
                 # Over edge
-                pts = self.polygon_points
-                n = len(pts)
-                for i in range(n):
-                    x1, y1 = pts[i]["x"], pts[i]["y"]
-                    x2, y2 = pts[(i + 1) % n]["x"], pts[(i + 1) % n]["y"]
-                    seg_len = math.hypot(x2 - x1, y2 - y1)
-                    if seg_len == 0:
-                        continue
-                    dist_to_line = abs((y2 - y1) * event.x - (x2 - x1) * event.y + x2 * y1 - y2 * x1) / seg_len
-                    dot = ((event.x - x1) * (x2 - x1) + (event.y - y1) * (y2 - y1)) / (seg_len * seg_len)
-                    if dist_to_line < 12 and 0 <= dot <= 1:
-                        self.canvas.config(cursor="fleur")
-                        return
+                if self.polygon_index.hit_edge(pts, event.x, event.y, 12) is not None:
+                    self.canvas.config(cursor="fleur")
+                    return
 
                 self.canvas.config(cursor="")
 
             else:
                 # Normal ruler mode cursor changes
                 # Check distance to endpoints
-                d1 = math.hypot(event.x - self.p1["x"], event.y - self.p1["y"])
-                d2 = math.hypot(event.x - self.p2["x"], event.y - self.p2["y"])
+                x1, y1 = self.p1["x"], self.p1["y"]
+                x2, y2 = self.p2["x"], self.p2["y"]
                 
                 # Change cursor based on position
-                if d1 < 25 or d2 < 25:
+                if hit_handle(event.x, event.y, [(x1, y1), (x2, y2)], 25) is not None:
                     self.canvas.config(cursor="crosshair")
+                elif near_segment(event.x, event.y, x1, y1, x2, y2, 10):
+                    self.canvas.config(cursor="fleur")
                 else:
-                    # Check if near the line
-                    x1, y1 = self.p1["x"], self.p1["y"]
-                    x2, y2 = self.p2["x"], self.p2["y"]
-                    
-                    # Calculate distance from point to line
-                    line_len = math.hypot(x2 - x1, y2 - y1)
-                    if line_len > 0:
-                        dist_to_line = abs((y2-y1)*event.x - (x2-x1)*event.y + x2*y1 - y2*x1) / line_len
-                        # Check if point is within line segment bounds
-                        dot = ((event.x - x1) * (x2 - x1) + (event.y - y1) * (y2 - y1)) / (line_len * line_len)
-                        
-                        if dist_to_line < 10 and 0 <= dot <= 1:
-                            self.canvas.config(cursor="fleur")
-                        else:
-                            self.canvas.config(cursor="")
-                    else:
-                        self.canvas.config(cursor="")
+                    self.canvas.config(cursor="")
         except tk.TclError:
             # Canvas may have been destroyed
             pass
@@ -3038,6 +3722,7 @@ TIPS
         
         menu.add_separator()
         menu.add_command(label="⚙️ Settings (S)", command=self.toggle_settings)
+        menu.add_command(label="🕘 History", command=self.show_history)
         menu.add_command(label="❓ Help (H)", command=self.toggle_help)
         menu.add_command(label="ℹ️ About (A)", command=self.show_about)
         menu.add_separator()
@@ -3052,7 +3737,7 @@ TIPS
             cx = self.virtual_x + (self.virtual_w / 2)
             cy = self.virtual_y + (self.virtual_h / 2)
             self.p1, self.p2 = {"x": cx-300, "y": cy}, {"x": cx+300, "y": cy}
-            self.draw()
+            self.request_redraw()
         except Exception as e:
             print(f"Warning: Could not reset ruler: {e}")
 
@@ -3060,7 +3745,7 @@ TIPS
         """Toggle fraction mode"""
         self.config["show_fractions"] = not self.config["show_fractions"]
         self.save_config()
-        self.draw()
+        self.request_redraw()
         status = "ON" if self.config["show_fractions"] else "OFF"
         self.show_notification(f"Fractions: {status}")
 
@@ -3069,15 +3754,7 @@ TIPS
         if self.config["fraction_count"] < 50:
             self.config["fraction_count"] += 1
             self.save_config()
-            # Update toolbar spinbox if in fractions mode
-            if self.config["mode"] == "fractions" and hasattr(self, 'number_input'):
-                try:
-                    if self.number_input.winfo_exists():
-                        self.number_input.delete(0, 'end')
-                        self.number_input.insert(0, str(self.config["fraction_count"]))
-                except Exception:
-                    pass
-            self.draw()
+            self.request_redraw()
             self.show_notification(f"Fractions: {self.config['fraction_count']}")
 
     def decrease_fractions(self, event=None):
@@ -3085,15 +3762,7 @@ TIPS
         if self.config["fraction_count"] > 2:
             self.config["fraction_count"] -= 1
             self.save_config()
-            # Update toolbar spinbox if in fractions mode
-            if self.config["mode"] == "fractions" and hasattr(self, 'number_input'):
-                try:
-                    if self.number_input.winfo_exists():
-                        self.number_input.delete(0, 'end')
-                        self.number_input.insert(0, str(self.config["fraction_count"]))
-                except Exception:
-                    pass
-            self.draw()
+            self.request_redraw()
             self.show_notification(f"Fractions: {self.config['fraction_count']}")
 
     def increase_thickness(self, event=None):
@@ -3101,7 +3770,7 @@ TIPS
         if self.config["ruler_thickness"] < 20:
             self.config["ruler_thickness"] += 1
             self.save_config()
-            self.draw()
+            self.request_redraw()
             self.show_notification(f"Thickness: {self.config['ruler_thickness']}px")
 
     def decrease_thickness(self, event=None):
@@ -3109,14 +3778,14 @@ TIPS
         if self.config["ruler_thickness"] > 1:
             self.config["ruler_thickness"] -= 1
             self.save_config()
-            self.draw()
+            self.request_redraw()
             self.show_notification(f"Thickness: {self.config['ruler_thickness']}px")
 
     def toggle_labels(self, event=None):
         """Toggle ruler labels/values visibility"""
         self.config["show_labels"] = not self.config["show_labels"]
         self.save_config()
-        self.draw()
+        self.request_redraw()
         status = "ON" if self.config["show_labels"] else "OFF"
         self.show_notification(f"Ruler Values: {status}")
     
@@ -3143,7 +3812,7 @@ TIPS
                 self.init_polygon_default()
         
         self.save_config()
-        self.draw()
+        self.request_redraw()
         mode_name = {"ruler": "Ruler", "fractions": "Fractions", "angle": "Angle", "polygon": "Polygon"}[self.config["mode"]]
         self.show_notification(f"Mode: {mode_name}")
     
@@ -3173,14 +3842,25 @@ TIPS
                 self.init_polygon_default()
         
         self.save_config()
-        self.draw()
+        self.request_redraw()
         mode_name = {"ruler": "Ruler", "fractions": "Fractions", "angle": "Angle", "polygon": "Polygon"}[self.config["mode"]]
         self.show_notification(f"Mode: {mode_name}")
 
     def close_app(self, event=None):
         """Close application"""
         try:
+            self.scheduler.cancel()
             self.save_config()
+            self.config_writer.close()  # writes synchronously before exit
+            self.measurement_history.flush()
+            if self.history_export is not None:
+                self.history_export.cancel()
+            if self._inspector_poll_id is not None:
+                self.root.after_cancel(self._inspector_poll_id)
+            if self.loupe is not None:
+                self.loupe.hide()
+            if self.capture is not None:
+                self.capture.close()
             
             # Close toolbar
             if self.toolbar and self.toolbar.winfo_exists():
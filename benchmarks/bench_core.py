@@ -0,0 +1,180 @@
+"""Micro-benchmarks for the GUI-free measurement core.
+
+Runs anywhere Python runs (no display, no Windows APIs) so regressions in the
+hot paths can be tracked on a CI box:
+
+    python benchmarks/bench_core.py            # full run
+    python benchmarks/bench_core.py --quick    # fewer repeats, smaller shapes
+
+Each line reports the best per-call time over several ``timeit`` repeats.
+Before timing, the incremental polygon metrics are cross-checked against the
+brute-force formulas; a mismatch exits with status 1.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screenruler.core import (  # noqa: E402
+    PolygonIndex,
+    PolygonMetrics,
+    TickEngine,
+    UNITS,
+    area_formatter,
+    distance_formatter,
+    get_converter,
+    hit_handle,
+    near_segment,
+)
+from screenruler.core.optional import numpy  # noqa: E402
+from tests.reference import brute_area, brute_perimeter, regular_polygon  # noqa: E402
+
+SCREEN = (0.0, 0.0, 3840.0, 2160.0)
+POLYGON_SIZES = (10, 1_000, 100_000)
+
+
+def report(name, seconds, unit="call"):
+    if seconds >= 1e-3:
+        text = f"{seconds * 1e3:9.3f} ms"
+    else:
+        text = f"{seconds * 1e6:9.2f} us"
+    print(f"  {name:<44} {text} / {unit}")
+
+
+def best(stmt, number, repeat):
+    """Best per-call time of ``stmt`` (a callable)."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def check_metrics(moves):
+    """Cross-check incremental perimeter/area against brute force."""
+    rng = random.Random(1234)
+    failures = 0
+    for n in (2, 3, 10, 200):
+        points = regular_polygon(n)
+        metrics = PolygonMetrics(resync_every=10_000)
+        metrics.perimeter(points)
+        for _ in range(moves):
+            i = rng.randrange(n)
+            old_x, old_y = points.get(i)
+            points.set(i, rng.uniform(0, 3840), rng.uniform(0, 2160))
+            metrics.move_vertex(points, i, old_x, old_y)
+        perimeter, area = brute_perimeter(points), brute_area(points)
+        if not (math.isclose(metrics.perimeter(points), perimeter, rel_tol=1e-9, abs_tol=1e-6)
+                and math.isclose(metrics.area(points), area, rel_tol=1e-9, abs_tol=1e-3)):
+            failures += 1
+            print(f"  MISMATCH n={n}: perimeter {metrics.perimeter(points)} vs {perimeter}, "
+                  f"area {metrics.area(points)} vs {area}")
+    print(f"  incremental metrics vs brute force: {'ok' if not failures else f'{failures} failed'}")
+    return failures == 0
+
+
+def bench_ticks(repeat):
+    print("Ticks")
+    engine = TickEngine()
+    for unit, length in (("mm", 800.0), ("in", 800.0), ("px", 3000.0), ("um", 3000.0)):
+        plan = engine.plan(unit, 96.0, 1.0, 10)
+        geometry = engine.segment(plan, 100.0, 500.0, 100.0 + length, 500.0, length, clip=SCREEN)
+        seconds = best(lambda: engine.segment(plan, 100.0, 500.0, 100.0 + length, 500.0, length,
+                                              clip=SCREEN), 200, repeat)
+        report(f"segment {unit} {length:.0f}px ({len(geometry)} ticks)", seconds)
+    plan = engine.plan("mm", 96.0, 1.0, 10)
+    report("segment mm 1e6px, clipped to screen",
+           best(lambda: engine.segment(plan, -5e5, 900.0, 5e5, 900.0, 1e6, clip=SCREEN), 200, repeat))
+    report("plan lookup (cached)", best(lambda: engine.plan("mm", 96.0, 1.0, 10), 20_000, repeat))
+    report("fractions x16", best(lambda: engine.fractions(100.0, 500.0, 900.0, 500.0, 800.0, 16), 2_000, repeat))
+
+
+def bench_hit_tests(sizes, repeat):
+    print("Hit-testing")
+    handles = [(100.0, 100.0), (900.0, 100.0), (500.0, 600.0)]
+    report("ruler/angle handles", best(lambda: hit_handle(480.0, 590.0, handles, 25), 50_000, repeat))
+    report("ruler line", best(lambda: near_segment(500.0, 104.0, 100.0, 100.0, 900.0, 100.0, 10), 50_000, repeat))
+    rng = random.Random(42)
+    for n in sizes:
+        points = regular_polygon(n)
+        index = PolygonIndex()
+        start = timeit.default_timer()
+        index.rebuild(points)
+        report(f"polygon index rebuild n={n}", timeit.default_timer() - start, "build")
+        probes = [(rng.uniform(0, 3840), rng.uniform(0, 2160)) for _ in range(256)]
+        it = iter(probes * 1000)
+
+        def query():
+            x, y = next(it)
+            index.hit_vertex(points, x, y, 18)
+            index.hit_edge(points, x, y, 12)
+
+        report(f"polygon vertex+edge query n={n}", best(query, 500, repeat))
+
+        def drag_shape():
+            points.translate(0.5, 0.25)
+            index.translate(points, 0.5, 0.25)
+            query()
+
+        report(f"polygon translate+query n={n}", best(drag_shape, 200, repeat))
+
+
+def bench_polygon_metrics(sizes, repeat):
+    print("Polygon metrics")
+    for n in sizes:
+        points = regular_polygon(n)
+        number = max(1, 20_000 // n)
+        report(f"full perimeter+area n={n}", best(lambda: (points.perimeter(), points.area()), number, repeat))
+        metrics = PolygonMetrics()
+        metrics.perimeter(points)
+        i = n // 2
+        x, y = points.get(i)
+
+        def drag():
+            old_x, old_y = points.get(i)
+            points.set(i, x + 1.0 if old_x == x else x, y)
+            metrics.move_vertex(points, i, old_x, old_y)
+            metrics.perimeter(points)
+            metrics.area(points)
+
+        report(f"vertex drag update n={n}", best(drag, 2_000, repeat))
+        report(f"translate n={n}", best(lambda: points.translate(0.5, -0.5), number, repeat))
+
+
+def bench_formatters(repeat):
+    print("Formatters")
+    values = [i * 3.7 for i in range(1000)]
+    for unit in UNITS:
+        converter = get_converter(96.0, 1.0)
+        fmt = distance_formatter(unit)
+        seconds = best(lambda: [fmt(converter.to_unit(v, unit)) for v in values], 20, repeat)
+        report(f"distance {unit}", seconds / len(values), "value")
+    fmt = area_formatter("mm")
+    converter = get_converter(96.0, 1.0)
+    seconds = best(lambda: [fmt(converter.area_to_unit(v * v, "mm")) for v in values], 20, repeat)
+    report("area mm^2", seconds / len(values), "value")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and no 100k-vertex polygon")
+    args = parser.parse_args(argv)
+
+    repeat = 3 if args.quick else 5
+    sizes = POLYGON_SIZES[:2] if args.quick else POLYGON_SIZES
+    # The app loads NumPy with its first capture; time the vectorized paths when it is there
+    print("NumPy:", "yes" if numpy() is not None else "not installed")
+
+    print("Checks")
+    if not check_metrics(500 if args.quick else 5_000):
+        return 1
+    bench_ticks(repeat)
+    bench_hit_tests(sizes, repeat)
+    bench_polygon_metrics(sizes, repeat)
+    bench_formatters(repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Support modules for ScreenRuler Pro."""
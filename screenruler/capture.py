@@ -0,0 +1,426 @@
+"""Screen capture service: cached regions, worker thread, zero-copy pixel views."""
+
+import ctypes
+import threading
+import time
+from collections import OrderedDict
+
+from screenruler.core.optional import numpy
+
+
+class CaptureFrame:
+    """RGB pixels of one captured region, in virtual-screen coordinates.
+
+    ``data`` is the raw RGB byte string (3 bytes per pixel, row-major).
+    ``view()`` and ``array()`` wrap it without copying; ``luma()`` is the
+    8-bit grey level, computed once per frame and shared by every consumer
+    (``CaptureService`` computes it on its worker before publishing a frame).
+    """
+
+    __slots__ = ("left", "top", "width", "height", "data", "captured_at", "_luma", "_cache")
+
+    def __init__(self, left, top, width, height, data, captured_at=None):
+        if len(data) != width * height * 3:
+            raise ValueError(f"Expected {width * height * 3} bytes of RGB, got {len(data)}")
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.data = data
+        self.captured_at = time.monotonic() if captured_at is None else captured_at
+        self._luma = None
+        self._cache = {}  # per-frame derived data (edge maps, detections, ...)
+
+    @property
+    def rect(self):
+        return (self.left, self.top, self.left + self.width, self.top + self.height)
+
+    def contains(self, rect):
+        left, top, right, bottom = rect
+        return (left >= self.left and top >= self.top
+                and right <= self.left + self.width and bottom <= self.top + self.height)
+
+    def view(self):
+        """memoryview of shape (height, width, 3) over the pixel bytes."""
+        return memoryview(self.data).cast("B", (self.height, self.width, 3))
+
+    def array(self):
+        """Read-only NumPy uint8 array (height, width, 3) sharing the bytes."""
+        np = numpy()
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.height, self.width, 3)
+
+    def luma(self):
+        """Grey levels (height, width): a NumPy array, or a 2-D memoryview without NumPy."""
+        if self._luma is None:
+            np = numpy()
+            if np is not None:
+                rgb = self.array().astype(np.uint16)
+                self._luma = ((rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8).astype(np.uint8)
+            else:
+                data = self.data
+                grey = bytearray(self.width * self.height)
+                for i in range(len(grey)):
+                    j = 3 * i
+                    grey[i] = (data[j] * 77 + data[j + 1] * 150 + data[j + 2] * 29) >> 8
+                self._luma = memoryview(bytes(grey)).cast("B", (self.height, self.width))
+        return self._luma
+
+    def pixel(self, x, y):
+        """RGB tuple at virtual-screen (x, y)."""
+        j = 3 * ((y - self.top) * self.width + (x - self.left))
+        return tuple(self.data[j:j + 3])
+
+    def derived(self, key, build):
+        """Value of ``build(self)`` cached on this frame under ``key``."""
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = build(self)
+        return value
+
+
+# --- Sources ---
+class ScreenSource:
+    """Live screen pixels: a GDI BitBlt of just the requested rectangle.
+
+    PIL.ImageGrab is only a fallback, used where GDI is not available or a
+    blit fails: it captures the whole virtual desktop and crops it.
+    """
+
+    def __init__(self):
+        try:
+            self._gdi = _GdiCapture()
+        except Exception:
+            self._gdi = None
+        self._image_grab = None
+        if self._gdi is None:
+            from PIL import ImageGrab
+            self._image_grab = ImageGrab.grab
+
+    def grab(self, rect):
+        left, top, right, bottom = rect
+        if self._gdi is not None:
+            try:
+                return CaptureFrame(left, top, right - left, bottom - top,
+                                    self._gdi.grab(left, top, right - left, bottom - top))
+            except OSError as e:
+                if self._image_grab is None:
+                    try:
+                        from PIL import ImageGrab
+                    except ImportError:
+                        raise e from None
+                    print(f"Warning: GDI screen capture failed ({e}); falling back to PIL.ImageGrab")
+                    self._image_grab = ImageGrab.grab
+        image = self._image_grab(bbox=rect, all_screens=True).convert("RGB")
+        return CaptureFrame(left, top, image.width, image.height, image.tobytes())
+
+
+class _BitmapInfo(ctypes.Structure):
+    """BITMAPINFO: a BITMAPINFOHEADER plus room for the colour masks."""
+
+    _fields_ = [("size", ctypes.c_uint32), ("width", ctypes.c_int32), ("height", ctypes.c_int32),
+                ("planes", ctypes.c_uint16), ("bit_count", ctypes.c_uint16),
+                ("compression", ctypes.c_uint32), ("size_image", ctypes.c_uint32),
+                ("x_ppm", ctypes.c_int32), ("y_ppm", ctypes.c_int32),
+                ("colors_used", ctypes.c_uint32), ("colors_important", ctypes.c_uint32),
+                ("masks", ctypes.c_uint32 * 3)]
+
+
+class _GdiCapture:
+    """BitBlt from the screen DC into a 32-bit top-down DIB (Windows only).
+
+    Uses private WinDLL instances so the prototypes set here do not leak
+    into other ctypes users of user32/gdi32.
+    """
+
+    SRCCOPY = 0x00CC0020
+    CAPTUREBLT = 0x40000000  # include layered windows, like ImageGrab
+
+    def __init__(self):
+        from ctypes import wintypes
+        self.user32 = user32 = ctypes.WinDLL("user32")
+        self.gdi32 = gdi32 = ctypes.WinDLL("gdi32")
+        HDC, HGDIOBJ, HWND = wintypes.HDC, wintypes.HGDIOBJ, wintypes.HWND
+        user32.GetDC.argtypes, user32.GetDC.restype = [HWND], HDC
+        user32.ReleaseDC.argtypes, user32.ReleaseDC.restype = [HWND, HDC], ctypes.c_int
+        gdi32.CreateCompatibleDC.argtypes, gdi32.CreateCompatibleDC.restype = [HDC], HDC
+        gdi32.CreateCompatibleBitmap.argtypes = [HDC, ctypes.c_int, ctypes.c_int]
+        gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+        gdi32.SelectObject.argtypes, gdi32.SelectObject.restype = [HDC, HGDIOBJ], HGDIOBJ
+        gdi32.BitBlt.argtypes = [HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                 HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        gdi32.BitBlt.restype = wintypes.BOOL
+        gdi32.GetDIBits.argtypes = [HDC, wintypes.HBITMAP, wintypes.UINT, wintypes.UINT,
+                                    ctypes.c_void_p, ctypes.c_void_p, wintypes.UINT]
+        gdi32.GetDIBits.restype = ctypes.c_int
+        gdi32.DeleteObject.argtypes, gdi32.DeleteObject.restype = [HGDIOBJ], wintypes.BOOL
+        gdi32.DeleteDC.argtypes, gdi32.DeleteDC.restype = [HDC], wintypes.BOOL
+
+    def grab(self, left, top, width, height):
+        """RGB bytes of the screen rectangle; raises OSError when GDI fails."""
+        user32, gdi32 = self.user32, self.gdi32
+        screen = user32.GetDC(None)
+        if not screen:
+            raise OSError("GetDC failed")
+        memory = gdi32.CreateCompatibleDC(screen)
+        bitmap = gdi32.CreateCompatibleBitmap(screen, width, height) if memory else None
+        try:
+            if not bitmap:
+                raise OSError("Could not create a capture bitmap")
+            previous = gdi32.SelectObject(memory, bitmap)
+            copied = gdi32.BitBlt(memory, 0, 0, width, height, screen, left, top,
+                                  self.SRCCOPY | self.CAPTUREBLT)
+            gdi32.SelectObject(memory, previous)
+            if not copied:
+                raise OSError("BitBlt failed")
+            # 32 bpp BI_RGB; a negative height asks for top-down rows
+            info = _BitmapInfo(ctypes.sizeof(_BitmapInfo) - 12, width, -height, 1, 32)
+            pixels = ctypes.create_string_buffer(width * height * 4)
+            if gdi32.GetDIBits(memory, bitmap, 0, height, pixels, ctypes.byref(info), 0) != height:
+                raise OSError("GetDIBits failed")
+        finally:
+            if bitmap:
+                gdi32.DeleteObject(bitmap)
+            if memory:
+                gdi32.DeleteDC(memory)
+            user32.ReleaseDC(None, screen)
+        return _bgra_to_rgb(pixels.raw)
+
+
+def _bgra_to_rgb(bgra):
+    """Drop the padding byte of 32-bit BGRA pixels and swap to RGB."""
+    rgb = bytearray(len(bgra) // 4 * 3)
+    rgb[0::3] = bgra[2::4]
+    rgb[1::3] = bgra[1::4]
+    rgb[2::3] = bgra[0::4]
+    return bytes(rgb)
+
+
+class ImageSource:
+    """Pixels from a static image file, placed at ``origin`` on the virtual screen.
+
+    Used for headless runs and tests. Binary PPM (P6) files are read
+    directly; other formats need Pillow.
+    """
+
+    def __init__(self, path, origin=(0, 0)):
+        self.path = path
+        self.origin = origin
+        self.width, self.height, self.data = self._load(path)
+
+    def grab(self, rect):
+        """Pixels of ``rect``; parts outside the image are black (like off-screen areas)."""
+        left, top, right, bottom = rect
+        ox, oy = self.origin
+        width = right - left
+        x0 = min(max(left, ox), ox + self.width)
+        x1 = max(min(right, ox + self.width), x0)
+        before = b"\0" * ((x0 - left) * 3)
+        after = b"\0" * ((right - x1) * 3)
+        blank = b"\0" * (width * 3)
+        stride = self.width * 3
+        rows = []
+        for y in range(top, bottom):
+            if oy <= y < oy + self.height and x1 > x0:
+                start = (y - oy) * stride
+                rows.append(before + self.data[start + (x0 - ox) * 3:start + (x1 - ox) * 3] + after)
+            else:
+                rows.append(blank)
+        return CaptureFrame(left, top, width, bottom - top, b"".join(rows))
+
+    @staticmethod
+    def _load(path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        if raw[:2] == b"P6":
+            # Header: magic, width, height, maxval, then one whitespace byte
+            fields, pos = [], 2
+            while len(fields) < 3:
+                while raw[pos:pos + 1].isspace():
+                    pos += 1
+                if raw[pos:pos + 1] == b"#":
+                    pos = raw.index(b"\n", pos) + 1
+                    continue
+                end = pos
+                while not raw[end:end + 1].isspace():
+                    end += 1
+                fields.append(int(raw[pos:end]))
+                pos = end
+            width, height, maxval = fields
+            if maxval != 255:
+                raise ValueError("Only 8-bit PPM files are supported")
+            return width, height, raw[pos + 1:pos + 1 + width * height * 3]
+        from PIL import Image
+        with Image.open(path) as image:
+            image = image.convert("RGB")
+            return image.width, image.height, image.tobytes()
+
+
+def exclude_from_capture(hwnd):
+    """Keep a window out of screen captures (Windows 10 2004+); False if unsupported."""
+    try:
+        user32 = ctypes.windll.user32
+        GA_ROOT = 2
+        WDA_EXCLUDEFROMCAPTURE = 0x11
+        top = user32.GetAncestor(hwnd, GA_ROOT) or hwnd
+        return bool(user32.SetWindowDisplayAffinity(top, WDA_EXCLUDEFROMCAPTURE))
+    except Exception:
+        return False
+
+
+# --- Service ---
+class CaptureService:
+    """Capture screen regions on a worker thread and cache them briefly.
+
+    ``get(rect)`` returns a cached frame covering ``rect`` if one is younger
+    than ``ttl`` seconds; otherwise it queues a capture of ``rect`` padded
+    and snapped to ``tile`` pixels (so nearby requests share a frame) and
+    returns None, or waits up to ``timeout`` when asked to. Only the newest
+    queued request is captured. At most ``max_frames`` frames are kept,
+    least recently used first out. ``generation`` increases with every
+    finished capture so a Tk timer can notice new frames without callbacks
+    from the worker thread. Grey levels are computed on the worker too, so
+    no frame reaches the Tk thread without them. Heavier per-frame analysis
+    goes through ``derive``, which builds it on a second worker thread.
+    """
+
+    def __init__(self, source, ttl=0.25, tile=64, pad=64, max_frames=8):
+        self.source = source
+        self.ttl = ttl
+        self.tile = max(1, int(tile))
+        self.pad = pad
+        self.max_frames = max(1, int(max_frames))
+        self.generation = 0
+        self.captures = 0
+        self.hits = 0
+        self.errors = 0
+        self._frames = OrderedDict()  # snapped rect -> CaptureFrame
+        self._pending = None
+        self._derive = None    # (frame, key, build) queued for the analysis thread
+        self._deriving = None  # (frame, key) being built
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="screen-capture", daemon=True)
+        self._thread.start()
+        self._analysis = threading.Thread(target=self._run_derive, name="capture-analysis", daemon=True)
+        self._analysis.start()
+
+    def get(self, rect, max_age=None, timeout=0.0):
+        """Fresh frame containing ``rect`` (left, top, right, bottom), or None."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._cond:
+            frame = self._lookup(rect, max_age)
+            if frame is not None:
+                self.hits += 1
+                return frame
+            self._pending = self._snap(rect)
+            self._cond.notify_all()
+            if timeout <= 0:
+                return None
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    return None
+                self._cond.wait(remaining)
+                frame = self._lookup(rect, max_age)
+                if frame is not None:
+                    return frame
+
+    def derive(self, frame, key, build):
+        """``build(frame)`` cached on ``frame`` under ``key``, built off the calling thread.
+
+        Returns the value once it is ready, None until then. The build is
+        queued for the analysis thread; a newer request replaces a queued one
+        that has not started.
+        """
+        value = frame._cache.get(key)
+        if value is not None:
+            return value
+        with self._cond:
+            if self._closed:
+                return None
+            queued = self._derive
+            if ((queued is not None and queued[0] is frame and queued[1] == key)
+                    or (self._deriving is not None and self._deriving[0] is frame and self._deriving[1] == key)):
+                return None
+            self._derive = (frame, key, build)
+            self._cond.notify_all()
+        return None
+
+    def latest(self, rect):
+        """Newest cached frame containing ``rect``, however old (never captures)."""
+        with self._cond:
+            return self._lookup(rect, None)
+
+    def invalidate(self):
+        with self._cond:
+            self._frames.clear()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+        self._analysis.join(timeout=1.0)
+
+    def stats(self):
+        return {"captures": self.captures, "hits": self.hits, "errors": self.errors,
+                "frames": len(self._frames)}
+
+    def _lookup(self, rect, max_age):
+        now = time.monotonic()
+        for key, frame in reversed(self._frames.items()):
+            if frame.contains(rect) and (max_age is None or now - frame.captured_at <= max_age):
+                self._frames.move_to_end(key)
+                return frame
+        return None
+
+    def _snap(self, rect):
+        tile, pad = self.tile, self.pad
+        return (int(rect[0] - pad) // tile * tile, int(rect[1] - pad) // tile * tile,
+                -(-int(rect[2] + pad) // tile) * tile, -(-int(rect[3] + pad) // tile) * tile)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._pending is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                rect, self._pending = self._pending, None
+            try:
+                frame = self.source.grab(rect)
+                frame.luma()
+            except Exception as e:
+                self.errors += 1
+                print(f"Warning: Screen capture failed: {e}")
+                time.sleep(0.5)  # do not spin on a persistent failure
+                continue
+            with self._cond:
+                self._frames[rect] = frame
+                self._frames.move_to_end(rect)
+                while len(self._frames) > self.max_frames:
+                    self._frames.popitem(last=False)
+                self.captures += 1
+                self.generation += 1
+                self._cond.notify_all()
+
+    def _run_derive(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._derive is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                frame, key, build = self._derive
+                self._derive = None
+                self._deriving = (frame, key)
+            try:
+                frame.derived(key, build)
+            except Exception as e:
+                self.errors += 1
+                print(f"Warning: Could not analyse captured frame: {e}")
+            with self._cond:
+                self._deriving = None
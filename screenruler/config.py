@@ -0,0 +1,58 @@
+"""Observable configuration dictionary."""
+
+
+class ObservableConfig(dict):
+    """A ``dict`` that tells subscribers when a key's value changes.
+
+    Views subscribe to the keys they render (``subscribe(("unit",), cb)``)
+    and are called with ``(key, value)`` only when an assignment actually
+    changes that key, so widgets update themselves instead of being rebuilt.
+    It is still a plain dict for ``json.dump`` and existing ``config[...]``
+    reads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._subscribers = {}  # key -> [callback, ...]
+
+    def subscribe(self, keys, callback):
+        """Call ``callback(key, value)`` whenever one of ``keys`` changes.
+
+        Returns a function that removes the subscription.
+        """
+        if isinstance(keys, str):
+            keys = (keys,)
+        keys = tuple(keys)
+        for key in keys:
+            self._subscribers.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            for key in keys:
+                callbacks = self._subscribers.get(key, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def __setitem__(self, key, value):
+        missing = key not in self
+        old = self.get(key)
+        super().__setitem__(key, value)
+        if missing or old != value or type(old) is not type(value):
+            self._notify(key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def _notify(self, key, value):
+        for callback in list(self._subscribers.get(key, ())):
+            try:
+                callback(key, value)
+            except Exception as e:
+                print(f"Warning: Config listener for '{key}' failed: {e}")
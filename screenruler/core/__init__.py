@@ -0,0 +1,46 @@
+"""GUI-free measurement core for ScreenRuler Pro.
+
+Nothing in this package imports tkinter or Windows APIs, so it can be used
+(and benchmarked, see ``benchmarks/bench_core.py``) on a headless machine.
+The pixel-analysis modules (``edges``, ``regions``) are not imported here;
+they and NumPy load when a content-aware tool first needs them.
+"""
+
+from screenruler.core.geometry import angle_between, bearing, distance, hit_handle, near_segment
+from screenruler.core.metrics import PolygonMetrics
+from screenruler.core.points import PointBuffer, PointView
+from screenruler.core.spatial import PolygonIndex
+from screenruler.core.ticks import TickEngine, TickGeometry, TickPlan
+from screenruler.core.units import (
+    UNITS,
+    AreaFormatter,
+    DistanceFormatter,
+    UnitConverter,
+    area_formatter,
+    distance_formatter,
+    get_converter,
+    normalize_unit,
+)
+
+__all__ = [
+    "AreaFormatter",
+    "DistanceFormatter",
+    "PointBuffer",
+    "PointView",
+    "PolygonIndex",
+    "PolygonMetrics",
+    "TickEngine",
+    "TickGeometry",
+    "TickPlan",
+    "UNITS",
+    "UnitConverter",
+    "angle_between",
+    "area_formatter",
+    "bearing",
+    "distance",
+    "distance_formatter",
+    "get_converter",
+    "hit_handle",
+    "near_segment",
+    "normalize_unit",
+]
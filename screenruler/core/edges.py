@@ -0,0 +1,179 @@
+"""Edge detection on captured grey levels: gradient maps and edge snapping."""
+
+import math
+from array import array
+
+from .optional import numpy
+
+# Smallest gradient (grey levels per pixel) treated as an edge
+EDGE_THRESHOLD = 12.0
+
+
+class EdgeMap:
+    """Central-difference gradient of a grey image, built once per capture.
+
+    ``luma`` is a (height, width) NumPy array, or a 2-D memoryview when
+    NumPy is missing; border pixels get no gradient. Snapping queries only
+    look at a small window, so once the map exists each query is a lookup,
+    not an image pass. ``snap`` returns sub-pixel positions where pixel
+    ``i`` spans ``[i, i + 1)``, so an edge between two pixels lands on
+    their shared boundary.
+    """
+
+    __slots__ = ("width", "height", "gx", "gy", "mag")
+
+    def __init__(self, luma, width, height):
+        np = numpy()
+        self.width = width
+        self.height = height
+        if np is not None:
+            g = np.asarray(luma, dtype=np.float32)
+            gx = np.zeros_like(g)
+            gy = np.zeros_like(g)
+            gx[:, 1:-1] = (g[:, 2:] - g[:, :-2]) * 0.5
+            gy[1:-1, :] = (g[2:, :] - g[:-2, :]) * 0.5
+            self.gx, self.gy = gx, gy
+            self.mag = np.hypot(gx, gy)
+        else:
+            # Flat row-major arrays
+            gx = array("f", bytes(4 * width * height))
+            gy = array("f", bytes(4 * width * height))
+            mag = array("f", bytes(4 * width * height))
+            flat = luma.tobytes()
+            for y in range(1, height - 1):
+                base = y * width
+                for i in range(base + 1, base + width - 1):
+                    dx = (flat[i + 1] - flat[i - 1]) * 0.5
+                    dy = (flat[i + width] - flat[i - width]) * 0.5
+                    gx[i] = dx
+                    gy[i] = dy
+                    mag[i] = (dx * dx + dy * dy) ** 0.5
+            self.gx, self.gy, self.mag = gx, gy, mag
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Edge map of a CaptureFrame (use with ``frame.derived``)."""
+        return cls(frame.luma(), frame.width, frame.height)
+
+    def strength(self, x, y):
+        np = numpy()
+        if np is not None:
+            return float(self.mag[y, x])
+        return self.mag[y * self.width + x]
+
+    def _grad(self, x, y):
+        np = numpy()
+        if np is not None:
+            return float(self.gx[y, x]), float(self.gy[y, x])
+        i = y * self.width + x
+        return self.gx[i], self.gy[i]
+
+    def snap(self, x, y, radius, threshold=EDGE_THRESHOLD):
+        """Strongest edge within ``radius`` of (x, y), refined to sub-pixel, or None.
+
+        Strength is weighted down with distance so that, of two similar
+        edges, the nearer one wins. The point moves across the edge only;
+        its position along the edge is kept.
+        """
+        np = numpy()
+        cx, cy = int(x), int(y)
+        r = max(1, int(radius))
+        x0, x1 = max(1, cx - r), min(self.width - 2, cx + r)
+        y0, y1 = max(1, cy - r), min(self.height - 2, cy + r)
+        if x0 > x1 or y0 > y1:
+            return None
+
+        if np is not None:
+            window = self.mag[y0:y1 + 1, x0:x1 + 1]
+            ys, xs = np.mgrid[y0:y1 + 1, x0:x1 + 1]
+            dist = np.hypot(xs - x, ys - y)
+            score = np.where(dist <= r, window * (1.0 - 0.5 * dist / r), 0.0)
+            k = int(np.argmax(score))
+            bx, by = x0 + k % window.shape[1], y0 + k // window.shape[1]
+        else:
+            best, bx, by = 0.0, None, None
+            mag, width = self.mag, self.width
+            for py in range(y0, y1 + 1):
+                for px in range(x0, x1 + 1):
+                    d = ((px - x) ** 2 + (py - y) ** 2) ** 0.5
+                    if d > r:
+                        continue
+                    s = mag[py * width + px] * (1.0 - 0.5 * d / r)
+                    if s > best:
+                        best, bx, by = s, px, py
+            if bx is None:
+                return None
+        if self.strength(bx, by) < threshold:
+            return None
+
+        # Parabolic fit of the magnitude across the edge (along its dominant axis)
+        gx, gy = self._grad(bx, by)
+        if abs(gx) >= abs(gy):
+            offset = _peak_offset(self.strength(bx - 1, by), self.strength(bx, by), self.strength(bx + 1, by))
+            return bx + offset + 0.5, y
+        offset = _peak_offset(self.strength(bx, by - 1), self.strength(bx, by), self.strength(bx, by + 1))
+        return x, by + offset + 0.5
+
+
+def _peak_offset(left, centre, right):
+    """Offset (-0.5..0.5) of the vertex of the parabola through three samples."""
+    denom = left - 2.0 * centre + right
+    if denom >= 0:
+        return 0.0
+    return max(-0.5, min(0.5, 0.5 * (left - right) / denom))
+
+
+# Grey-level difference from the starting pixel that ends an auto-measure scan
+SCAN_THRESHOLD = 24
+
+
+def scan_edges(rgb, width, height, x, y, dx, dy, max_dist, threshold=SCAN_THRESHOLD):
+    """Distances from (x, y) to the first contrast edge backwards and forwards along (dx, dy).
+
+    ``rgb`` is a frame's row-major RGB bytes; (x, y) is in pixel units and
+    (dx, dy) a unit vector. Only the pixels on the scan line are read and
+    turned into grey levels (same weights as ``CaptureFrame.luma``).
+    Samples are taken one pixel apart starting at the centre of the pixel
+    under (x, y); a scan stops at the first pixel whose grey level differs
+    from the starting one by ``threshold`` or more, and the edge is placed
+    on the boundary before that pixel. Returns ``(back, forward)`` with None
+    for a side that found no edge within ``max_dist`` pixels or the
+    captured area.
+    """
+    np = numpy()
+    cx, cy = int(x) + 0.5, int(y) + 0.5
+    if not (0 <= cx < width and 0 <= cy < height):
+        return None, None
+    n = max(1, int(max_dist))
+    if np is not None:
+        pixels = np.frombuffer(rgb, dtype=np.uint8).reshape(height, width, 3)
+        t = np.arange(n + 1, dtype=np.float64)
+        results = []
+        for sign in (-1.0, 1.0):
+            xs = np.floor(cx + sign * dx * t).astype(np.intp)
+            ys = np.floor(cy + sign * dy * t).astype(np.intp)
+            inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+            count = int(np.argmin(inside)) if not inside.all() else n + 1
+            samples = pixels[ys[:count], xs[:count]].astype(np.int32)
+            grey = (samples[:, 0] * 77 + samples[:, 1] * 150 + samples[:, 2] * 29) >> 8
+            hits = np.flatnonzero(np.abs(grey - grey[0]) >= threshold)
+            results.append(float(hits[0]) - 0.5 if hits.size else None)
+        return tuple(results)
+
+    def grey(px, py):
+        j = 3 * (py * width + px)
+        return (rgb[j] * 77 + rgb[j + 1] * 150 + rgb[j + 2] * 29) >> 8
+
+    start = grey(int(cx), int(cy))
+    results = []
+    for sign in (-1.0, 1.0):
+        found = None
+        for t in range(1, n + 1):
+            px, py = math.floor(cx + sign * dx * t), math.floor(cy + sign * dy * t)
+            if not (0 <= px < width and 0 <= py < height):
+                break
+            if abs(grey(px, py) - start) >= threshold:
+                found = t - 0.5
+                break
+        results.append(found)
+    return tuple(results)
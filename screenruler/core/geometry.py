@@ -0,0 +1,43 @@
+"""Plain geometry helpers for rulers, angles and hit-testing."""
+
+import math
+
+
+def distance(x1, y1, x2, y2):
+    """Euclidean distance between two points."""
+    return math.hypot(x2 - x1, y2 - y1)
+
+
+def bearing(x1, y1, x2, y2):
+    """Direction from (x1, y1) to (x2, y2) in degrees, 0-360 (screen y down)."""
+    degrees = math.degrees(math.atan2(y2 - y1, x2 - x1))
+    return degrees if degrees >= 0 else degrees + 360
+
+
+def angle_between(cx, cy, ax1, ay1, ax2, ay2):
+    """Angle between two arms sharing the vertex (cx, cy), 0-180 degrees."""
+    diff = abs(bearing(cx, cy, ax2, ay2) - bearing(cx, cy, ax1, ay1))
+    if diff > 180:
+        diff = 360 - diff
+    return diff
+
+
+def hit_handle(x, y, handles, radius):
+    """Index of the first (hx, hy) handle strictly within ``radius``, or None.
+
+    Handles are tested in order, so earlier ones win when they overlap.
+    """
+    for i, (hx, hy) in enumerate(handles):
+        if math.hypot(x - hx, y - hy) < radius:
+            return i
+    return None
+
+
+def near_segment(x, y, x1, y1, x2, y2, tolerance):
+    """True when (x, y) is within ``tolerance`` of the segment, between its ends."""
+    length = math.hypot(x2 - x1, y2 - y1)
+    if length <= 0:
+        return False
+    dist_to_line = abs((y2 - y1) * x - (x2 - x1) * y + x2 * y1 - y2 * x1) / length
+    t = ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / (length * length)
+    return dist_to_line < tolerance and 0 <= t <= 1
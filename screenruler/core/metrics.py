@@ -0,0 +1,158 @@
+"""Incrementally maintained polygon perimeter and area."""
+
+import math
+
+
+class PolygonMetrics:
+    """Running perimeter and shoelace sum for a closed polygon.
+
+    Dragging one vertex only changes its two adjacent edges, so
+    ``move_vertex`` updates both totals in O(1). Translating the whole shape
+    changes neither value, so callers simply don't report it. Replacing the
+    points (a different object or a different length) or calling
+    ``invalidate`` triggers a full recomputation on the next query, and so
+    does every ``resync_every``-th incremental update to keep floating-point
+    drift bounded.
+
+    ``scaled_perimeter`` measures each edge with a caller-supplied function
+    instead (e.g. piecewise per monitor DPI) and keeps those lengths per
+    edge, so a vertex drag re-measures only its two edges. They are dropped
+    on ``invalidate``/``invalidate_lengths`` (needed after a translation or
+    when the measuring function's results change), on a different
+    function, or when the points are replaced.
+
+    Points are read as ``p["x"]`` / ``p["y"]``; ``PointBuffer`` inputs use
+    its flat-array metrics for the full pass.
+    """
+
+    def __init__(self, resync_every=256):
+        self.resync_every = max(1, int(resync_every))
+        self._points = None
+        self._count = 0
+        self._perimeter = 0.0
+        self._area2 = 0.0   # twice the signed area
+        self._updates = 0   # incremental updates since the last full pass
+        self._lengths = None          # per-edge lengths from ``_length_fn``
+        self._length_fn = None
+        self._length_points = None
+        self._scaled = 0.0
+        self._scaled_updates = 0
+        self.full_passes = 0
+        self.dirty = True
+
+    # --- Maintenance ---
+    def invalidate(self):
+        """Mark the totals stale; they are recomputed on the next query."""
+        self.dirty = True
+        self._lengths = None
+
+    def invalidate_lengths(self):
+        """Drop the per-edge lengths of ``scaled_perimeter`` (plain totals stay valid)."""
+        self._lengths = None
+
+    def rebuild(self, points):
+        """Recompute perimeter and area from scratch."""
+        self._points = points
+        self._count = n = len(points)
+        if hasattr(points, "perimeter") and hasattr(points, "signed_area2"):
+            self._perimeter = points.perimeter()
+            self._area2 = points.signed_area2()
+        else:
+            perim = 0.0
+            area2 = 0.0
+            if n >= 2:
+                for i in range(n):
+                    perim += self._edge_length(points, i)
+                    area2 += self._edge_cross(points, i)
+            self._perimeter = perim
+            self._area2 = area2
+        self._updates = 0
+        self.full_passes += 1
+        self.dirty = False
+
+    def move_vertex(self, points, index, old_x, old_y):
+        """Update the totals after ``points[index]`` moved from (old_x, old_y)."""
+        if self._lengths_valid(points):
+            self._move_lengths(points, index)
+        if self._stale(points):
+            self.rebuild(points)
+            return
+        n = self._count
+        if n < 2:
+            return
+        prev = points[(index - 1) % n]
+        nxt = points[(index + 1) % n]
+        p = points[index]
+        px, py = prev["x"], prev["y"]
+        nx, ny = nxt["x"], nxt["y"]
+        x, y = p["x"], p["y"]
+        self._perimeter += (math.hypot(x - px, y - py) + math.hypot(nx - x, ny - y)
+                            - math.hypot(old_x - px, old_y - py) - math.hypot(nx - old_x, ny - old_y))
+        # Shoelace terms touching this vertex: prev x cur and cur x next
+        self._area2 += ((px * y - x * py) + (x * ny - nx * y)
+                        - (px * old_y - old_x * py) - (old_x * ny - nx * old_y))
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.dirty = True
+
+    # --- Queries ---
+    def perimeter(self, points):
+        """Closed perimeter in pixels."""
+        if self._stale(points):
+            self.rebuild(points)
+        return self._perimeter if self._count >= 2 else 0.0
+
+    def area(self, points):
+        """Polygon area in pixel^2."""
+        if self._stale(points):
+            self.rebuild(points)
+        return abs(self._area2) / 2.0 if self._count >= 3 else 0.0
+
+    def scaled_perimeter(self, points, edge_length):
+        """Closed perimeter with every edge measured by ``edge_length(x1, y1, x2, y2)``."""
+        if not (self._lengths_valid(points) and edge_length == self._length_fn):
+            if hasattr(points, "coords"):
+                flat = points.coords()
+                xs, ys = flat[0::2], flat[1::2]
+            else:
+                xs, ys = [p["x"] for p in points], [p["y"] for p in points]
+            n = len(xs)
+            self._lengths = [edge_length(xs[i], ys[i], xs[(i + 1) % n], ys[(i + 1) % n])
+                             for i in range(n)] if n >= 2 else []
+            self._length_fn = edge_length
+            self._length_points = points
+            self._scaled = math.fsum(self._lengths)
+            self._scaled_updates = 0
+        return self._scaled
+
+    # --- Internals ---
+    def _stale(self, points):
+        return self.dirty or points is not self._points or len(points) != self._count
+
+    def _lengths_valid(self, points):
+        return (self._lengths is not None and points is self._length_points
+                and len(points) == len(self._lengths))
+
+    def _move_lengths(self, points, index):
+        n = len(self._lengths)
+        if n < 2:
+            return
+        for i in {(index - 1) % n, index}:
+            a, b = points[i], points[(i + 1) % n]
+            length = self._length_fn(a["x"], a["y"], b["x"], b["y"])
+            self._scaled += length - self._lengths[i]
+            self._lengths[i] = length
+        self._scaled_updates += 1
+        if self._scaled_updates >= self.resync_every:
+            self._scaled = math.fsum(self._lengths)
+            self._scaled_updates = 0
+
+    @staticmethod
+    def _edge_length(points, i):
+        a, b = points[i], points[(i + 1) % len(points)]
+        return math.hypot(b["x"] - a["x"], b["y"] - a["y"])
+
+    @staticmethod
+    def _edge_cross(points, i):
+        a, b = points[i], points[(i + 1) % len(points)]
+        return a["x"] * b["y"] - b["x"] * a["y"]
@@ -0,0 +1,32 @@
+"""Optional NumPy, imported on first use instead of at startup."""
+
+import importlib
+import sys
+
+_importer = importlib.import_module
+_numpy = None
+_missing = False
+
+
+def set_importer(importer):
+    """Import NumPy through ``importer(name)`` (e.g. to record its cost at startup)."""
+    global _importer
+    _importer = importer
+
+
+def numpy(load=True):
+    """The numpy module, or None when it is not installed.
+
+    The first call with ``load`` imports it. With ``load=False`` it is only
+    returned once something else has imported it, so cheap geometry paths
+    (ticks, small polygons) never pay for the import themselves.
+    """
+    global _numpy, _missing
+    if _numpy is None and not _missing:
+        if not load and "numpy" not in sys.modules:
+            return None
+        try:
+            _numpy = _importer("numpy")
+        except ImportError:
+            _missing = True
+    return _numpy
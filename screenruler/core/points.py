@@ -0,0 +1,173 @@
+"""Compact, array-backed storage for polygon points."""
+
+import math
+from array import array
+
+from .optional import numpy
+
+_AXIS = {"x": 0, "y": 1}
+
+# Buffers with this many coordinates import NumPy for the vectorized paths;
+# smaller ones only use it once something else has loaded it
+NUMPY_MIN_COORDS = 2 * 4096
+
+
+class PointView:
+    """Dict-compatible view of one point (``p["x"]``, ``p["y"]``, ``dict(p)``)."""
+
+    __slots__ = ("_data", "_offset")
+
+    def __init__(self, data, index):
+        self._data = data
+        self._offset = 2 * index
+
+    def __getitem__(self, key):
+        return self._data[self._offset + _AXIS[key]]
+
+    def __setitem__(self, key, value):
+        self._data[self._offset + _AXIS[key]] = value
+
+    def get(self, key, default=None):
+        axis = _AXIS.get(key)
+        return default if axis is None else self._data[self._offset + axis]
+
+    def keys(self):
+        return ("x", "y")
+
+    def items(self):
+        return (("x", self["x"]), ("y", self["y"]))
+
+    def __iter__(self):
+        return iter(("x", "y"))
+
+    def __len__(self):
+        return 2
+
+    def __eq__(self, other):
+        try:
+            return self["x"] == other["x"] and self["y"] == other["y"]
+        except (KeyError, TypeError, IndexError):
+            return NotImplemented
+
+    def __repr__(self):
+        return f"{{'x': {self['x']!r}, 'y': {self['y']!r}}}"
+
+
+class PointBuffer:
+    """Polygon points stored as interleaved doubles (x0, y0, x1, y1, ...).
+
+    Indexing returns a ``PointView`` so code written for lists of
+    ``{"x": ..., "y": ...}`` dicts keeps working, while translation, perimeter
+    and area run over the flat array (vectorized with NumPy when available).
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, points=()):
+        data = array("d")
+        for p in points:
+            if isinstance(p, (tuple, list)):
+                data.extend((float(p[0]), float(p[1])))
+            else:
+                data.extend((float(p["x"]), float(p["y"])))
+        self._data = data
+
+    @classmethod
+    def from_flat(cls, coords):
+        """Build from a flat x0, y0, x1, y1, ... sequence."""
+        buf = cls()
+        buf._data = array("d", coords)
+        return buf
+
+    # --- Sequence protocol ---
+    def __len__(self):
+        return len(self._data) // 2
+
+    def __getitem__(self, index):
+        n = len(self._data) // 2
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("point index out of range")
+        return PointView(self._data, index)
+
+    def __setitem__(self, index, point):
+        view = self[index]
+        view["x"], view["y"] = float(point["x"]), float(point["y"])
+
+    def __iter__(self):
+        data = self._data
+        return (PointView(data, i) for i in range(len(data) // 2))
+
+    def append(self, point):
+        self._data.extend((float(point["x"]), float(point["y"])))
+
+    def copy(self):
+        return PointBuffer.from_flat(self._data)
+
+    def to_dicts(self):
+        """Plain list of dicts, e.g. for JSON."""
+        data = self._data
+        return [{"x": data[i], "y": data[i + 1]} for i in range(0, len(data), 2)]
+
+    def coords(self):
+        """Flat list of coordinates (x0, y0, x1, y1, ...)."""
+        return self._data.tolist()
+
+    # --- In-place edits ---
+    def get(self, index):
+        return self._data[2 * index], self._data[2 * index + 1]
+
+    def set(self, index, x, y):
+        self._data[2 * index] = x
+        self._data[2 * index + 1] = y
+
+    def translate(self, dx, dy):
+        """Move every point by (dx, dy) in place."""
+        np = numpy(load=len(self._data) >= NUMPY_MIN_COORDS)
+        if not self._data:
+            return
+        if np is not None:
+            view = np.frombuffer(self._data, dtype=np.float64)
+            view[0::2] += dx
+            view[1::2] += dy
+            del view  # release the buffer export so the array can resize again
+            return
+        data = self._data
+        data[0::2] = array("d", [x + dx for x in data[0::2]])
+        data[1::2] = array("d", [y + dy for y in data[1::2]])
+
+    # --- Metrics ---
+    def perimeter(self):
+        """Closed perimeter in pixels."""
+        np = numpy(load=len(self._data) >= NUMPY_MIN_COORDS)
+        if len(self._data) < 4:
+            return 0.0
+        if np is not None:
+            pts = np.frombuffer(self._data, dtype=np.float64).reshape(-1, 2)
+            d = np.roll(pts, -1, axis=0) - pts
+            return float(np.hypot(d[:, 0], d[:, 1]).sum())
+        xs, ys = self._data[0::2], self._data[1::2]
+        nxs = xs[1:] + xs[:1]
+        nys = ys[1:] + ys[:1]
+        return math.fsum(map(math.hypot,
+                             [b - a for a, b in zip(xs, nxs)],
+                             [b - a for a, b in zip(ys, nys)]))
+
+    def signed_area2(self):
+        """Twice the signed shoelace area."""
+        np = numpy(load=len(self._data) >= NUMPY_MIN_COORDS)
+        if len(self._data) < 6:
+            return 0.0
+        if np is not None:
+            pts = np.frombuffer(self._data, dtype=np.float64).reshape(-1, 2)
+            x, y = pts[:, 0], pts[:, 1]
+            return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+        xs, ys = self._data[0::2], self._data[1::2]
+        nxs = xs[1:] + xs[:1]
+        nys = ys[1:] + ys[:1]
+        return math.fsum(x1 * y2 - x2 * y1 for x1, y1, x2, y2 in zip(xs, ys, nxs, nys))
+
+    def area(self):
+        """Polygon area in pixel^2 (shoelace formula)."""
+        return abs(self.signed_area2()) / 2.0
@@ -0,0 +1,323 @@
+"""Element detection on captured grey levels: outlined boxes and the gaps around them."""
+
+from array import array
+
+from .optional import numpy
+
+# Grey-level step between neighbouring pixels treated as part of an outline
+REGION_THRESHOLD = 16
+
+# Boxes narrower and shorter than this (px) are treated as noise
+MIN_REGION_SIZE = 3
+
+DIRECTIONS = ("left", "right", "up", "down")
+
+
+class RegionMap:
+    """Elements of one captured frame, found once and then queried by lookup.
+
+    Pixel boundaries where the grey level steps by ``threshold`` or more are
+    marked, split into horizontal runs per row, and runs that touch (8-way)
+    across rows are joined into components; each component's bounding box is
+    an element. Coordinates are pixel boundaries, so an element covering
+    pixels 10..19 spans 10 to 20 and a gap is a plain difference.
+
+    Two tables are built with the boxes: an owner map (smallest box under
+    each pixel) for hover lookups, and an integral image of the kept
+    outlines, so the nearest ink in any direction is found by binary search
+    instead of a pixel walk. ``gaps`` results are cached per box.
+    """
+
+    __slots__ = ("width", "height", "boxes", "_owner", "_integral", "_gaps")
+
+    def __init__(self, luma, width, height, threshold=REGION_THRESHOLD, min_size=MIN_REGION_SIZE):
+        np = numpy()
+        self.width = width
+        self.height = height
+        self._gaps = {}
+        if np is not None:
+            self._detect_numpy(luma, threshold, min_size)
+        else:
+            self._detect_python(luma, threshold, min_size)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Region map of a CaptureFrame (use with ``frame.derived``)."""
+        return cls(frame.luma(), frame.width, frame.height)
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def at(self, x, y):
+        """Index of the smallest box under pixel (x, y), or None."""
+        np = numpy()
+        x, y = int(x), int(y)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if np is not None:
+            index = int(self._owner[y, x])
+        else:
+            index = self._owner[y * self.width + x]
+        return index if index >= 0 else None
+
+    def ink(self, left, top, right, bottom):
+        """Number of outline pixels in the pixel rectangle [left, right) x [top, bottom)."""
+        ii = self._ii
+        return ii(bottom, right) - ii(top, right) - ii(bottom, left) + ii(top, left)
+
+    def gaps(self, index):
+        """Redlines from box ``index`` to the nearest outline on each side.
+
+        Returns {direction: (x1, y1, x2, y2)} for the sides where something
+        was found inside the frame; the segment runs from the box edge to
+        the first outline within the box's row (or column) span, placed
+        where that outline overlaps the span.
+        """
+        found = self._gaps.get(index)
+        if found is None:
+            found = self._gaps[index] = self._find_gaps(self.boxes[index])
+        return found
+
+    def _find_gaps(self, box):
+        left, top, right, bottom = box
+        width, height = self.width, self.height
+        found = {}
+
+        def columns(y0, y1):
+            return lambda x: self._ii(y1, x) - self._ii(y0, x)
+
+        def rows(x0, x1):
+            return lambda y: self._ii(y, x1) - self._ii(y, x0)
+
+        # Outlines sit on the box edge itself, so searches start one pixel out
+        band_cols, band_rows = columns(top, bottom), rows(left, right)
+        hit = _last_ink(band_cols, 0, left)
+        if hit is not None:
+            found["left"] = (hit, _middle(rows(hit, hit + 1), top, bottom), left)
+        hit = _first_ink(band_cols, right + 1, width)
+        if hit is not None:
+            found["right"] = (right, _middle(rows(hit, hit + 1), top, bottom), hit)
+        hit = _last_ink(band_rows, 0, top)
+        if hit is not None:
+            found["up"] = (hit, _middle(columns(hit, hit + 1), left, right), top)
+        hit = _first_ink(band_rows, bottom + 1, height)
+        if hit is not None:
+            found["down"] = (bottom, _middle(columns(hit, hit + 1), left, right), hit)
+
+        # (start, across, end) -> (x1, y1, x2, y2)
+        segments = {}
+        for direction, (start, across, end) in found.items():
+            if direction in ("left", "right"):
+                segments[direction] = (start, across, end, across)
+            else:
+                segments[direction] = (across, start, across, end)
+        return segments
+
+    def _ii(self, y, x):
+        np = numpy()
+        if np is not None:
+            return int(self._integral[y, x])
+        return self._integral[y * (self.width + 1) + x]
+
+    def _detect_numpy(self, luma, threshold, min_size):
+        np = numpy()
+        g = np.asarray(luma, dtype=np.int16)
+        h, w = self.height, self.width
+        # mask[y, x]: a vertical boundary at x or a horizontal one at y
+        mask = np.zeros((h, w), dtype=bool)
+        mask[:, 1:] = np.abs(g[:, 1:] - g[:, :-1]) >= threshold
+        mask[1:, :] |= np.abs(g[1:, :] - g[:-1, :]) >= threshold
+
+        padded = np.zeros((h, w + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        step = np.diff(padded, axis=1)
+        run_y, run_x0 = np.nonzero(step == 1)
+        run_x1 = np.nonzero(step == -1)[1]  # exclusive ends, same order
+        count = len(run_y)
+        if count == 0:
+            self._finish_numpy([], np.zeros((h, w), dtype=np.int32))
+            return
+
+        # Runs in the previous row that touch each run form a contiguous
+        # slice of the row-major run list; find it with two searchsorted calls
+        stride = w + 2
+        start_keys = run_y * stride + run_x0
+        end_keys = run_y * stride + run_x1
+        above = (run_y - 1) * stride
+        lo = np.searchsorted(end_keys, above + run_x0, side="left")
+        hi = np.searchsorted(start_keys, above + run_x1, side="right")
+        links = np.maximum(hi - lo, 0)
+        total = int(links.sum())
+        a = np.repeat(np.arange(count), links)
+        b = np.repeat(lo - (np.cumsum(links) - links), links) + np.arange(total)
+
+        # Min-label propagation with pointer jumping
+        labels = np.arange(count)
+        while total:
+            low = np.minimum(labels[a], labels[b])
+            merged = labels.copy()
+            np.minimum.at(merged, a, low)
+            np.minimum.at(merged, b, low)
+            merged = merged[merged]
+            if np.array_equal(merged, labels):
+                break
+            labels = merged
+        roots, component = np.unique(labels, return_inverse=True)
+
+        n = len(roots)
+        left = np.full(n, w, dtype=np.int64)
+        top = np.full(n, h, dtype=np.int64)
+        right = np.zeros(n, dtype=np.int64)
+        bottom = np.zeros(n, dtype=np.int64)
+        np.minimum.at(left, component, run_x0)
+        np.maximum.at(right, component, run_x1 - 1)
+        np.minimum.at(top, component, run_y)
+        np.maximum.at(bottom, component, run_y)
+        keep = (right - left >= min_size) | (bottom - top >= min_size)
+
+        # Outline mask without the noise, for the integral image
+        kept = keep[component]
+        lengths = (run_x1 - run_x0)[kept]
+        starts = (run_y * w + run_x0)[kept]
+        flat = np.zeros(h * w, dtype=np.int32)
+        flat[np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(int(lengths.sum()))] = 1
+
+        boxes = [tuple(int(v) for v in box) for box in zip(left[keep], top[keep], right[keep], bottom[keep])]
+        self._finish_numpy(boxes, flat.reshape(h, w))
+
+    def _finish_numpy(self, boxes, outline):
+        np = numpy()
+        h, w = self.height, self.width
+        self.boxes = boxes
+        integral = np.zeros((h + 1, w + 1), dtype=np.int32)
+        integral[1:, 1:] = outline.cumsum(axis=0).cumsum(axis=1)
+        self._integral = integral
+        # Largest boxes first so nested ones overwrite them
+        owner = np.full((h, w), -1, dtype=np.int32)
+        for i in sorted(range(len(boxes)), key=lambda i: _area(boxes[i]), reverse=True):
+            left, top, right, bottom = boxes[i]
+            owner[top:bottom, left:right] = i
+        self._owner = owner
+
+    def _detect_python(self, luma, threshold, min_size):
+        h, w = self.height, self.width
+        flat = luma.tobytes()
+        rows = []  # per row: [(x0, x1, run id), ...]
+        parent = []
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for y in range(h):
+            base = y * w
+            marks = [x > 0 and abs(flat[base + x] - flat[base + x - 1]) >= threshold
+                     or y > 0 and abs(flat[base + x] - flat[base + x - w]) >= threshold
+                     for x in range(w)]
+            runs, x = [], 0
+            while x < w:
+                if marks[x]:
+                    x0 = x
+                    while x < w and marks[x]:
+                        x += 1
+                    runs.append((x0, x, len(parent)))
+                    parent.append(len(parent))
+                else:
+                    x += 1
+            if y > 0:
+                previous, j = rows[-1], 0
+                for x0, x1, run in runs:
+                    while j < len(previous) and previous[j][1] < x0:
+                        j += 1
+                    k = j
+                    while k < len(previous) and previous[k][0] <= x1:
+                        ra, rb = find(run), find(previous[k][2])
+                        if ra != rb:
+                            parent[max(ra, rb)] = min(ra, rb)
+                        k += 1
+            rows.append(runs)
+
+        extents = {}
+        for y, runs in enumerate(rows):
+            for x0, x1, run in runs:
+                root = find(run)
+                box = extents.get(root)
+                if box is None:
+                    extents[root] = [x0, y, x1 - 1, y]
+                else:
+                    box[0] = min(box[0], x0)
+                    box[2] = max(box[2], x1 - 1)
+                    box[3] = y
+        kept = {root for root, (left, top, right, bottom) in extents.items()
+                if right - left >= min_size or bottom - top >= min_size}
+        self.boxes = [tuple(extents[root]) for root in sorted(kept)]
+
+        stride = w + 1
+        integral = array("i", bytes(4 * stride * (h + 1)))
+        for y, runs in enumerate(rows):
+            line = bytearray(w)
+            for x0, x1, run in runs:
+                if find(run) in kept:
+                    line[x0:x1] = b"\1" * (x1 - x0)
+            total, above, here = 0, y * stride, (y + 1) * stride
+            for x in range(w):
+                total += line[x]
+                integral[here + x + 1] = integral[above + x + 1] + total
+        self._integral = integral
+
+        owner = array("i", [-1]) * (w * h)
+        boxes = self.boxes
+        for i in sorted(range(len(boxes)), key=lambda i: _area(boxes[i]), reverse=True):
+            left, top, right, bottom = boxes[i]
+            fill = array("i", [i]) * (right - left)
+            for y in range(top, bottom):
+                owner[y * w + left:y * w + right] = fill
+        self._owner = owner
+
+
+def _area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def _first_ink(prefix, lo, hi):
+    """Smallest k in [lo, hi) where ``prefix`` steps up (prefix(k + 1) > prefix(k)), or None."""
+    if lo >= hi:
+        return None
+    base = prefix(lo)
+    if prefix(hi) == base:
+        return None
+    a, b = lo + 1, hi
+    while a < b:
+        mid = (a + b) // 2
+        if prefix(mid) > base:
+            b = mid
+        else:
+            a = mid + 1
+    return a - 1
+
+
+def _last_ink(prefix, lo, hi):
+    """Largest k in [lo, hi) where ``prefix`` steps up, or None."""
+    if lo >= hi:
+        return None
+    end = prefix(hi)
+    if prefix(lo) == end:
+        return None
+    a, b = lo, hi
+    while a < b:
+        mid = (a + b) // 2
+        if prefix(mid) < end:
+            a = mid + 1
+        else:
+            b = mid
+    return a - 1
+
+
+def _middle(prefix, lo, hi):
+    """Centre of the inked stretch of [lo, hi) (the span centre when it has none)."""
+    first = _first_ink(prefix, lo, hi)
+    if first is None:
+        return (lo + hi) / 2
+    return (first + _last_ink(prefix, lo, hi) + 1) / 2
@@ -0,0 +1,256 @@
+"""Uniform-grid spatial index for polygon hit-testing."""
+
+import math
+
+# Smallest cell side (px); keeps empty-area queries to a few dozen cell lookups
+MIN_CELL_SIZE = 4.0
+
+
+class PolygonIndex:
+    """Grid over polygon vertices and the cells each edge passes through.
+
+    Queries walk the cells around the cursor in rings, nearest first, and
+    stop once the next ring is farther away than the best hit, so hover and
+    click tests stay cheap for outlines with thousands of vertices. The cell
+    side is picked at rebuild time from the bounding box and vertex spacing
+    (a fixed ``cell_size`` overrides it), so dense outlines do not pile
+    hundreds of vertices into one cell.
+
+    Dragging one vertex updates its cell and its two edges in place
+    (``move_vertex``); moving the whole shape only shifts a stored offset
+    (``translate``). Replacing the shape marks the index dirty and it is
+    rebuilt in bulk on the next query.
+
+    Points are read as ``p["x"]`` / ``p["y"]``.
+    """
+
+    def __init__(self, cell_size=None):
+        self.fixed_cell_size = None if cell_size is None else float(cell_size)
+        self.cell_size = self.fixed_cell_size or 64.0
+        self._points = None
+        self._count = 0
+        self._dx = self._dy = 0.0  # translation applied since the last rebuild
+        self._vertex_cells = {}  # cell -> set of vertex indexes
+        self._edge_cells = {}    # cell -> set of edge indexes (edge i: i -> i+1)
+        self._vertex_key = []    # vertex index -> cell
+        self._edge_keys = []     # edge index -> list of cells
+        self.dirty = True
+
+    # --- Maintenance ---
+    def invalidate(self):
+        """Mark the index stale; it is rebuilt on the next query."""
+        self.dirty = True
+
+    def rebuild(self, points):
+        """Index every vertex and edge of ``points`` from scratch."""
+        self._points = points
+        self._count = n = len(points)
+        self._dx = self._dy = 0.0
+        xs, ys = _coords(points)
+        self.cell_size = size = self.fixed_cell_size or _auto_cell_size(xs, ys)
+        floor = math.floor
+        self._vertex_key = keys = [(floor(x / size), floor(y / size)) for x, y in zip(xs, ys)]
+        self._vertex_cells = cells = {}
+        for i, key in enumerate(keys):
+            cells.setdefault(key, set()).add(i)
+        self._edge_cells = cells = {}
+        self._edge_keys = [()] * n
+        if n >= 2:
+            for i in range(n):
+                j = (i + 1) % n
+                if keys[i] == keys[j]:  # a short edge stays inside its cell
+                    edge_keys = (keys[i],)
+                else:
+                    edge_keys = self._segment_cells(xs[i], ys[i], xs[j], ys[j])
+                for key in edge_keys:
+                    cells.setdefault(key, set()).add(i)
+                self._edge_keys[i] = edge_keys
+        self.dirty = False
+
+    def move_vertex(self, points, index):
+        """Update the index after ``points[index]`` moved."""
+        if self._stale(points):
+            self.rebuild(points)
+            return
+        n = self._count
+        self._remove_vertex(index)
+        self._add_vertex(index)
+        if n >= 2:
+            for edge in {(index - 1) % n, index}:
+                self._remove_edge(edge)
+                self._add_edge(edge)
+
+    def translate(self, points, dx, dy):
+        """Follow a translation of every point by (dx, dy) without re-indexing."""
+        if not self._stale(points):
+            self._dx += dx
+            self._dy += dy
+
+    # --- Queries ---
+    def hit_vertex(self, points, x, y, radius):
+        """Index of the nearest vertex within ``radius`` of (x, y), or None."""
+        if self._stale(points):
+            self.rebuild(points)
+        size = self.cell_size
+        cx, cy = self._cell(x, y)
+        qx, qy = x - self._dx, y - self._dy
+        cells = self._vertex_cells
+        point = _getter(points)
+        best, best_d = None, radius
+        # A vertex within ``radius`` sits at most this many rings out
+        for ring in range(int(radius // size) + 2):
+            if (ring - 1) * size > best_d:
+                break
+            for key in _ring(cx, cy, ring):
+                bucket = cells.get(key)
+                if not bucket or _cell_distance(key, qx, qy, size) > best_d:
+                    continue
+                for i in bucket:
+                    px, py = point(i)
+                    d = math.hypot(x - px, y - py)
+                    if d < best_d or (d == best_d and best is not None and i < best):
+                        best, best_d = i, d
+        return best
+
+    def hit_edge(self, points, x, y, tolerance):
+        """Index ``i`` of the nearest edge (i -> i+1) within ``tolerance``, or None."""
+        if self._stale(points):
+            self.rebuild(points)
+        n = self._count
+        size = self.cell_size
+        cx, cy = self._cell(x, y)
+        qx, qy = x - self._dx, y - self._dy
+        cells = self._edge_cells
+        point = _getter(points)
+        best, best_d = None, tolerance
+        seen = set()
+        for ring in range(int(tolerance // size) + 2):
+            if (ring - 1) * size > best_d:
+                break
+            for key in _ring(cx, cy, ring):
+                bucket = cells.get(key)
+                if not bucket or _cell_distance(key, qx, qy, size) > best_d:
+                    continue
+                for i in bucket:
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    x1, y1 = point(i)
+                    x2, y2 = point((i + 1) % n)
+                    seg_len = math.hypot(x2 - x1, y2 - y1)
+                    if seg_len == 0:
+                        continue
+                    dot = ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / (seg_len * seg_len)
+                    if not 0 <= dot <= 1:
+                        continue
+                    d = abs((y2 - y1) * x - (x2 - x1) * y + x2 * y1 - y2 * x1) / seg_len
+                    if d < best_d or (d == best_d and best is not None and i < best):
+                        best, best_d = i, d
+        return best
+
+    # --- Internals ---
+    def _stale(self, points):
+        return self.dirty or points is not self._points or len(points) != self._count
+
+    def _cell(self, x, y):
+        """Cell of the on-screen point (x, y), undoing the stored translation."""
+        size = self.cell_size
+        return (math.floor((x - self._dx) / size), math.floor((y - self._dy) / size))
+
+    def _add_vertex(self, i):
+        p = self._points[i]
+        key = self._cell(p["x"], p["y"])
+        self._vertex_key[i] = key
+        self._vertex_cells.setdefault(key, set()).add(i)
+
+    def _remove_vertex(self, i):
+        key = self._vertex_key[i]
+        cell = self._vertex_cells.get(key)
+        if cell is not None:
+            cell.discard(i)
+            if not cell:
+                del self._vertex_cells[key]
+
+    def _add_edge(self, i):
+        p, q = self._points[i], self._points[(i + 1) % self._count]
+        keys = self._segment_cells(p["x"] - self._dx, p["y"] - self._dy,
+                                   q["x"] - self._dx, q["y"] - self._dy)
+        cells = self._edge_cells
+        for key in keys:
+            cells.setdefault(key, set()).add(i)
+        self._edge_keys[i] = keys
+
+    def _remove_edge(self, i):
+        cells = self._edge_cells
+        for key in self._edge_keys[i]:
+            cell = cells.get(key)
+            if cell is not None:
+                cell.discard(i)
+                if not cell:
+                    del cells[key]
+        self._edge_keys[i] = ()
+
+    def _segment_cells(self, x1, y1, x2, y2):
+        """Every cell the segment (x1, y1) -> (x2, y2) touches, column by column."""
+        size = self.cell_size
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+        if x1 == x2:
+            cx = math.floor(x1 / size)
+            low, high = sorted((y1, y2))
+            return [(cx, cy) for cy in range(math.floor(low / size), math.floor(high / size) + 1)]
+        slope = (y2 - y1) / (x2 - x1)
+        keys = []
+        for cx in range(math.floor(x1 / size), math.floor(x2 / size) + 1):
+            ya = y1 + (max(x1, cx * size) - x1) * slope
+            yb = y1 + (min(x2, (cx + 1) * size) - x1) * slope
+            if ya > yb:
+                ya, yb = yb, ya
+            keys.extend((cx, cy) for cy in range(math.floor(ya / size), math.floor(yb / size) + 1))
+        return keys
+
+
+def _coords(points):
+    """Separate x and y lists of a PointBuffer or a list of point dicts."""
+    if hasattr(points, "coords"):
+        flat = points.coords()
+        return flat[0::2], flat[1::2]
+    return [p["x"] for p in points], [p["y"] for p in points]
+
+
+def _getter(points):
+    """``i -> (x, y)`` without building a point view per access where possible."""
+    if hasattr(points, "coords"):
+        return points.get
+    return lambda i: (points[i]["x"], points[i]["y"])
+
+
+def _cell_distance(key, x, y, size):
+    """Distance from (x, y) to the nearest point of cell ``key``."""
+    left, top = key[0] * size, key[1] * size
+    dx = max(left - x, x - left - size, 0.0)
+    dy = max(top - y, y - top - size, 0.0)
+    return math.hypot(dx, dy)
+
+
+def _auto_cell_size(xs, ys):
+    """Cell side holding a handful of vertices, from the bbox and vertex spacing.
+
+    Scattered points are spread over the bbox area and outlines along their
+    perimeter, so the smaller of the two spacings is used.
+    """
+    n = len(xs)
+    if n < 2:
+        return 64.0
+    spread = math.sqrt((max(xs) - min(xs)) * (max(ys) - min(ys)) / n)
+    outline = sum(math.hypot(xs[i] - xs[i - 1], ys[i] - ys[i - 1]) for i in range(n)) / n
+    return max(MIN_CELL_SIZE, 2.0 * min(spread, outline))
+
+
+def _ring(cx, cy, ring):
+    """Cells at Chebyshev distance ``ring`` from cell (cx, cy)."""
+    if ring == 0:
+        return ((cx, cy),)
+    keys = [(x, y) for x in range(cx - ring, cx + ring + 1) for y in (cy - ring, cy + ring)]
+    keys.extend((x, y) for x in (cx - ring, cx + ring) for y in range(cy - ring + 1, cy + ring))
+    return keys
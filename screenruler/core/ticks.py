@@ -0,0 +1,278 @@
+"""Tick plans and batched tick geometry for rulers and angle arms."""
+
+import math
+
+from .optional import numpy
+from .units import get_converter
+
+
+def _clip_range(x, y, ux, uy, s0, s1, rect):
+    """Clip the ray (x, y) + s * (ux, uy), s in [s0, s1], to ``rect``.
+
+    Liang-Barsky: returns the visible (s_lo, s_hi) or None.
+    """
+    left, top, right, bottom = rect
+    for p, q in ((-ux, x - left), (ux, right - x), (-uy, y - top), (uy, bottom - y)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        r = q / p
+        if p < 0:
+            if r > s1:
+                return None
+            if r > s0:
+                s0 = r
+        else:
+            if r < s0:
+                return None
+            if r < s1:
+                s1 = r
+    return s0, s1
+
+
+class TickPlan:
+    """Spacing, hierarchy and label formatting for one unit configuration."""
+
+    __slots__ = ("unit", "minor_px", "base", "lengths", "label_every",
+                 "label_offset", "strides", "margin", "_labels")
+
+    def __init__(self, unit, minor_px, base, lengths, label_every, label_offset, strides):
+        self.unit = unit
+        self.minor_px = minor_px        # distance between minor ticks in px
+        self.base = base                # px per unit (px: 1.0)
+        self.lengths = lengths          # tick half-length for i % len(lengths)
+        self.label_every = label_every  # label every n-th tick
+        self.label_offset = label_offset
+        self.strides = strides          # coarser levels of detail, in minor ticks
+        # How far a tick or its label reaches off the ruler line
+        self.margin = max(lengths) + label_offset + 40
+        self._labels = {}
+
+    def stride_for(self, min_px):
+        """Smallest level-of-detail stride whose spacing is at least ``min_px``."""
+        for stride in self.strides:
+            if stride * self.minor_px >= min_px:
+                return stride
+        return self.strides[-1]
+
+    def tick_length(self, i):
+        return self.lengths[i % len(self.lengths)]
+
+    def label(self, i):
+        """Return the (cached) label text for tick ``i``."""
+        text = self._labels.get(i)
+        if text is None:
+            text = self._format(i)
+            if len(self._labels) > 4096:
+                self._labels.clear()
+            self._labels[i] = text
+        return text
+
+    def _format(self, i):
+        unit = self.unit
+        if unit == "px":
+            return f"{i * self.minor_px} px"
+        value = (i * self.minor_px) / self.base
+        if unit == "m":
+            return f"{value:.2f} m"
+        suffix = "µm" if unit == "um" else unit
+        return f"{int(round(value))} {suffix}"
+
+
+class TickGeometry:
+    """Flat tick/label coordinates for one segment.
+
+    ``ticks`` holds x1, y1, x2, y2 per tick, ``label_xy`` holds x, y per label
+    and ``labels`` the matching label strings.
+    """
+
+    __slots__ = ("ticks", "label_xy", "labels")
+
+    def __init__(self, ticks, label_xy, labels):
+        self.ticks = ticks
+        self.label_xy = label_xy
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.ticks) // 4
+
+
+_EMPTY = TickGeometry([], [], [])
+
+
+class TickEngine:
+    """Build and cache tick plans and compute tick geometry in one pass."""
+
+    # Metric hierarchy: minor, medium every x5, major every x10
+    METRIC_LENGTHS = (16, 8, 8, 8, 8, 12, 8, 8, 8, 8)
+    # Inch hierarchy: 1/8", 1/4" every x2, 1/2" every x4, 1" every x8
+    INCH_LENGTHS = (18, 9, 12, 9, 14, 9, 12, 9)
+
+    # Level-of-detail strides; each one keeps whole levels of the hierarchy
+    METRIC_STRIDES = tuple(m * 10 ** e for e in range(10) for m in (1, 5))
+    INCH_STRIDES = tuple(2 ** e for e in range(30))
+
+    def __init__(self, max_plans=64, min_tick_px=6.0, max_items=600):
+        self.max_plans = max_plans
+        self.min_tick_px = min_tick_px  # coarsen when ticks get denser than this
+        self.max_items = max_items      # default tick + label budget per segment
+        self._plans = {}
+
+    def plan(self, unit, dpi, calibration_factor, tick_spacing):
+        """Return the cached plan for this unit/DPI/calibration/spacing."""
+        key = (unit, dpi, calibration_factor, tick_spacing)
+        plan = self._plans.get(key)
+        if plan is None:
+            if len(self._plans) >= self.max_plans:
+                self._plans.clear()
+            plan = self._plans[key] = self._build_plan(*key)
+        return plan
+
+    def _build_plan(self, unit, dpi, calibration_factor, tick_spacing):
+        calib = max(1e-6, float(calibration_factor))
+
+        if unit == "px":
+            minor_px = max(5, int(tick_spacing))
+            return TickPlan(unit, minor_px, 1.0, self.METRIC_LENGTHS, 10, 26, self.METRIC_STRIDES)
+
+        base = get_converter(dpi, calib).px_per_unit(unit)
+        if unit == "in":
+            minor_px, min_pixels = base / 8.0, 8.0    # 1/8 inch
+        elif unit == "cm":
+            minor_px, min_pixels = base * 0.1, 6.0    # 1 mm
+        elif unit == "mm":
+            minor_px, min_pixels = base * 1.0, 6.0    # 1 mm
+        elif unit == "m":
+            minor_px, min_pixels = base * 0.01, 6.0   # 1 cm
+        else:  # um
+            minor_px, min_pixels = base * 100.0, 6.0  # 100 µm
+        # Keep ticks readable by skipping whole steps
+        if minor_px < min_pixels:
+            minor_px *= math.ceil(min_pixels / minor_px)
+
+        if unit == "in":
+            return TickPlan(unit, minor_px, base, self.INCH_LENGTHS, 8, 28, self.INCH_STRIDES)
+        return TickPlan(unit, minor_px, base, self.METRIC_LENGTHS, 10, 26, self.METRIC_STRIDES)
+
+    def segment(self, plan, x1, y1, x2, y2, dist, show_labels=True, clip=None,
+                max_items=None, min_tick_px=None, start=0.0, end=None):
+        """Return tick geometry for the segment (x1, y1) -> (x2, y2).
+
+        ``clip`` is the visible (left, top, right, bottom) rectangle; ticks
+        outside it are skipped analytically. When the visible ticks would be
+        denser than ``min_tick_px`` or exceed ``max_items`` canvas items, whole
+        hierarchy levels are dropped until they fit. Only ticks between
+        ``start`` and ``end`` pixels from (x1, y1) are kept, so one piece of
+        a longer ruler can be drawn with indices (and labels) counted from
+        the ruler's origin.
+        """
+        if dist <= 0:
+            return _EMPTY
+
+        ux = (x2 - x1) / dist
+        uy = (y2 - y1) / dist
+        nx, ny = -uy, ux
+        step = plan.minor_px
+        last = int(dist // step) + 1
+        if end is not None:
+            last = min(last, math.floor(end / step))
+
+        # Visible index range
+        first = max(0, math.ceil(start / step)) if start > 0 else 0
+        if clip is not None:
+            m = plan.margin
+            rect = (clip[0] - m, clip[1] - m, clip[2] + m, clip[3] + m)
+            span = _clip_range(x1, y1, ux, uy, 0.0, last * step, rect)
+            if span is None:
+                return _EMPTY
+            first = max(first, math.ceil(span[0] / step))
+            last = min(last, math.floor(span[1] / step))
+            if first > last:
+                return _EMPTY
+
+        # Level of detail
+        budget = self.max_items if max_items is None else max_items
+        strides = plan.strides
+        min_px = self.min_tick_px if min_tick_px is None else min_tick_px
+        level = strides.index(plan.stride_for(min_px))
+        while True:
+            stride = strides[level]
+            label_stride = max(stride, plan.label_every)
+            k0 = -(-first // stride)
+            k1 = last // stride
+            count = max(0, k1 - k0 + 1)
+            labels_count = 0
+            if show_labels:
+                labels_count = max(0, last // label_stride + (first // -label_stride) + 1)
+            if count + labels_count <= budget or level == len(strides) - 1:
+                break
+            level += 1
+
+        ticks = self._tick_coords(plan, x1, y1, ux, uy, nx, ny, k0, count, stride)
+
+        label_xy, labels = [], []
+        if show_labels:
+            off = plan.label_offset
+            start = -(-first // label_stride) * label_stride
+            for i in range(start, last + 1, label_stride):
+                d = i * step
+                label_xy.append(x1 + ux * d + nx * off)
+                label_xy.append(y1 + uy * d + ny * off)
+                labels.append(plan.label(i))
+        return TickGeometry(ticks, label_xy, labels)
+
+    def _tick_coords(self, plan, x1, y1, ux, uy, nx, ny, k0, count, stride):
+        np = numpy(load=False)
+        step = plan.minor_px
+        lengths = plan.lengths
+        period = len(lengths)
+
+        if np is not None:
+            idx = (np.arange(count) + k0) * stride
+            d = idx * step
+            px = x1 + ux * d
+            py = y1 + uy * d
+            length = np.asarray(lengths, dtype=float)[idx % period]
+            out = np.empty((count, 4))
+            out[:, 0] = px + nx * length
+            out[:, 1] = py + ny * length
+            out[:, 2] = px - nx * length
+            out[:, 3] = py - ny * length
+            return out.ravel().tolist()
+
+        out = []
+        extend = out.extend
+        for k in range(k0, k0 + count):
+            i = k * stride
+            d = i * step
+            px = x1 + ux * d
+            py = y1 + uy * d
+            length = lengths[i % period]
+            extend((px + nx * length, py + ny * length,
+                    px - nx * length, py - ny * length))
+        return out
+
+    def fractions(self, x1, y1, x2, y2, dist, fraction_count, show_labels=True):
+        """Return geometry dividing the segment into equal partitions."""
+        if dist <= 0:
+            return _EMPTY
+
+        count = max(2, int(fraction_count))
+        ux = (x2 - x1) / dist
+        uy = (y2 - y1) / dist
+        nx, ny = -uy, ux
+
+        ticks, label_xy, labels = [], [], []
+        for i in range(count + 1):
+            t = i / count
+            px = x1 + (x2 - x1) * t
+            py = y1 + (y2 - y1) * t
+            length = 16 if i in (0, count) else 12
+            ticks.extend((px + nx * length, py + ny * length,
+                          px - nx * length, py - ny * length))
+            if show_labels and 0 < i < count:
+                label_xy.append(px + nx * 26)
+                label_xy.append(py + ny * 26)
+                labels.append(f"{i}/{count}")
+        return TickGeometry(ticks, label_xy, labels)
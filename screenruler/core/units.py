@@ -0,0 +1,116 @@
+"""Unit conversion tables and cached measurement formatters."""
+
+from functools import lru_cache
+
+from .optional import numpy
+
+# Canonical units, in the order the UI cycles through them
+UNITS = ("px", "um", "mm", "cm", "m", "in")
+
+# Physical units per inch
+UNITS_PER_INCH = {"in": 1.0, "cm": 2.54, "mm": 25.4, "um": 25400.0, "m": 0.0254}
+
+# Decimal places used when displaying a distance
+DISTANCE_PRECISION = {"px": 0, "um": 1, "mm": 2, "cm": 2, "m": 4, "in": 2}
+
+UNIT_SUFFIX = {"px": "px", "um": "µm", "mm": "mm", "cm": "cm", "m": "m", "in": "in"}
+
+_ALIASES = {u: u for u in UNITS}
+_ALIASES.update({"inch": "in", "inches": "in", "µm": "um", "μm": "um", "meter": "m"})
+
+
+def normalize_unit(unit) -> str:
+    """Normalize unit strings and keep backwards compatibility."""
+    canonical = _ALIASES.get(unit)
+    if canonical is not None:
+        return canonical
+    if not unit:
+        return "px"
+    return _ALIASES.get(str(unit).strip().lower(), "px")
+
+
+class UnitConverter:
+    """px -> unit factors precomputed for one (dpi, calibration) pair."""
+
+    __slots__ = ("dpi", "calibration", "_raw", "_calibrated")
+
+    def __init__(self, dpi, calibration=1.0):
+        self.dpi = float(dpi)
+        self.calibration = float(calibration)
+        self._raw = {u: 1.0 if u == "px" else UNITS_PER_INCH[u] / self.dpi for u in UNITS}
+        self._calibrated = {u: f * self.calibration for u, f in self._raw.items()}
+
+    def factor(self, unit, calibrated=True):
+        """Multiplier turning a pixel length into ``unit``."""
+        return (self._calibrated if calibrated else self._raw)[unit]
+
+    def to_unit(self, px, unit, calibrated=True):
+        return px * (self._calibrated if calibrated else self._raw)[unit]
+
+    def area_to_unit(self, px2, unit, calibrated=True):
+        f = (self._calibrated if calibrated else self._raw)[unit]
+        return px2 * f * f
+
+    def to_unit_batch(self, values, unit, calibrated=True):
+        """Convert many pixel lengths at once (NumPy arrays stay arrays)."""
+        np = numpy(load=False)
+        f = (self._calibrated if calibrated else self._raw)[unit]
+        if np is not None and isinstance(values, np.ndarray):
+            return values * f
+        return [v * f for v in values]
+
+    def px_per_unit(self, unit):
+        """Screen pixels per one calibrated unit (px spacing is not calibrated)."""
+        if unit == "px":
+            return 1.0
+        return 1.0 / self._calibrated[unit]
+
+
+@lru_cache(maxsize=32)
+def get_converter(dpi, calibration=1.0):
+    """Shared converter for a (dpi, calibration) pair."""
+    return UnitConverter(dpi, calibration)
+
+
+class DistanceFormatter:
+    """Formats a length already expressed in ``unit``."""
+
+    __slots__ = ("unit", "precision", "_template")
+
+    def __init__(self, unit, precision=None):
+        self.unit = unit
+        self.precision = DISTANCE_PRECISION[unit] if precision is None else precision
+        self._template = "{:.%df} %s" % (self.precision, UNIT_SUFFIX[unit])
+
+    def __call__(self, value):
+        if self.unit == "px" and self.precision == 0:
+            return f"{int(value)} px"
+        return self._template.format(value)
+
+
+class AreaFormatter:
+    """Formats an area already expressed in ``unit`` squared."""
+
+    __slots__ = ("unit", "suffix")
+
+    def __init__(self, unit):
+        self.unit = unit
+        self.suffix = UNIT_SUFFIX[unit] + "^2"
+
+    def __call__(self, value):
+        # Choose formatting based on magnitude
+        if value >= 100:
+            return f"{value:,.1f} {self.suffix}"
+        if value >= 1:
+            return f"{value:.2f} {self.suffix}"
+        return f"{value:.4f} {self.suffix}"
+
+
+@lru_cache(maxsize=64)
+def distance_formatter(unit, precision=None):
+    return DistanceFormatter(unit, precision)
+
+
+@lru_cache(maxsize=16)
+def area_formatter(unit):
+    return AreaFormatter(unit)
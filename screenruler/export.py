@@ -0,0 +1,126 @@
+"""Streaming export of the measurement history to CSV, JSON or NDJSON."""
+
+import csv
+import io
+import json
+import os
+import threading
+
+from screenruler.history import FIELDS
+
+# File extension -> export format
+FORMATS = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+COLUMNS = ("time", "mode", "unit", "copied_unit", "distance", "angle",
+           "perimeter", "area", "arm1", "arm2")
+
+# Values that are lengths / areas in pixels (angles are exported as they are)
+_LENGTHS = ("distance", "perimeter", "arm1", "arm2")
+_AREAS = ("area",)
+
+
+def export_format(path):
+    """Export format for ``path`` from its extension (CSV when unknown)."""
+    return FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def export_row(record, converter, unit):
+    """Flat dict for one history record with lengths and areas in ``unit``."""
+    row = {"time": record.timestamp.isoformat(timespec="seconds"), "mode": record.mode,
+           "unit": unit, "copied_unit": record.unit}
+    factor = converter.factor(unit)
+    for name, value in zip(FIELDS.get(record.mode, ()), record.values):
+        if name in _LENGTHS:
+            value *= factor
+        elif name in _AREAS:
+            value *= factor * factor
+        row[name] = round(value, 6)
+    return row
+
+
+class HistoryExport:
+    """Write history records to a file in chunks on a worker thread.
+
+    ``records`` is any iterable (normally ``MeasurementHistory.iter_log()``),
+    consumed lazily so memory stays flat however long the log is. Rows are
+    converted with ``converter`` (a ``UnitConverter`` snapshot) into
+    ``unit`` and written every ``chunk_size`` rows to ``path + ".part"``,
+    which replaces ``path`` only when the export completes. The caller polls
+    ``written``/``done``/``error``; nothing here touches Tk.
+    """
+
+    def __init__(self, records, path, converter, unit, fmt=None, chunk_size=1000):
+        self.records = records
+        self.path = path
+        self.converter = converter
+        self.unit = unit
+        self.fmt = fmt or export_format(path)
+        self.chunk_size = max(1, int(chunk_size))
+        self.written = 0
+        self.done = False
+        self.error = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="history-export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self, wait=1.0):
+        """Stop the export (the partial file is removed)."""
+        self._cancelled.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=wait)
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run(self):
+        tmp_path = self.path + ".part"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                self._write(f)
+            if self.cancelled:
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, self.path)
+        except (OSError, ValueError) as e:
+            self.error = e
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        finally:
+            self.done = True
+
+    def _write(self, f):
+        chunk = io.StringIO()
+        writer = csv.DictWriter(chunk, fieldnames=COLUMNS, lineterminator="\n")
+        if self.fmt == "csv":
+            writer.writeheader()
+        elif self.fmt == "json":
+            chunk.write("[")
+        pending = 0
+        for record in self.records:
+            if self.cancelled:
+                return
+            row = export_row(record, self.converter, self.unit)
+            if self.fmt == "csv":
+                writer.writerow(row)
+            elif self.fmt == "json":
+                chunk.write(",\n  " if self.written + pending else "\n  ")
+                chunk.write(json.dumps(row, ensure_ascii=False))
+            else:
+                chunk.write(json.dumps(row, ensure_ascii=False) + "\n")
+            pending += 1
+            if pending >= self.chunk_size:
+                f.write(chunk.getvalue())
+                chunk.seek(0)
+                chunk.truncate()
+                self.written += pending
+                pending = 0
+        if self.fmt == "json":
+            chunk.write("\n]\n")
+        f.write(chunk.getvalue())
+        self.written += pending
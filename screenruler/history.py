@@ -0,0 +1,370 @@
+"""Bounded measurement history with an append-only JSONL log."""
+
+import json
+import os
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+
+# Offset that turns time.monotonic() values into Unix time for this process
+_EPOCH_OFFSET = time.time() - time.monotonic()
+
+# Value names per mode, in the order they are stored
+FIELDS = {
+    "ruler": ("distance", "angle"),
+    "polygon": ("perimeter", "area"),
+    "angle": ("angle", "arm1", "arm2"),
+}
+
+
+class HistoryRecord:
+    """One copied measurement: mode, unit, monotonic time and raw pixel values."""
+
+    __slots__ = ("mode", "unit", "t", "values")
+
+    def __init__(self, mode, unit, t, values):
+        self.mode = mode
+        self.unit = unit
+        self.t = t              # time.monotonic() seconds
+        self.values = values    # tuple of floats, names in FIELDS[mode]
+
+    @property
+    def timestamp(self):
+        """Wall-clock time as a datetime (formatted only when asked for)."""
+        return datetime.fromtimestamp(self.t + _EPOCH_OFFSET)
+
+    def get(self, name, default=None):
+        names = FIELDS.get(self.mode, ())
+        return self.values[names.index(name)] if name in names else default
+
+    def as_dict(self):
+        """Dict in the shape of the old in-memory history entries."""
+        d = dict(zip(FIELDS.get(self.mode, ()), self.values))
+        d.update(unit=self.unit, mode=self.mode, time=self.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
+        return d
+
+    def to_json(self):
+        return json.dumps({"t": round(self.t + _EPOCH_OFFSET, 3), "mode": self.mode,
+                           "unit": self.unit, "v": list(self.values)}, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line):
+        d = json.loads(line)
+        return cls(d["mode"], d["unit"], float(d["t"]) - _EPOCH_OFFSET, tuple(d["v"]))
+
+
+class MeasurementHistory:
+    """Recent measurements in a ring buffer, all of them in a JSONL log.
+
+    ``add`` stores a record in memory (the newest ``capacity`` are kept) and
+    queues it for the log; queued lines are appended in one write once
+    ``batch_size`` accumulate or ``flush()`` is called. ``iter_log`` streams
+    the whole log line by line, so long sessions can be filtered without
+    loading them. The ring buffer is seeded lazily from the tail of the log.
+    """
+
+    # Bytes read from the end of the log per expected record when seeding
+    TAIL_BYTES_PER_RECORD = 160
+
+    def __init__(self, path, capacity=1000, batch_size=32):
+        self.path = path
+        self.capacity = max(1, int(capacity))
+        self.batch_size = max(1, int(batch_size))
+        self._ring = deque(maxlen=self.capacity)
+        self._pending = []
+        self._loaded = False
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._ring)
+
+    def __iter__(self):
+        """Records in the ring buffer, oldest first."""
+        self._ensure_loaded()
+        return iter(tuple(self._ring))
+
+    def recent(self, count):
+        """The newest ``count`` records, newest first."""
+        self._ensure_loaded()
+        result = []
+        for record in reversed(self._ring):
+            if len(result) >= count:
+                break
+            result.append(record)
+        return result
+
+    def add(self, mode, unit, *values):
+        self._ensure_loaded()
+        record = HistoryRecord(mode, unit, time.monotonic(), tuple(float(v) for v in values))
+        self._ring.append(record)
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return record
+
+    @property
+    def unsaved(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Append queued records to the log in one write."""
+        if not self._pending:
+            return
+        lines = "".join(record.to_json() + "\n" for record in self._pending)
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"Warning: Could not write measurement history: {e}")
+            return
+        self._pending = []
+
+    def iter_log(self, mode=None, since=None, until=None):
+        """Stream records from the log (plus unsaved ones), oldest first.
+
+        ``since``/``until`` are datetimes; ``mode`` filters by measurement mode.
+        The log size and the unsaved records are captured when this is
+        called, not when iteration starts, so the iterator can be consumed
+        on another thread while ``add``/``flush`` carry on: it reads the file
+        only up to that size, then yields the captured unsaved records, and
+        sees every record exactly once.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return self._read_log(size, tuple(self._pending), mode, since, until)
+
+    def _read_log(self, size, pending, mode, since, until):
+        lo = since.timestamp() - _EPOCH_OFFSET if since else None
+        hi = until.timestamp() - _EPOCH_OFFSET if until else None
+
+        def wanted(record):
+            return ((mode is None or record.mode == mode)
+                    and (lo is None or record.t >= lo)
+                    and (hi is None or record.t <= hi))
+
+        if size:
+            try:
+                with open(self.path, "rb") as f:
+                    offset = 0
+                    for line in f:
+                        offset += len(line)
+                        if offset > size:
+                            break  # appended after the snapshot
+                        try:
+                            record = HistoryRecord.from_json(line.decode("utf-8"))
+                        except (ValueError, KeyError, TypeError):
+                            continue  # skip a torn or hand-edited line
+                        if wanted(record):
+                            yield record
+            except FileNotFoundError:
+                pass
+        for record in pending:
+            if wanted(record):
+                yield record
+
+    def clear(self):
+        """Forget the in-memory records (the log is left untouched)."""
+        self.flush()
+        self._ring.clear()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            size = os.path.getsize(self.path)
+            with open(self.path, "rb") as f:
+                start = max(0, size - self.capacity * self.TAIL_BYTES_PER_RECORD)
+                f.seek(start)
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        if start > 0 and lines:
+            lines = lines[1:]  # first line is probably cut in half
+        for line in lines:
+            try:
+                self._ring.append(HistoryRecord.from_json(line))
+            except (ValueError, KeyError, TypeError):
+                continue
+
+
+class HistoryTable:
+    """Filtered, sorted row order over a large list of records.
+
+    Built for a virtual list: ``rows`` holds record positions in display
+    order and only the visible slice is ever formatted. Records are kept in
+    time order, with per-record mode/unit codes and a time column, so a
+    filter is a bisect on time plus a pass over small integer arrays.
+    Orders for the other sort columns are computed once and reused; new
+    records are merged into them instead of sorting everything again. The
+    "value" column sorts by mode first: its first value is a distance, a
+    perimeter or an angle depending on the mode.
+    """
+
+    # Batches up to this size are inserted one by one; larger ones are merged
+    INSERT_LIMIT = 64
+
+    COLUMNS = ("mode", "value", "unit", "time")
+
+    def __init__(self, records=()):
+        self._orders = {}  # column -> ([(key, position), ...] sorted, positions in that order)
+        self._reindex(records)
+        self.sort_column = "time"
+        self.descending = True
+        self.filters = {"mode": None, "unit": None, "since": None}
+        self.rows = []
+        self.refresh()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, index):
+        return self.records[self.rows[index]]
+
+    def modes(self):
+        return sorted(self._codes["mode"])
+
+    def units(self):
+        return sorted(self._codes["unit"])
+
+    def append(self, record):
+        """Add a new (newest) record and refresh the row order."""
+        self.extend((record,))
+
+    def extend(self, records):
+        """Add records (normally oldest first, newer than those held) and refresh once."""
+        records = list(records)
+        if not records:
+            return
+        previous = self._times[-1] if self._times else None
+        for record in records:
+            if previous is not None and record.t < previous:
+                self._reindex(self.records + records)  # clock went backwards
+                break
+            previous = record.t
+        else:
+            start = len(self.records)
+            self.records.extend(records)
+            for record in records:
+                self._index(record)
+            for column in self._orders:
+                self._merge(column, start)
+        self.refresh()
+
+    def set_filter(self, mode=None, unit=None, since=None):
+        """Keep rows matching ``mode``/``unit`` (None = any) newer than ``since`` (datetime)."""
+        self.filters = {"mode": mode, "unit": unit, "since": since}
+        self.refresh()
+
+    def sort_by(self, column, descending=None):
+        """Sort by ``column``; calling again with the same column flips the direction."""
+        if column not in self.COLUMNS:
+            raise ValueError(f"Unknown history column: {column}")
+        if descending is None:
+            descending = not self.descending if column == self.sort_column else column == "time"
+        self.sort_column = column
+        self.descending = descending
+        self.refresh()
+
+    def refresh(self):
+        start = 0
+        since = self.filters["since"]
+        if since is not None:
+            start = bisect_left(self._times, since.timestamp() - _EPOCH_OFFSET)
+        mode_code = self._lookup("mode", self.filters["mode"])
+        unit_code = self._lookup("unit", self.filters["unit"])
+        if mode_code == -1 or unit_code == -1:
+            self.rows = []
+            return
+        if start == 0 and mode_code is None and unit_code is None:
+            # Unfiltered: the cached order is the row order
+            if self.sort_column == "time":
+                selected = list(range(len(self.records)))
+            else:
+                selected = list(self._order(self.sort_column))
+            if self.descending:
+                selected.reverse()
+            self.rows = selected
+            return
+        modes, units = self._mode_codes, self._unit_codes
+        selected = [i for i in range(start, len(self.records))
+                    if (mode_code is None or modes[i] == mode_code)
+                    and (unit_code is None or units[i] == unit_code)]
+        if self.sort_column != "time":
+            keep = bytearray(len(self.records))
+            for i in selected:
+                keep[i] = 1
+            selected = [i for i in self._order(self.sort_column) if keep[i]]
+        if self.descending:
+            selected.reverse()
+        self.rows = selected
+
+    def _reindex(self, records):
+        self.records = sorted(records, key=lambda record: record.t)
+        self._times = array("d")
+        self._mode_codes = array("H")
+        self._unit_codes = array("H")
+        self._codes = {"mode": {}, "unit": {}}
+        self._orders.clear()
+        for record in self.records:
+            self._index(record)
+
+    def _index(self, record):
+        self._times.append(record.t)
+        self._mode_codes.append(self._code("mode", record.mode))
+        self._unit_codes.append(self._code("unit", record.unit))
+
+    def _code(self, kind, value):
+        codes = self._codes[kind]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _lookup(self, kind, value):
+        """Code for a filter value: None = no filter, -1 = value never seen."""
+        if value is None:
+            return None
+        return self._codes[kind].get(value, -1)
+
+    def _order(self, column):
+        """Record positions sorted by ``column`` (ties keep time order)."""
+        order = self._orders.get(column)
+        if order is None:
+            key = self._sort_key(column)
+            entries = sorted((key(record), i) for i, record in enumerate(self.records))
+            order = self._orders[column] = (entries, [i for _, i in entries])
+        return order[1]
+
+    def _merge(self, column, start):
+        """Add records from position ``start`` on to the cached order for ``column``."""
+        entries, positions = self._orders[column]
+        key, records = self._sort_key(column), self.records
+        if len(records) - start <= self.INSERT_LIMIT:
+            for i in range(start, len(records)):
+                entry = (key(records[i]), i)
+                at = bisect_left(entries, entry)
+                entries.insert(at, entry)
+                positions.insert(at, i)
+        else:
+            # Splice the sorted batch in between slices of the old order
+            merged, order, done = [], [], 0
+            for entry in sorted((key(records[i]), i) for i in range(start, len(records))):
+                at = bisect_left(entries, entry, done)
+                merged += entries[done:at]
+                order += positions[done:at]
+                merged.append(entry)
+                order.append(entry[1])
+                done = at
+            merged += entries[done:]
+            order += positions[done:]
+            self._orders[column] = (merged, order)
+
+    @staticmethod
+    def _sort_key(column):
+        if column == "value":
+            return lambda record: (record.mode, record.values[0] if record.values else 0.0)
+        return lambda record: getattr(record, column)
@@ -0,0 +1,162 @@
+"""Magnifier loupe: a small window with zoomed screen pixels around a point."""
+
+import math
+import tkinter as tk
+
+
+class Loupe:
+    """Zoomed view of captured pixels around a moving target, on its own timer.
+
+    ``target()`` returns the virtual-screen point to magnify (None hides the
+    loupe), ``grab(x, y, radius)`` a CaptureFrame covering that many pixels
+    around (x, y) or None, and ``label()`` the text shown under the view.
+    They are polled every ``interval`` ms, so the loupe never runs inside a
+    mouse handler and drops intermediate positions instead of queuing them.
+
+    The pixels go into a small PhotoImage of ``span`` x ``span`` pixels that
+    is copied, zoomed, into the displayed one; both images are created once
+    and rewritten in place. Nothing is redrawn while the target pixel and
+    the captured frame are unchanged.
+    """
+
+    BORDER = "#00FFFF"
+    OFFSET = 28  # gap (px) between the target and the window
+
+    def __init__(self, root, target, grab, label, desktop, size=168, zoom=8, interval=33):
+        self.root = root
+        self.target = target
+        self.grab = grab
+        self.label = label
+        self.desktop = desktop  # (x, y, w, h) of the virtual desktop on screen
+        self.interval = max(10, int(interval))
+        self.visible = False
+        self.renders = 0
+        self._after_id = None
+        self._frame = None
+        self._pixel = None
+        self._text = None
+        self._position = None
+        self._ppm = True  # Tk accepts binary PPM for "put"; colour lists otherwise
+
+        self.window = tk.Toplevel(root)
+        self.window.overrideredirect(True)
+        self.window.attributes('-topmost', True)
+        self.window.withdraw()
+        self.canvas = tk.Canvas(self.window, bg="black", highlightthickness=1,
+                                highlightbackground=self.BORDER, bd=0)
+        self.canvas.pack()
+        self._source = None
+        self._zoomed = None
+        self.configure(size, zoom)
+
+    @property
+    def radius(self):
+        return self.span // 2
+
+    def configure(self, size, zoom):
+        """(Re)build the images and the crosshair for a view ``size`` px wide at ``zoom``x."""
+        self.size = int(size)
+        self.zoom = max(2, int(zoom))
+        # Odd span so the target pixel sits in the middle cell
+        self.span = max(3, int(size) // self.zoom) | 1
+        side = self.span * self.zoom
+        self.canvas.delete("all")
+        self.canvas.configure(width=side, height=side + 18)
+        self._source = tk.PhotoImage(master=self.window, width=self.span, height=self.span)
+        self._zoomed = tk.PhotoImage(master=self.window, width=side, height=side)
+        self.canvas.create_image(0, 0, anchor="nw", image=self._zoomed)
+
+        cell = self.radius * self.zoom
+        mid = cell + self.zoom / 2
+        for coords in ((0, mid, cell, mid), (cell + self.zoom, mid, side, mid),
+                       (mid, 0, mid, cell), (mid, cell + self.zoom, mid, side)):
+            self.canvas.create_line(*coords, fill=self.BORDER)
+        self.canvas.create_rectangle(cell, cell, cell + self.zoom, cell + self.zoom, outline="#FF2D55")
+        self.canvas.create_rectangle(0, side, side, side + 18, fill="#202020", outline="")
+        self._label_item = self.canvas.create_text(side / 2, side + 9, fill="#FFFFFF",
+                                                   font=("Segoe UI", 8, "bold"))
+        self._frame = self._pixel = self._text = None
+
+    def show(self):
+        """Start following the target (cheap to call on every drag event)."""
+        if self.visible:
+            return
+        self.visible = True
+        self._tick()
+
+    def hide(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.visible:
+            self.visible = False
+            self.window.withdraw()
+            self._position = None
+        self._frame = None
+
+    def destroy(self):
+        self.hide()
+        self.window.destroy()
+
+    def _tick(self):
+        self._after_id = None
+        if not self.visible:
+            return
+        point = self.target()
+        if point is None:
+            self.hide()
+            return
+        x, y = math.floor(point[0]), math.floor(point[1])
+        frame = self.grab(x, y, self.radius + 1)
+        if frame is not None and (frame is not self._frame or (x, y) != self._pixel):
+            self._render(frame, x, y)
+        self._place(x, y)
+        text = self.label()
+        if text != self._text:
+            self.canvas.itemconfigure(self._label_item, text=text)
+            self._text = text
+        self._after_id = self.root.after(self.interval, self._tick)
+
+    def _render(self, frame, x, y):
+        r, span = self.radius, self.span
+        left, top = x - r - frame.left, y - r - frame.top
+        if left < 0 or top < 0 or left + span > frame.width or top + span > frame.height:
+            return
+        data, stride = frame.data, frame.width * 3
+        start = top * stride + left * 3
+        pixels = b"".join(data[row:row + span * 3]
+                          for row in range(start, start + span * stride, stride))
+        if self._ppm:
+            try:
+                header = b"P6 %d %d 255\n" % (span, span)
+                self.window.tk.call(self._source, "put", header + pixels, "-format", "ppm")
+            except tk.TclError:
+                self._ppm = False
+        if not self._ppm:
+            rows = []
+            for i in range(0, len(pixels), span * 3):
+                row = pixels[i:i + span * 3]
+                rows.append("{" + " ".join("#%02x%02x%02x" % tuple(row[j:j + 3])
+                                           for j in range(0, span * 3, 3)) + "}")
+            self._source.put(" ".join(rows))
+        self.window.tk.call(self._zoomed, "copy", self._source, "-zoom", self.zoom, self.zoom)
+        self._frame, self._pixel = frame, (x, y)
+        self.renders += 1
+
+    def _place(self, x, y):
+        side = self.span * self.zoom + 2
+        height = side + 18
+        left, top, width, full_height = self.desktop
+        # Below-right of the target, flipped where it would leave the desktop
+        wx = x + self.OFFSET
+        if wx + side > left + width:
+            wx = x - self.OFFSET - side
+        wy = y + self.OFFSET
+        if wy + height > top + full_height:
+            wy = y - self.OFFSET - height
+        if (wx, wy) != self._position:
+            self.window.geometry(f"+{wx}+{wy}")
+            if self._position is None:
+                self.window.deiconify()
+                self.window.lift()
+            self._position = (wx, wy)
@@ -0,0 +1,272 @@
+"""Cached monitor layout and per-monitor DPI lookups."""
+
+import bisect
+import ctypes
+import math
+
+DEFAULT_DPI = 96.0
+
+
+class Monitor:
+    """One display in virtual-screen coordinates."""
+
+    __slots__ = ("left", "top", "right", "bottom", "dpi", "primary")
+
+    def __init__(self, left, top, right, bottom, dpi=DEFAULT_DPI, primary=False):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+        self.dpi = float(dpi)
+        self.primary = primary
+
+    @property
+    def rect(self):
+        return (self.left, self.top, self.right, self.bottom)
+
+    def contains(self, x, y):
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+    def __repr__(self):
+        return f"Monitor({self.left}, {self.top}, {self.right}, {self.bottom}, dpi={self.dpi:g})"
+
+
+def _segment_span(x1, y1, x2, y2, rect):
+    """Parameter range (t0, t1) within [0, 1] of the segment inside ``rect``, or None."""
+    left, top, right, bottom = rect
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - left), (dx, right - x1), (-dy, y1 - top), (dy, bottom - y1)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        r = q / p
+        if p < 0:
+            t0 = max(t0, r)
+        else:
+            t1 = min(t1, r)
+        if t0 >= t1:
+            return None
+    return t0, t1
+
+
+class _RECT(ctypes.Structure):
+    _fields_ = [("left", ctypes.c_long), ("top", ctypes.c_long),
+                ("right", ctypes.c_long), ("bottom", ctypes.c_long)]
+
+
+class _MONITORINFO(ctypes.Structure):
+    _fields_ = [("cbSize", ctypes.c_ulong), ("rcMonitor", _RECT),
+                ("rcWork", _RECT), ("dwFlags", ctypes.c_ulong)]
+
+
+def _enum_windows_monitors():
+    """List monitors through the Win32 API (raises off Windows)."""
+    user32 = ctypes.windll.user32
+    try:
+        shcore = ctypes.windll.shcore
+    except Exception:
+        shcore = None
+
+    monitors = []
+    proc_type = ctypes.WINFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p,
+                                   ctypes.POINTER(_RECT), ctypes.c_void_p)
+
+    def callback(hmonitor, hdc, lprect, lparam):
+        info = _MONITORINFO()
+        info.cbSize = ctypes.sizeof(_MONITORINFO)
+        if not user32.GetMonitorInfoW(ctypes.c_void_p(hmonitor), ctypes.byref(info)):
+            return 1
+        dpi = DEFAULT_DPI
+        if shcore is not None:
+            dpi_x, dpi_y = ctypes.c_uint(), ctypes.c_uint()
+            MDT_EFFECTIVE_DPI = 0
+            try:
+                if shcore.GetDpiForMonitor(ctypes.c_void_p(hmonitor), MDT_EFFECTIVE_DPI,
+                                           ctypes.byref(dpi_x), ctypes.byref(dpi_y)) == 0 and dpi_x.value:
+                    dpi = float(dpi_x.value)
+            except Exception:
+                pass
+        rc = info.rcMonitor
+        MONITORINFOF_PRIMARY = 1
+        monitors.append(Monitor(rc.left, rc.top, rc.right, rc.bottom, dpi,
+                                bool(info.dwFlags & MONITORINFOF_PRIMARY)))
+        return 1
+
+    user32.EnumDisplayMonitors(None, None, proc_type(callback), 0)
+    return monitors
+
+
+def _window_dpi(hwnd):
+    """Best-effort DPI for a window: per-monitor, then system, then 96."""
+    # Windows 10+: per-monitor DPI
+    try:
+        dpi = ctypes.windll.user32.GetDpiForWindow(hwnd)
+        if dpi:
+            return float(dpi)
+    except Exception:
+        pass
+
+    # Fallback: system DPI
+    try:
+        LOGPIXELSX = 88
+        hdc = ctypes.windll.user32.GetDC(0)
+        dpi = ctypes.windll.gdi32.GetDeviceCaps(hdc, LOGPIXELSX)
+        ctypes.windll.user32.ReleaseDC(0, hdc)
+        if dpi:
+            return float(dpi)
+    except Exception:
+        pass
+
+    return DEFAULT_DPI
+
+
+class MonitorTopology:
+    """Monitor rectangles and DPI, cached until the display layout changes.
+
+    Lookups never touch the OS: ``dpi_at`` answers from a slab index built
+    at refresh time (binary search on x, then on y). ``poll`` is a cheap
+    signature probe meant to run every few seconds; it refreshes the cache
+    only when the layout or DPI actually changed. Off Windows the topology
+    is a single monitor of ``fallback_size()`` at 96 DPI.
+    """
+
+    def __init__(self, hwnd=None, fallback_size=None, enumerate_monitors=None):
+        self.hwnd = hwnd
+        self.fallback_size = fallback_size
+        self._enumerate = enumerate_monitors or _enum_windows_monitors
+        self.monitors = []
+        self.window_dpi = DEFAULT_DPI
+        self.refreshes = 0
+        self._signature = None
+        self._xs = []      # slab boundaries on x
+        self._slabs = []   # per slab: (tops, monitors) sorted by top
+        self.refresh()
+
+    # --- Cache maintenance ---
+    def refresh(self):
+        """Re-read monitors and DPI from the OS and rebuild the index."""
+        try:
+            monitors = self._enumerate()
+        except Exception:
+            monitors = []
+        if not monitors:
+            w, h = self._fallback_size()
+            monitors = [Monitor(0, 0, w, h, DEFAULT_DPI, primary=True)]
+
+        self.monitors = monitors
+        self.window_dpi = _window_dpi(self.hwnd) if self.hwnd is not None else self.primary.dpi
+        # Common case: one DPI everywhere, so lengths need no per-monitor split
+        self.uniform_dpi = len({m.dpi for m in monitors}) == 1
+        self._build_index()
+        self._signature = self._probe()
+        self.refreshes += 1
+
+    def invalidate(self):
+        """Force a refresh (display-change / DPI-change notification)."""
+        self.refresh()
+
+    def poll(self):
+        """Refresh if the display layout changed; returns True when it did."""
+        if self._probe() != self._signature:
+            self.refresh()
+            return True
+        return False
+
+    def _fallback_size(self):
+        try:
+            w, h = self.fallback_size()
+            return int(w), int(h)
+        except Exception:
+            return 1920, 1080
+
+    def _probe(self):
+        """Cheap fingerprint of the display configuration."""
+        try:
+            user32 = ctypes.windll.user32
+            SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN = 76, 77
+            SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN = 78, 79
+            SM_CMONITORS = 80
+            metrics = tuple(int(user32.GetSystemMetrics(i)) for i in (
+                SM_CMONITORS, SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN,
+                SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN))
+            dpi = _window_dpi(self.hwnd) if self.hwnd is not None else None
+            return metrics + (dpi,)
+        except Exception:
+            return self._fallback_size()
+
+    def _build_index(self):
+        xs = sorted({m.left for m in self.monitors} | {m.right for m in self.monitors})
+        slabs = []
+        for left, right in zip(xs, xs[1:]):
+            covering = sorted((m for m in self.monitors if m.left <= left and m.right >= right),
+                              key=lambda m: m.top)
+            slabs.append(([m.top for m in covering], covering))
+        self._xs = xs
+        self._slabs = slabs
+
+    # --- Queries ---
+    @property
+    def primary(self):
+        for m in self.monitors:
+            if m.primary:
+                return m
+        return self.monitors[0]
+
+    @property
+    def bounds(self):
+        """Bounding rectangle of all monitors."""
+        return (min(m.left for m in self.monitors), min(m.top for m in self.monitors),
+                max(m.right for m in self.monitors), max(m.bottom for m in self.monitors))
+
+    def monitor_at(self, x, y):
+        """Monitor containing (x, y) in virtual-screen coordinates, or None."""
+        j = bisect.bisect_right(self._xs, x) - 1
+        if j < 0 or j >= len(self._slabs):
+            return None
+        tops, covering = self._slabs[j]
+        k = bisect.bisect_right(tops, y) - 1
+        if k >= 0 and y < covering[k].bottom:
+            return covering[k]
+        return None
+
+    def dpi_at(self, x, y):
+        """DPI at (x, y); points off every monitor use the primary monitor."""
+        monitor = self.monitor_at(x, y)
+        return (monitor or self.primary).dpi
+
+    def split_segment(self, x1, y1, x2, y2):
+        """Split a segment by monitor: [(dpi, t0, t1), ...] in order along it.
+
+        ``t`` is the fraction of the way from (x1, y1) to (x2, y2). Only the
+        monitors the segment crosses contribute pieces; stretches that lie on
+        no monitor use the primary monitor's DPI (as ``dpi_at`` does).
+        """
+        pieces = []
+        for monitor in self.monitors:
+            span = _segment_span(x1, y1, x2, y2, monitor.rect)
+            if span is not None:
+                pieces.append((span[0], span[1], monitor.dpi))
+        pieces.sort()
+        result = []
+        t = 0.0
+        fallback = self.primary.dpi
+        for t0, t1, dpi in pieces:
+            if t1 <= t:
+                continue  # overlapping (mirrored) monitors: first one wins
+            if t0 > t:
+                result.append((fallback, t, t0))
+            result.append((dpi, max(t, t0), t1))
+            t = t1
+        if t < 1.0:
+            result.append((fallback, t, 1.0))
+        return result
+
+    def scaled_length(self, x1, y1, x2, y2, ref_dpi):
+        """Length of a segment in pixels at ``ref_dpi``, summed per monitor piece."""
+        length = math.hypot(x2 - x1, y2 - y1)
+        if self.uniform_dpi:
+            return length * ref_dpi / self.monitors[0].dpi
+        return sum((t1 - t0) * length * ref_dpi / dpi
+                   for dpi, t0, t1 in self.split_segment(x1, y1, x2, y2))
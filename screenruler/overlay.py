@@ -0,0 +1,67 @@
+"""Overlay window geometry: whole virtual desktop or a compact box around the tool."""
+
+
+class OverlayViewport:
+    """Size and place the overlay window, keeping canvas coordinates fixed.
+
+    Items are always drawn in desktop canvas coordinates (0, 0 is the
+    top-left of the virtual desktop). In compact mode the window only covers
+    ``rect`` and the canvas scroll region is set to the same rectangle, so
+    the visible part lines up without moving any item; ``canvasx/canvasy``
+    translate event coordinates back. Rectangles are padded by ``margin``
+    and snapped outward to ``step`` pixels so small moves do not resize
+    the window every frame.
+    """
+
+    def __init__(self, root, canvas, desktop, margin=80, step=64):
+        self.root = root
+        self.canvas = canvas
+        self.desktop = desktop  # (x, y, w, h) of the virtual desktop on screen
+        self.margin = margin
+        self.step = max(1, int(step))
+        self.rect = None        # (left, top, right, bottom) in canvas coordinates
+        self.resizes = 0
+
+    @property
+    def full_rect(self):
+        return (0, 0, self.desktop[2], self.desktop[3])
+
+    @property
+    def compact(self):
+        return self.rect is not None and self.rect != self.full_rect
+
+    def show_full(self):
+        return self._apply(self.full_rect)
+
+    def fit(self, bounds, grow_only=False):
+        """Cover ``bounds`` (left, top, right, bottom) plus the margin.
+
+        With ``grow_only`` the window never shrinks (used while dragging so
+        the pointer is not left outside it). Returns True if it changed.
+        """
+        left, top, right, bottom = bounds
+        step, margin = self.step, self.margin
+        full_w, full_h = self.desktop[2], self.desktop[3]
+        rect = (max(0, int(left - margin) // step * step),
+                max(0, int(top - margin) // step * step),
+                min(full_w, -(-int(right + margin) // step) * step),
+                min(full_h, -(-int(bottom + margin) // step) * step))
+        if rect[2] <= rect[0] or rect[3] <= rect[1]:
+            rect = self.full_rect  # tool is entirely off the desktop
+        if grow_only and self.rect is not None:
+            rect = (min(rect[0], self.rect[0]), min(rect[1], self.rect[1]),
+                    max(rect[2], self.rect[2]), max(rect[3], self.rect[3]))
+        return self._apply(rect)
+
+    def _apply(self, rect):
+        if rect == self.rect:
+            return False
+        left, top, right, bottom = rect
+        width, height = right - left, bottom - top
+        self.root.geometry(f"{width}x{height}+{self.desktop[0] + left}+{self.desktop[1] + top}")
+        self.canvas.configure(width=width, height=height, scrollregion=rect)
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.rect = rect
+        self.resizes += 1
+        return True
@@ -0,0 +1,129 @@
+"""Lightweight frame-time instrumentation for the overlay."""
+
+import functools
+import json
+from collections import deque
+from time import perf_counter
+
+
+class _NullPhase:
+    """Context manager that does nothing (used while recording is off)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_recorder", "_name", "_start")
+
+    def __init__(self, recorder, name):
+        self._recorder = recorder
+        self._name = name
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._recorder.record(self._name, perf_counter() - self._start)
+        return False
+
+
+class PerfRecorder:
+    """Rolling per-phase timings with percentile summaries.
+
+    ``phase(name)`` returns a context manager that records the elapsed time
+    of its block. While ``enabled`` is False it hands back a shared no-op
+    object, so instrumented code pays one attribute check per phase.
+    Each phase keeps the last ``window`` samples; ``stats`` reports
+    p50/p95/p99/max in milliseconds over that window.
+    """
+
+    def __init__(self, window=512):
+        self.window = max(1, int(window))
+        self.enabled = False
+        self._samples = {}  # phase name -> deque of seconds
+        self._counts = {}   # phase name -> total samples since reset
+        self.gauges = {}    # name -> last reported value (e.g. canvas item counts)
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, seconds):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+            self._counts[name] = 0
+        samples.append(seconds)
+        self._counts[name] += 1
+
+    def gauge(self, name, value):
+        """Remember the latest value of a non-timing metric."""
+        if self.enabled:
+            self.gauges[name] = value
+
+    def reset(self):
+        self._samples.clear()
+        self._counts.clear()
+        self.gauges.clear()
+
+    def stats(self):
+        """{phase: {"count", "p50", "p95", "p99", "max"}} with times in ms."""
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+            result[name] = {
+                "count": self._counts[name],
+                "p50": ordered[round(0.50 * last)] * 1000.0,
+                "p95": ordered[round(0.95 * last)] * 1000.0,
+                "p99": ordered[round(0.99 * last)] * 1000.0,
+                "max": ordered[last] * 1000.0,
+            }
+        return result
+
+    def summary_lines(self, order=()):
+        """Fixed-width text lines for an on-screen HUD."""
+        stats = self.stats()
+        names = [name for name in order if name in stats]
+        names += sorted(set(stats) - set(names))
+        lines = [f"{'phase':<14}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name in names:
+            s = stats[name]
+            lines.append(f"{name:<14}{s['p50']:7.2f}{s['p95']:7.2f}{s['p99']:7.2f}")
+        if self.gauges:
+            lines.append("  ".join(f"{name}={value}" for name, value in sorted(self.gauges.items())))
+        return lines
+
+    def to_json(self, extra=None):
+        payload = {"phases": self.stats(), "gauges": dict(self.gauges), "window": self.window}
+        if extra:
+            payload.update(extra)
+        return json.dumps(payload, indent=2, sort_keys=True)
+
+
+def timed(name):
+    """Method decorator recording the call under ``name`` in ``self.perf``."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            perf = self.perf
+            if not perf.enabled:
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                perf.record(name, perf_counter() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,121 @@
+"""Write-behind JSON persistence for the settings file."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class WriteBehindWriter:
+    """Coalesce saves and write them atomically on a background thread.
+
+    ``schedule(data)`` takes a shallow snapshot on the caller's thread and
+    returns immediately. The worker writes the newest snapshot at most
+    ``delay`` seconds after the first unsaved change, so a burst of saves
+    (e.g. a slider drag) becomes one write. Content identical to what is
+    already on disk is not rewritten. ``flush()`` writes any pending
+    snapshot synchronously; call it (and ``close()``) on shutdown.
+    Snapshots are numbered, so one that loses a race to a newer one (worker
+    vs ``flush()``) is dropped instead of overwriting it.
+    """
+
+    def __init__(self, path, delay=0.5, indent=2):
+        self.path = path
+        self.delay = max(0.0, float(delay))
+        self.indent = indent
+        self.writes = 0
+        self.skipped = 0     # snapshots identical to the file on disk
+        self.coalesced = 0   # snapshots replaced before they were written
+        self._pending = None  # (sequence, snapshot)
+        self._sequence = 0
+        self._written = 0     # sequence of the newest snapshot written (or skipped)
+        self._deadline = None
+        self._closed = False
+        self._last_digest = self._file_digest()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+        self._thread.start()
+
+    def schedule(self, data):
+        """Queue ``data`` (a dict) to be written; returns without touching disk."""
+        snapshot = dict(data)
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self.coalesced += 1
+            else:
+                self._deadline = time.monotonic() + self.delay
+            self._sequence += 1
+            self._pending = (self._sequence, snapshot)
+            self._cond.notify()
+
+    def flush(self):
+        """Write the pending snapshot now, on the calling thread."""
+        with self._cond:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._write(*pending)
+
+    def close(self):
+        """Flush and stop the worker thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=2.0)
+
+    def stats(self):
+        return {"writes": self.writes, "skipped": self.skipped, "coalesced": self.coalesced}
+
+    # --- Worker ---
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._pending is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                pending, self._pending = self._pending, None
+            self._write(*pending)
+
+    def _write(self, sequence, snapshot):
+        # One writer at a time: flush() may race the worker
+        with self._write_lock:
+            if sequence <= self._written:
+                self.skipped += 1
+                return  # a newer snapshot is already on disk
+            self._written = sequence
+            try:
+                payload = json.dumps(snapshot, indent=self.indent, ensure_ascii=False).encode("utf-8")
+            except (TypeError, ValueError) as e:
+                print(f"Warning: Could not serialize settings: {e}")
+                return
+            digest = hashlib.sha1(payload).hexdigest()
+            if digest == self._last_digest:
+                self.skipped += 1
+                return
+            tmp_path = self.path + ".tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                # Avoid crashing on transient I/O issues; the next save retries.
+                print(f"Warning: Could not save settings: {e}")
+                return
+            self._last_digest = digest
+            self.writes += 1
+
+    def _file_digest(self):
+        try:
+            with open(self.path, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
@@ -0,0 +1,105 @@
+"""Retained-mode drawing layer for the overlay canvas."""
+
+
+class RetainedScene:
+    """Keep canvas items alive between frames and update them in place.
+
+    Draw code asks for items by role ("guides", "body", "ticks", "labels",
+    "handles") in the same order every frame. Items left over from the
+    previous frame are moved with ``coords`` and only reconfigured when their
+    options changed; new items are created only when a role needs more of them
+    than last frame, and surplus items are deleted in ``end_frame``.
+    """
+
+    # Stacking order, bottom to top. Roles not listed are stacked above these.
+    ROLE_ORDER = ("guides", "body", "ticks", "labels", "handles")
+
+    def __init__(self, canvas, role_order=None):
+        self.canvas = canvas
+        self.role_order = tuple(role_order or self.ROLE_ORDER)
+        self._pools = {}    # (role, kind) -> [item id, ...]
+        self._used = {}     # (role, kind) -> items used in the current frame
+        self._coords = {}   # item id -> coords last applied
+        self._options = {}  # item id -> options last applied
+        self._created = False
+
+    def begin_frame(self):
+        """Start a new frame; every pooled item becomes available again."""
+        self._used = dict.fromkeys(self._pools, 0)
+        self._created = False
+
+    def end_frame(self):
+        """Delete items that were not used this frame and fix stacking order."""
+        for key, pool in self._pools.items():
+            used = self._used.get(key, 0)
+            if used < len(pool):
+                surplus = pool[used:]
+                del pool[used:]
+                self.canvas.delete(*surplus)
+                for item in surplus:
+                    self._coords.pop(item, None)
+                    self._options.pop(item, None)
+
+        if self._created:
+            present = {role for role, _ in self._pools}
+            roles = [role for role in self.role_order if role in present]
+            roles += sorted(present - set(self.role_order))
+            for role in roles:
+                self.canvas.tag_raise(role)
+            self._created = False
+
+    def reset(self):
+        """Forget every pooled item and clear the canvas."""
+        self.canvas.delete("all")
+        self._pools.clear()
+        self._used.clear()
+        self._coords.clear()
+        self._options.clear()
+        self._created = False
+
+    def item_count(self, role=None):
+        """Return the number of live items, optionally for a single role."""
+        return sum(len(pool) for (r, _), pool in self._pools.items()
+                   if role is None or r == role)
+
+    def line(self, role, *coords, **options):
+        return self._item("line", role, coords, options)
+
+    def oval(self, role, *coords, **options):
+        return self._item("oval", role, coords, options)
+
+    def arc(self, role, *coords, **options):
+        return self._item("arc", role, coords, options)
+
+    def text(self, role, *coords, **options):
+        return self._item("text", role, coords, options)
+
+    def rectangle(self, role, *coords, **options):
+        return self._item("rectangle", role, coords, options)
+
+    def _item(self, kind, role, coords, options):
+        """Return the next item of ``kind`` for ``role``, creating it if needed."""
+        key = (role, kind)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = []
+        index = self._used.get(key, 0)
+        self._used[key] = index + 1
+
+        if index < len(pool):
+            item = pool[index]
+            if self._coords.get(item) != coords:
+                self.canvas.coords(item, *coords)
+                self._coords[item] = coords
+            if self._options.get(item) != options:
+                self.canvas.itemconfigure(item, **options)
+                self._options[item] = options
+            return item
+
+        create = getattr(self.canvas, "create_" + kind)
+        item = create(*coords, tags=(role,), **options)
+        pool.append(item)
+        self._coords[item] = coords
+        self._options[item] = options
+        self._created = True
+        return item
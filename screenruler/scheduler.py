@@ -0,0 +1,115 @@
+"""Frame-rate capped redraw scheduling for the overlay."""
+
+import time
+
+
+class RedrawScheduler:
+    """Coalesce redraw requests and motion events into at most one frame per tick.
+
+    Callers mark the scene dirty with ``request()`` or hand over a motion event
+    with ``post_motion()``. Only the latest pending motion event is applied, and
+    ``render`` runs at most once per frame interval via ``root.after``. A target
+    of 0 FPS means unlimited: frames run as soon as Tk is idle.
+    """
+
+    def __init__(self, root, render, fps=60):
+        self.root = root
+        self.render = render
+        self.fps = 0
+        self.frame_interval = 0.0
+        self.set_fps(fps)
+
+        self.dirty = False
+        self._after_id = None
+        self._pending_motion = None  # (handler, event)
+        self._last_frame = 0.0
+
+        # Counters, exposed for diagnostics
+        self.frames = 0           # frames actually rendered
+        self.requests = 0         # redraw requests received
+        self.dropped = 0          # requests absorbed by an already pending frame
+        self.motion_events = 0    # motion events received
+        self.coalesced = 0        # motion events superseded before being applied
+
+    def set_fps(self, fps):
+        """Set the target frame rate (0 = unlimited)."""
+        try:
+            fps = max(0, int(fps))
+        except (ValueError, TypeError):
+            fps = 60
+        self.fps = fps
+        self.frame_interval = 1.0 / fps if fps else 0.0
+
+    def request(self):
+        """Mark the scene dirty and schedule a frame."""
+        self.requests += 1
+        if self._after_id is not None:
+            self.dropped += 1
+        self.dirty = True
+        self._schedule()
+
+    def post_motion(self, handler, event):
+        """Queue ``handler(event)`` for the next frame, replacing any pending motion."""
+        self.motion_events += 1
+        if self._pending_motion is not None:
+            self.coalesced += 1
+        self._pending_motion = (handler, event)
+        self.dirty = True
+        self._schedule()
+
+    def flush(self):
+        """Run a pending frame right away (e.g. on mouse release)."""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._run()
+
+    def cancel(self):
+        """Drop any pending frame without rendering it."""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+        self._pending_motion = None
+        self.dirty = False
+
+    def stats(self):
+        """Return a snapshot of the scheduler counters."""
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "requests": self.requests,
+            "dropped": self.dropped,
+            "motion_events": self.motion_events,
+            "coalesced": self.coalesced,
+        }
+
+    def _schedule(self):
+        if self._after_id is not None:
+            return
+        if not self.frame_interval:
+            self._after_id = self.root.after_idle(self._run)
+            return
+        wait = self._last_frame + self.frame_interval - time.perf_counter()
+        self._after_id = self.root.after(max(0, int(round(wait * 1000))), self._run)
+
+    def _run(self):
+        self._after_id = None
+        self._last_frame = time.perf_counter()
+
+        motion, self._pending_motion = self._pending_motion, None
+        if motion is not None:
+            handler, event = motion
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Warning: Error applying motion event: {e}")
+
+        if self.dirty:
+            self.dirty = False
+            self.frames += 1
+            self.render()
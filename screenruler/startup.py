@@ -0,0 +1,93 @@
+"""Startup timeline: import costs and time to first frame / interactive."""
+
+import importlib
+import os
+import sys
+from time import perf_counter
+
+
+class StartupTimeline:
+    """Record named milestones and import costs relative to launch.
+
+    ``t0`` should be taken as early as possible (top of the entry script).
+    Milestones are cumulative times since ``t0``; imports record their own
+    duration, both the entry script's top-level ones (``preload``) and the
+    deferred ones (``import_module``). ``report_lines`` formats them for the
+    console, and ``to_dict`` is included in the performance JSON dump.
+    """
+
+    def __init__(self, t0=None, budget_ms=None):
+        self.t0 = perf_counter() if t0 is None else t0
+        self.budget_ms = budget_ms  # target time to first frame, if any
+        self.marks = []    # (name, ms since t0)
+        self.startup_imports = []  # (module, ms) loaded before the first frame
+        self.imports = []  # (module, ms) deferred, loaded on first use
+
+    def elapsed_ms(self):
+        return (perf_counter() - self.t0) * 1000.0
+
+    def mark(self, name):
+        self.marks.append((name, self.elapsed_ms()))
+
+    def milestone(self, name):
+        """Milliseconds since launch for ``name``, or None if not reached yet."""
+        for mark, ms in self.marks:
+            if mark == name:
+                return ms
+        return None
+
+    def import_module(self, name):
+        """Import ``name`` and record how long it took (already loaded: not recorded)."""
+        return self._timed_import(name, self.imports)
+
+    def preload(self, names):
+        """Import the entry script's top-level modules one by one, recording each cost.
+
+        Each cost includes the dependencies that module loads first; the
+        script's own import statements then find everything loaded.
+        """
+        for name in names:
+            self._timed_import(name, self.startup_imports)
+
+    def _timed_import(self, name, record):
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        start = perf_counter()
+        module = importlib.import_module(name)
+        record.append((name, (perf_counter() - start) * 1000.0))
+        return module
+
+    def over_budget(self, milestone="first frame"):
+        ms = self.milestone(milestone)
+        return self.budget_ms is not None and ms is not None and ms > self.budget_ms
+
+    def report_lines(self):
+        lines = ["Startup timeline (ms since launch):"]
+        lines += [f"  {ms:8.1f}  {name}" for name, ms in self.marks]
+        if self.startup_imports:
+            lines.append("Startup imports (ms):")
+            lines += [f"  {ms:8.1f}  {name}" for name, ms in self.startup_imports]
+        if self.imports:
+            lines.append("Deferred imports (ms):")
+            lines += [f"  {ms:8.1f}  {name}" for name, ms in self.imports]
+        if self.budget_ms is not None:
+            first = self.milestone("first frame")
+            if first is not None:
+                state = "over" if first > self.budget_ms else "within"
+                lines.append(f"First frame {state} the {self.budget_ms:.0f} ms budget")
+        return lines
+
+    def to_dict(self):
+        return {
+            "marks": {name: round(ms, 2) for name, ms in self.marks},
+            "startup_imports": {name: round(ms, 2) for name, ms in self.startup_imports},
+            "imports": {name: round(ms, 2) for name, ms in self.imports},
+            "budget_ms": self.budget_ms,
+        }
+
+
+def report_requested(argv=None):
+    """True when ``--startup-report`` or SCREENRULER_STARTUP_REPORT=1 is set."""
+    argv = sys.argv if argv is None else argv
+    return "--startup-report" in argv or os.environ.get("SCREENRULER_STARTUP_REPORT") == "1"
@@ -0,0 +1,26 @@
+"""Brute-force reference formulas shared by the tests and benchmarks/bench_core.py."""
+
+import math
+
+from screenruler.core.points import PointBuffer
+
+
+def regular_polygon(n, cx=1920.0, cy=1080.0, radius=900.0):
+    return PointBuffer([(cx + radius * math.cos(2 * math.pi * i / n),
+                         cy + radius * math.sin(2 * math.pi * i / n)) for i in range(n)])
+
+
+def brute_perimeter(points):
+    n = len(points)
+    if n < 2:
+        return 0.0
+    return sum(math.hypot(points[(i + 1) % n]["x"] - points[i]["x"],
+                          points[(i + 1) % n]["y"] - points[i]["y"]) for i in range(n))
+
+
+def brute_area(points):
+    n = len(points)
+    if n < 3:
+        return 0.0
+    return abs(sum(points[i]["x"] * points[(i + 1) % n]["y"] - points[(i + 1) % n]["x"] * points[i]["y"]
+                   for i in range(n))) / 2.0
@@ -0,0 +1,142 @@
+"""CaptureService caching and ImageSource cropping, on an in-memory image."""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screenruler.capture import CaptureService, ImageSource, _bgra_to_rgb  # noqa: E402
+
+WIDTH, HEIGHT = 40, 30
+
+
+def pixel(x, y):
+    return bytes((x * 5 % 256, y * 7 % 256, (x + y) % 256))
+
+
+class CountingSource:
+    """ImageSource wrapper that counts grabs."""
+
+    def __init__(self, source):
+        self.source = source
+        self.grabs = []
+
+    def grab(self, rect):
+        self.grabs.append(rect)
+        return self.source.grab(rect)
+
+
+class CaptureTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "image.ppm")
+        with open(cls.path, "wb") as f:
+            f.write(b"P6\n# test image\n%d %d\n255\n" % (WIDTH, HEIGHT))
+            f.write(b"".join(pixel(x, y) for y in range(HEIGHT) for x in range(WIDTH)))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+
+class ImageSourceTest(CaptureTestCase):
+
+    def test_inside_pixels_match(self):
+        frame = ImageSource(self.path).grab((3, 4, 13, 9))
+        self.assertEqual((frame.left, frame.top, frame.width, frame.height), (3, 4, 10, 5))
+        self.assertEqual(frame.pixel(3, 4), tuple(pixel(3, 4)))
+        self.assertEqual(frame.pixel(12, 8), tuple(pixel(12, 8)))
+
+    def test_outside_is_black_padding(self):
+        source = ImageSource(self.path, origin=(100, 200))
+        frame = source.grab((95, 195, 105, 205))
+        for y in range(195, 205):
+            for x in range(95, 105):
+                inside = x >= 100 and y >= 200
+                self.assertEqual(frame.pixel(x, y), tuple(pixel(x - 100, y - 200)) if inside else (0, 0, 0))
+        # Entirely off the image (right of it and below it)
+        frame = source.grab((200, 300, 204, 302))
+        self.assertEqual(frame.data, b"\0" * 4 * 2 * 3)
+
+    def test_bgra_to_rgb(self):
+        self.assertEqual(_bgra_to_rgb(bytes([1, 2, 3, 255, 4, 5, 6, 0])), bytes([3, 2, 1, 6, 5, 4]))
+
+
+class CaptureServiceTest(CaptureTestCase):
+
+    def setUp(self):
+        self.source = CountingSource(ImageSource(self.path))
+
+    def service(self, **kwargs):
+        service = CaptureService(self.source, **kwargs)
+        self.addCleanup(service.close)
+        return service
+
+    def test_get_caches_within_ttl(self):
+        service = self.service(ttl=60.0, tile=8, pad=4)
+        frame = service.get((10, 10, 12, 12), timeout=2.0)
+        self.assertIsNotNone(frame)
+        self.assertTrue(frame.contains((10, 10, 12, 12)))
+        self.assertEqual(frame.rect, (0, 0, 16, 16))  # padded by 4, snapped to 8
+        self.assertIsNotNone(frame._luma)  # grey levels computed on the worker
+        self.assertIs(service.get((11, 11, 13, 13)), frame)
+        self.assertEqual(service.stats()["captures"], 1)
+        self.assertEqual(service.stats()["hits"], 1)
+
+    def test_expired_frame_is_recaptured(self):
+        service = self.service(ttl=60.0, tile=8, pad=0)
+        first = service.get((0, 0, 8, 8), timeout=2.0)
+        time.sleep(0.01)
+        self.assertIsNone(service.get((0, 0, 8, 8), max_age=0.0))  # too old: queued again
+        deadline = time.monotonic() + 2.0
+        while service.stats()["captures"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(service.stats()["captures"], 2)
+        self.assertIsNot(service.latest((0, 0, 8, 8)), first)
+
+    def test_lru_keeps_max_frames(self):
+        service = self.service(tile=8, pad=0, max_frames=2)
+        a = service.get((0, 0, 8, 8), timeout=2.0)
+        service.get((8, 0, 16, 8), timeout=2.0)
+        self.assertIs(service.latest((0, 0, 8, 8)), a)  # touch a: the (8, 0) frame is now oldest
+        service.get((16, 0, 24, 8), timeout=2.0)
+        self.assertEqual(service.stats()["frames"], 2)
+        self.assertIs(service.latest((0, 0, 8, 8)), a)
+        self.assertIsNone(service.latest((8, 0, 16, 8)))
+        self.assertIsNotNone(service.latest((16, 0, 24, 8)))
+
+    def test_latest_never_captures(self):
+        service = self.service(ttl=0.0, tile=8, pad=0)
+        self.assertIsNone(service.latest((0, 0, 4, 4)))
+        frame = service.get((0, 0, 4, 4), max_age=5.0, timeout=2.0)
+        time.sleep(0.01)
+        self.assertIs(service.latest((0, 0, 4, 4)), frame)  # older than the TTL, still returned
+        self.assertEqual(len(self.source.grabs), 1)
+        service.invalidate()
+        self.assertIsNone(service.latest((0, 0, 4, 4)))
+
+    def test_derive_builds_once_off_thread(self):
+        service = self.service(tile=8, pad=0)
+        frame = service.get((0, 0, 8, 8), timeout=2.0)
+        calls = []
+
+        def build(f):
+            calls.append(f)
+            return f.width * f.height
+
+        value, deadline = service.derive(frame, "area", build), time.monotonic() + 2.0
+        while value is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+            value = service.derive(frame, "area", build)
+        self.assertEqual(value, 64)
+        self.assertEqual(service.derive(frame, "area", build), 64)
+        self.assertEqual(calls, [frame])
+
+
+if __name__ == "__main__":
+    unittest.main()
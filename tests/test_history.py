@@ -0,0 +1,70 @@
+"""HistoryTable orders kept up to date by merging must match a fresh sort."""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screenruler.history import HistoryRecord, HistoryTable  # noqa: E402
+
+
+def make_records(rng, count, start=1_700_000_000.0):
+    records, t = [], start
+    for _ in range(count):
+        t += rng.choice((0.0, 0.5, 3.0))  # repeated times exercise the tie order
+        mode = rng.choice(("ruler", "polygon", "angle"))
+        values = (round(rng.uniform(0, 500), 1),) if rng.random() < 0.9 else ()
+        records.append(HistoryRecord(mode, rng.choice(("px", "mm", "in")), t, values))
+    return records
+
+
+class HistoryTableTest(unittest.TestCase):
+
+    def test_appends_match_a_fresh_table(self):
+        rng = random.Random(17)
+        records = make_records(rng, 600)
+        table = HistoryTable(records[:100])
+        for column in HistoryTable.COLUMNS:
+            table.sort_by(column)  # cache every order before the appends
+        pos = 100
+        while pos < len(records):
+            size = rng.choice((1, 1, 3, 200))  # single copies and chunked loads
+            if size == 1:
+                table.append(records[pos])
+            else:
+                table.extend(records[pos:pos + size])
+            pos += size
+        fresh = HistoryTable(records)
+        for column in HistoryTable.COLUMNS:
+            for descending in (False, True):
+                with self.subTest(column=column, descending=descending):
+                    table.sort_by(column, descending)
+                    fresh.sort_by(column, descending)
+                    self.assertEqual(table.rows, fresh.rows)
+
+    def test_filters_after_appends(self):
+        rng = random.Random(3)
+        records = make_records(rng, 300)
+        table = HistoryTable(records[:10])
+        table.sort_by("value", descending=False)
+        table.extend(records[10:])
+        table.set_filter(mode="angle", unit="mm")
+        expected = sorted((i for i, r in enumerate(records) if r.mode == "angle" and r.unit == "mm"),
+                          key=lambda i: (records[i].values[0] if records[i].values else 0.0, i))
+        self.assertEqual(table.rows, expected)
+
+    def test_out_of_order_record_reindexes(self):
+        rng = random.Random(5)
+        records = make_records(rng, 50)
+        table = HistoryTable(records[10:])
+        table.sort_by("unit")
+        table.extend(records[:10])  # older than everything held
+        fresh = HistoryTable(records)
+        fresh.sort_by("unit")
+        self.assertEqual([table.records[i] for i in table.rows], [fresh.records[i] for i in fresh.rows])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""PolygonMetrics must agree with the brute-force perimeter/area formulas."""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screenruler.core.metrics import PolygonMetrics  # noqa: E402
+from tests.reference import brute_area, brute_perimeter, regular_polygon  # noqa: E402
+
+
+class PolygonMetricsTest(unittest.TestCase):
+
+    def assertMatchesBruteForce(self, metrics, points):
+        self.assertTrue(math.isclose(metrics.perimeter(points), brute_perimeter(points),
+                                     rel_tol=1e-9, abs_tol=1e-6))
+        self.assertTrue(math.isclose(metrics.area(points), brute_area(points),
+                                     rel_tol=1e-9, abs_tol=1e-3))
+
+    def test_random_vertex_moves_and_translations(self):
+        rng = random.Random(1234)
+        for n in (2, 3, 4, 10, 200):
+            with self.subTest(n=n):
+                points = regular_polygon(n)
+                metrics = PolygonMetrics(resync_every=10_000)
+                metrics.perimeter(points)
+                for step in range(500):
+                    if step % 50 == 49:
+                        # Translations are not reported: they change neither total
+                        points.translate(rng.uniform(-500, 500), rng.uniform(-500, 500))
+                    else:
+                        i = rng.randrange(n)
+                        old_x, old_y = points.get(i)
+                        points.set(i, rng.uniform(0, 3840), rng.uniform(0, 2160))
+                        metrics.move_vertex(points, i, old_x, old_y)
+                    if step % 25 == 0:
+                        self.assertMatchesBruteForce(metrics, points)
+                self.assertMatchesBruteForce(metrics, points)
+                self.assertEqual(metrics.full_passes, 1)
+
+    def test_dict_points(self):
+        rng = random.Random(99)
+        points = [{"x": rng.uniform(0, 1000), "y": rng.uniform(0, 1000)} for _ in range(12)]
+        metrics = PolygonMetrics()
+        self.assertMatchesBruteForce(metrics, points)
+        for _ in range(100):
+            i = rng.randrange(len(points))
+            old_x, old_y = points[i]["x"], points[i]["y"]
+            points[i] = {"x": rng.uniform(0, 1000), "y": rng.uniform(0, 1000)}
+            metrics.move_vertex(points, i, old_x, old_y)
+        self.assertMatchesBruteForce(metrics, points)
+
+    def test_resync_and_replacement(self):
+        rng = random.Random(7)
+        points = regular_polygon(50)
+        metrics = PolygonMetrics(resync_every=16)
+        metrics.area(points)
+        for _ in range(100):
+            i = rng.randrange(50)
+            old_x, old_y = points.get(i)
+            points.set(i, rng.uniform(0, 3840), rng.uniform(0, 2160))
+            metrics.move_vertex(points, i, old_x, old_y)
+        self.assertMatchesBruteForce(metrics, points)
+        self.assertGreater(metrics.full_passes, 1)
+
+        replacement = regular_polygon(7)
+        self.assertMatchesBruteForce(metrics, replacement)
+        points.append({"x": 0.0, "y": 0.0})  # a length change forces a full pass
+        self.assertMatchesBruteForce(metrics, points)
+
+    def test_scaled_perimeter(self):
+        def two_monitors(x1, y1, x2, y2):
+            # Right half measured at 1.5x, split where the edge crosses x = 1920
+            length = math.hypot(x2 - x1, y2 - y1)
+            if (x1 < 1920) == (x2 < 1920):
+                return length * (1.5 if x1 >= 1920 else 1.0)
+            t = (1920 - x1) / (x2 - x1)
+            return length * (t + 1.5 * (1 - t)) if x1 < 1920 else length * (1.5 * t + (1 - t))
+
+        def expected(points):
+            n = len(points)
+            return sum(two_monitors(points[i]["x"], points[i]["y"],
+                                    points[(i + 1) % n]["x"], points[(i + 1) % n]["y"]) for i in range(n))
+
+        rng = random.Random(42)
+        points = regular_polygon(300)
+        metrics = PolygonMetrics(resync_every=64)
+        self.assertTrue(math.isclose(metrics.scaled_perimeter(points, two_monitors), expected(points)))
+        for step in range(400):
+            if step % 100 == 99:
+                points.translate(rng.uniform(-400, 400), 0.0)
+                metrics.invalidate_lengths()
+            else:
+                i = rng.randrange(300)
+                old_x, old_y = points.get(i)
+                points.set(i, rng.uniform(0, 3840), rng.uniform(0, 2160))
+                metrics.move_vertex(points, i, old_x, old_y)
+            if step % 40 == 0:
+                self.assertTrue(math.isclose(metrics.scaled_perimeter(points, two_monitors), expected(points),
+                                             rel_tol=1e-9))
+        self.assertTrue(math.isclose(metrics.scaled_perimeter(points, two_monitors), expected(points),
+                                     rel_tol=1e-9))
+        self.assertMatchesBruteForce(metrics, points)
+        # A different measuring function is not served from the cache
+        self.assertTrue(math.isclose(metrics.scaled_perimeter(points, lambda *c: math.hypot(c[2] - c[0], c[3] - c[1])),
+                                     brute_perimeter(points), rel_tol=1e-9))
+
+
+if __name__ == "__main__":
+    unittest.main()
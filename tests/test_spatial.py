@@ -0,0 +1,109 @@
+"""PolygonIndex must agree with a brute-force scan of every vertex and edge."""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screenruler.core.points import PointBuffer  # noqa: E402
+from screenruler.core.spatial import PolygonIndex  # noqa: E402
+from tests.reference import regular_polygon  # noqa: E402
+
+
+def brute_vertex(points, x, y, radius):
+    best, best_d = None, radius
+    for i, p in enumerate(points):
+        d = math.hypot(x - p["x"], y - p["y"])
+        if d < best_d or (d == best_d and best is not None and i < best):
+            best, best_d = i, d
+    return best, best_d
+
+
+def edge_distance(points, i, x, y):
+    """Distance from (x, y) to edge i (None where the projection falls off the edge)."""
+    p, q = points[i], points[(i + 1) % len(points)]
+    x1, y1, x2, y2 = p["x"], p["y"], q["x"], q["y"]
+    seg_len = math.hypot(x2 - x1, y2 - y1)
+    if seg_len == 0:
+        return None
+    dot = ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / (seg_len * seg_len)
+    if not 0 <= dot <= 1:
+        return None
+    return abs((y2 - y1) * x - (x2 - x1) * y + x2 * y1 - y2 * x1) / seg_len
+
+
+def brute_edge(points, x, y, tolerance):
+    distances = [d for d in (edge_distance(points, i, x, y) for i in range(len(points)))
+                 if d is not None and d < tolerance]
+    return min(distances) if distances else None
+
+
+class PolygonIndexTest(unittest.TestCase):
+
+    def assertMatchesBruteForce(self, index, points, rng, probes=60):
+        n = len(points)
+        for _ in range(probes):
+            # Half the probes land next to a vertex, the rest anywhere nearby
+            if rng.random() < 0.5:
+                p = points[rng.randrange(n)]
+                x, y = p["x"] + rng.uniform(-20, 20), p["y"] + rng.uniform(-20, 20)
+            else:
+                x, y = rng.uniform(-100, 4000), rng.uniform(-100, 2300)
+            self.assertEqual(index.hit_vertex(points, x, y, 18), brute_vertex(points, x, y, 18)[0])
+            # Equally near edges may tie, so compare distances rather than indexes
+            edge, expected = index.hit_edge(points, x, y, 12), brute_edge(points, x, y, 12)
+            if expected is None:
+                self.assertIsNone(edge)
+            else:
+                self.assertAlmostEqual(edge_distance(points, edge, x, y), expected)
+
+    def test_vertex_moves_and_translations(self):
+        rng = random.Random(2024)
+        for n, radius in ((3, 900.0), (40, 300.0), (2000, 150.0)):
+            with self.subTest(n=n):
+                points = regular_polygon(n, radius=radius)
+                index = PolygonIndex()
+                self.assertMatchesBruteForce(index, points, rng)
+                for step in range(120):
+                    if step % 10 == 9:
+                        dx, dy = rng.uniform(-300, 300), rng.uniform(-300, 300)
+                        points.translate(dx, dy)
+                        index.translate(points, dx, dy)
+                    else:
+                        i = rng.randrange(n)
+                        x, y = points.get(i)
+                        points.set(i, x + rng.uniform(-60, 60), y + rng.uniform(-60, 60))
+                        index.move_vertex(points, i)
+                    if step % 20 == 0:
+                        self.assertMatchesBruteForce(index, points, rng, probes=20)
+                self.assertMatchesBruteForce(index, points, rng)
+
+    def test_scattered_points_and_fixed_cells(self):
+        rng = random.Random(5)
+        points = PointBuffer({"x": rng.uniform(0, 3840), "y": rng.uniform(0, 2160)} for _ in range(300))
+        for index in (PolygonIndex(), PolygonIndex(cell_size=7.0), PolygonIndex(cell_size=500.0)):
+            with self.subTest(cell_size=index.fixed_cell_size):
+                self.assertMatchesBruteForce(index, points, rng)
+
+    def test_dense_outline_uses_small_cells(self):
+        points = regular_polygon(10_000, radius=150.0)
+        index = PolygonIndex()
+        index.rebuild(points)
+        self.assertLess(index.cell_size, 8.0)
+        largest = max(len(cell) for cell in index._vertex_cells.values())
+        self.assertLess(largest, 100)
+
+    def test_replaced_points_rebuild(self):
+        index = PolygonIndex()
+        first = regular_polygon(8)
+        self.assertEqual(index.hit_vertex(first, first[0]["x"], first[0]["y"], 18), 0)
+        second = regular_polygon(5, cx=100.0, cy=100.0, radius=50.0)
+        index.translate(second, 10.0, 10.0)  # not indexed yet: ignored
+        self.assertEqual(index.hit_vertex(second, second[3]["x"], second[3]["y"], 18), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
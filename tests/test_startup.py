@@ -0,0 +1,33 @@
+"""StartupTimeline itemises top-level and deferred imports."""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screenruler.startup import StartupTimeline  # noqa: E402
+
+
+class StartupTimelineTest(unittest.TestCase):
+
+    def test_preload_and_deferred_imports_are_reported(self):
+        sys.modules.pop("colorsys", None)
+        sys.modules.pop("wave", None)
+        timeline = StartupTimeline()
+        timeline.preload(("colorsys", "json"))
+        timeline.mark("imports")
+        self.assertIs(timeline.import_module("wave"), sys.modules["wave"])
+        timeline.import_module("wave")  # already loaded: not recorded again
+
+        self.assertIn("colorsys", [name for name, _ in timeline.startup_imports])
+        self.assertEqual([name for name, _ in timeline.imports], ["wave"])
+        lines = timeline.report_lines()
+        self.assertIn("Startup imports (ms):", lines)
+        self.assertIn("Deferred imports (ms):", lines)
+        self.assertTrue(any(line.endswith("  colorsys") for line in lines))
+        self.assertEqual(set(timeline.to_dict()["imports"]), {"wave"})
+
+
+if __name__ == "__main__":
+    unittest.main()